@@ -5,16 +5,69 @@ Este módulo implementa um agente baseado em LangGraph para identificação
 e correção de problemas em códigos fonte diversos.
 """
 
-import uuid
-from typing import Dict, Any
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompts import PromptTemplate
 
 from schemas.code_schemas import (
     BugFixRequest,
     BugFixResponse,
-    CodeAnalysis,
-    GeneratedTest
+    BugFixLLMOutput,
+    CodeAnalysis
 )
-from services.llm_factory import load_llm
+from services.llm_factory import load_llm, load_fast_llm
+from services.llm_limiter import get_llm_semaphore, iterate_with_llm_slot
+from services.semantic_cache import get_semantic_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Prompt sistema para correção de bugs. Mantido como constante de módulo
+# para que o texto seja idêntico byte a byte entre chamadas e o cache de
+# prefixo do provedor (OpenAI/Azure OpenAI) possa reaproveitá-lo.
+SYSTEM_PROMPT = """
+Você é um especialista em correção de bugs e refatoração de código.
+Sua tarefa é analisar o código fornecido e a mensagem de erro para:
+1. Identificar e corrigir o bug
+2. Explicar o que estava causando o problema
+3. Listar as mudanças realizadas
+4. Fornecer dicas para prevenir erros similares
+"""
+# Mensagem de sistema construída uma única vez e reutilizada em todas as chamadas
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+# Modelo do prompt humano, compilado uma única vez. As instruções fixas vêm
+# antes dos dados variáveis para maximizar o prefixo reaproveitável.
+HUMAN_PROMPT_TEMPLATE = PromptTemplate.from_template("""
+LINGUAGEM:
+{language}
+
+Por favor, analise o código e corrija o bug identificado pela mensagem de erro.
+
+MENSAGEM DE ERRO:
+{error_description}
+
+CÓDIGO COM BUG:
+{code_with_bug}
+""")
+
+# Substituições aplicadas na correção básica quando o LLM falha. Todas são
+# resolvidas em uma única varredura do código por meio de uma alternância.
+BASIC_FIX_RULES = {
+    "erro": "corrigido",
+}
+_BASIC_FIX_PATTERN = re.compile("|".join(map(re.escape, BASIC_FIX_RULES)))
+
+# Trechos Python até este tamanho (caracteres) são corrigidos pelo LLM rápido,
+# quando configurado; os demais casos usam o LLM principal
+FAST_PATH_MAX_CODE_LENGTH = 2048
+FAST_PATH_LANGUAGES = {"python"}
 
 
 class BugFixerAgent:
@@ -25,10 +78,25 @@ class BugFixerAgent:
     e correção, simulando contexto real de desenvolvimento.
     """
     
-    def __init__(self):
-        """Inicializa o agente corretor de código."""
-        self.llm = load_llm()
+    def __init__(self, llm: Optional[BaseChatModel] = None, fast_llm: Optional[BaseChatModel] = None):
+        """
+        Inicializa o agente corretor de código.
         
+        Args:
+            llm: Instância de LLM a ser utilizada; por padrão, a compartilhada pela aplicação
+            fast_llm: LLM rápido para trechos curtos; por padrão, o configurado no ambiente
+        """
+        self.llm = llm or load_llm()
+        self.fast_llm = fast_llm or load_fast_llm()
+        # Saída estruturada via function calling: o provedor devolve JSON
+        # válido no schema, dispensando o parse manual da resposta
+        self.structured_llm = self.llm.with_structured_output(BugFixLLMOutput, include_raw=True)
+        self.structured_fast_llm = (
+            self.fast_llm.with_structured_output(BugFixLLMOutput, include_raw=True)
+            if self.fast_llm else None
+        )
+        self.semantic_cache = get_semantic_cache("bug_fixer")
+
     async def fix_bugs(self, request: BugFixRequest) -> BugFixResponse:
         """
         Corrige bugs no código fornecido usando o LLM.
@@ -39,82 +107,35 @@ class BugFixerAgent:
         Returns:
             BugFixResponse: Código corrigido e detalhes da operação
         """
-        import time
-        from langchain_core.messages import HumanMessage, SystemMessage
+        start_time = time.perf_counter()
         
-        start_time = time.time()
+        cache_key = f"{request.error_description}\n{request.code_with_bug}"
+        cached = await self._lookup_semantic_cache(cache_key, request.language.value)
+        if cached is not None:
+            return BugFixResponse(**cached, processing_time=time.perf_counter() - start_time)
         
         try:
-            # Prompt sistema para correção de bugs
-            system_prompt = """
-            Você é um especialista em correção de bugs e refatoração de código.
-            Sua tarefa é analisar o código fornecido e a mensagem de erro para:
-            1. Identificar e corrigir o bug
-            2. Explicar o que estava causando o problema
-            3. Listar as mudanças realizadas
-            4. Fornecer dicas para prevenir erros similares
-            
-            Responda em formato JSON estruturado:
-            {
-              "fixed_code": "código corrigido aqui",
-              "explanation": "explicação do problema e solução",
-              "changes_made": ["lista de mudanças realizadas"],
-              "prevention_tips": ["dicas para prevenir problemas similares"]
-            }
-            """
-            
-            # Prompt humano com os dados do bug
-            human_prompt = f"""
-            MENSAGEM DE ERRO:
-            {request.error_description}
+            # Executar prompt no LLM
+            messages = self._build_messages(request)
             
-            CÓDIGO COM BUG:
-            {request.code_with_bug}
+            async with get_llm_semaphore():
+                structured_llm = self.structured_fast_llm if self._use_fast_path(request) else self.structured_llm
+                output = await structured_llm.ainvoke(messages)
+            self._log_cached_tokens(output["raw"])
             
-            LINGUAGEM:
-            {request.language.value}
+            result = output["parsed"]
+            if result is None:
+                raise output["parsing_error"] or ValueError("Resposta do LLM fora do schema esperado")
             
-            Por favor, analise o código e corrija o bug identificado pela mensagem de erro.
-            """
+            fix = {"success": True, **result.model_dump()}
+            await self._store_semantic_cache(cache_key, request.language.value, fix)
             
-            # Executar prompt no LLM
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+            return BugFixResponse(**fix, processing_time=time.perf_counter() - start_time)
             
-            response = self.llm.invoke(messages)
-            
-            # Parsear resposta JSON
-            import json
-            try:
-                result = json.loads(response.content)
-                processing_time = time.time() - start_time
-                
-                return BugFixResponse(
-                    success=True,
-                    fixed_code=result.get("fixed_code", request.code_with_bug),
-                    explanation=result.get("explanation", "Código analisado pelo LLM"),
-                    changes_made=result.get("changes_made", ["Análise realizada"]),
-                    prevention_tips=result.get("prevention_tips", ["Revise o código regularmente"]),
-                    processing_time=processing_time
-                )
-            except json.JSONDecodeError:
-                # Fallback se o JSON estiver malformado
-                processing_time = time.time() - start_time
-                return BugFixResponse(
-                    success=True,
-                    fixed_code=response.content,
-                    explanation="Correção realizada pelo LLM (resposta em texto livre)",
-                    changes_made=["Análise e correção pelo LLM"],
-                    prevention_tips=["Sempre teste o código após correções"],
-                    processing_time=processing_time
-                )
-                
         except Exception as e:
             # Fallback em caso de erro do LLM
-            processing_time = time.time() - start_time
-            fixed_code = request.code_with_bug.replace("erro", "corrigido")
+            processing_time = time.perf_counter() - start_time
+            fixed_code = _BASIC_FIX_PATTERN.sub(lambda m: BASIC_FIX_RULES[m.group(0)], request.code_with_bug)
             
             return BugFixResponse(
                 success=False,
@@ -124,7 +145,115 @@ class BugFixerAgent:
                 prevention_tips=["Verifique a conectividade com o LLM", "Revise casos de teste"],
                 processing_time=processing_time
             )
+
+    async def fix_bugs_stream(self, request: BugFixRequest) -> AsyncIterator[str]:
+        """
+        Corrige bugs transmitindo a resposta do LLM à medida que é gerada.
         
+        Diferente de fix_bugs, devolve texto livre em fragmentos, permitindo
+        que o cliente exiba a correção antes de a geração terminar.
+        
+        Args:
+            request: Dados da requisição de correção de bugs
+            
+        Yields:
+            str: Fragmentos de texto gerados pelo LLM
+        """
+        llm = self.fast_llm if self._use_fast_path(request) else self.llm
+        # A vaga do semáforo não fica presa enquanto o cliente lê os fragmentos
+        async for chunk in iterate_with_llm_slot(llm.astream(self._build_messages(request))):
+            if chunk.content:
+                yield chunk.content
+
+    def _use_fast_path(self, request: BugFixRequest) -> bool:
+        """
+        Indica se a requisição pode ser atendida pelo LLM rápido.
+        
+        Args:
+            request: Dados da requisição de correção de bugs
+            
+        Returns:
+            bool: True para trechos curtos em linguagens do caminho rápido
+        """
+        return (
+            self.fast_llm is not None
+            and request.language.value in FAST_PATH_LANGUAGES
+            and len(request.code_with_bug) <= FAST_PATH_MAX_CODE_LENGTH
+        )
+
+    def _build_messages(self, request: BugFixRequest) -> List[Any]:
+        """
+        Monta as mensagens enviadas ao LLM para correção de bugs.
+        
+        Args:
+            request: Dados da requisição de correção de bugs
+            
+        Returns:
+            List[Any]: Mensagens de sistema e humana
+        """
+        human_prompt = HUMAN_PROMPT_TEMPLATE.format(
+            language=request.language.value,
+            error_description=request.error_description,
+            code_with_bug=request.code_with_bug
+        )
+        
+        return [
+            SYSTEM_MESSAGE,
+            HumanMessage(content=human_prompt)
+        ]
+
+    async def _lookup_semantic_cache(self, text: str, language: str) -> Optional[Dict[str, Any]]:
+        """
+        Consulta o cache semântico por uma correção equivalente já gerada.
+        
+        Falhas no serviço de embeddings são tratadas como ausência no cache.
+        
+        Args:
+            text: Mensagem de erro e código com bug
+            language: Linguagem do código
+            
+        Returns:
+            Optional[Dict[str, Any]]: Campos da correção armazenada ou None
+        """
+        if self.semantic_cache is None:
+            return None
+        try:
+            return await self.semantic_cache.lookup(text, scope=language)
+        except Exception as e:
+            logger.warning("Falha ao consultar cache semântico: %s", e)
+            return None
+
+    async def _store_semantic_cache(self, text: str, language: str, fix: Dict[str, Any]) -> None:
+        """
+        Armazena uma correção bem-sucedida no cache semântico.
+        
+        Args:
+            text: Mensagem de erro e código com bug
+            language: Linguagem do código
+            fix: Campos da correção, sem o tempo de processamento
+        """
+        if self.semantic_cache is None:
+            return
+        try:
+            await self.semantic_cache.store(text, fix, scope=language)
+        except Exception as e:
+            logger.warning("Falha ao armazenar no cache semântico: %s", e)
+
+    def _log_cached_tokens(self, response) -> None:
+        """
+        Registra quantos tokens de entrada vieram do cache de prefixo do provedor.
+        
+        Args:
+            response: Mensagem retornada pelo LLM
+        """
+        usage = getattr(response, "usage_metadata", None) or {}
+        cache_read = usage.get("input_token_details", {}).get("cache_read")
+        if cache_read:
+            logger.debug(
+                "Cache de prompt do provedor: %s de %s tokens de entrada reaproveitados",
+                cache_read, usage.get("input_tokens")
+            )
+
     async def analyze_code(self, code: str, language: str) -> CodeAnalysis:
         """
         Analisa o código para identificação de potencial de melhoria
@@ -145,3 +274,17 @@ class BugFixerAgent:
             code_smells=["Falta de documentação", "Método complexo"],
             suggestions=["Dividir métodos complexos", "Aumentar cobertura de testes"]
         )
+
+
+@lru_cache(maxsize=1)
+def get_bug_fixer_agent() -> BugFixerAgent:
+    """
+    Obtém o agente corretor de código compartilhado pela aplicação.
+    
+    O agente não guarda estado por requisição; compartilhá-lo evita repetir,
+    a cada requisição, a carga dos LLMs e a montagem da saída estruturada.
+    
+    Returns:
+        BugFixerAgent: Instância compartilhada do agente
+    """
+    return BugFixerAgent()
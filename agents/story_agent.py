@@ -5,9 +5,23 @@ Este módulo implementa um agente baseado em LangGraph para
 geração automatizada de histórias de usuário, épicos e tarefas.
 """
 
-import uuid
-from typing import List, Dict, Any
-from datetime import datetime
+import asyncio
+import itertools
+import logging
+import os
+import re
+import time
+from functools import cached_property, lru_cache
+from uuid import uuid4
+from typing import List, Dict, Any, AsyncIterator, FrozenSet, Optional, Tuple, Union
+
+from openai import APIError
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from schemas.story_schemas import (
     StoryRequest, 
@@ -15,9 +29,459 @@ from schemas.story_schemas import (
     AcceptanceCriteria, 
     StoryType,
     Priority,
-    DetailedTask
+    DetailedTask,
+    StoryDraft,
+    EpicDraft
 )
 from services.llm_factory import load_llm
+from services.llm_limiter import get_llm_semaphore, iterate_with_llm_slot
+from services.semantic_cache import get_semantic_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Modelos de título por tipo de história, preenchidos com as palavras-chave
+# extraídas do contexto. Tipos não listados usam DEFAULT_TITLE_TEMPLATE.
+TITLE_TEMPLATES = {
+    StoryType.EPIC: "Épico: {main_feature}",
+    StoryType.USER_STORY: "Como {user_type}, eu quero {action} para {benefit}",
+}
+DEFAULT_TITLE_TEMPLATE = "Implementar {main_feature}"
+
+# Prompt sistema para geração de histórias. Mantido como constante de módulo
+# para que o prefixo enviado ao provedor seja idêntico entre chamadas e
+# aproveite o cache de prompt automático (OpenAI/Azure OpenAI).
+STORY_SYSTEM_PROMPT = """
+Você é um especialista em metodologias ágeis, engenharia de software e product management.
+Sua tarefa é gerar histórias de usuário, épicos e tarefas em formato estruturado e detalhado.
+
+Baseado no contexto fornecido, gere:
+1. Título claro e contextualizado (seguindo padrão: "Como [persona], eu quero [funcionalidade] para [benefício]")
+2. Descrição detalhada (parágrafo explicativo compreensível por todo o time)
+3. Critérios de aceitação em formato Gherkin (Dado/Quando/Então)
+4. Lista de tarefas detalhadas com ações específicas
+5. Prioridade com justificativa (baixa, media, alta, urgente)
+6. Estimativa numérica em Story Points (1-21) com justificativa de complexidade
+
+IMPORTANTE: Tarefas devem ser específicas e acionáveis. Em vez de "Analisar requisitos", 
+use "Analisar requisitos de autenticação: login via Active Directory, validação de sessão e logout automático".
+"""
+# Mensagem de sistema construída uma única vez e reutilizada em todas as chamadas
+STORY_SYSTEM_MESSAGE = SystemMessage(content=STORY_SYSTEM_PROMPT)
+
+# IDs das histórias: prefixo aleatório sorteado uma vez por processo seguido
+# de um contador, evitando consultar o gerador criptográfico a cada história
+_STORY_ID_PREFIX = uuid4().hex[:8]
+_STORY_ID_COUNTER = itertools.count()
+
+
+def _new_story_id() -> str:
+    """
+    Gera um ID único para uma história.
+    
+    Returns:
+        str: ID no formato <prefixo do processo>-<contador hexadecimal>
+    """
+    return f"{_STORY_ID_PREFIX}-{next(_STORY_ID_COUNTER):x}"
+
+
+# Falhas do LLM que acionam o fallback mock: erros do provedor (conexão,
+# timeout, rate limit) e respostas fora do schema. Demais exceções indicam
+# defeitos no código e são propagadas em vez de mascaradas pelo fallback.
+LLM_FALLBACK_ERRORS = (APIError, asyncio.TimeoutError, OutputParserException, ValidationError)
+
+# Intervalo padrão (segundos) até nova tentativa de carregar o LLM após uma
+# falha; enquanto isso, as histórias vêm da implementação mock
+DEFAULT_LLM_RETRY_INTERVAL = 60.0
+
+# Tamanho máximo do contexto (caracteres) após a normalização de espaços
+MAX_CONTEXT_LENGTH = 4000
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Contextos com geradores mock específicos: (termos, nome do contexto)
+SPECIALIZED_CONTEXTS = (
+    (("ideia no bolso", "inovação"), "innovation"),
+)
+
+# Regras de extração de palavras-chave: (termos, valor). A primeira regra
+# com algum termo presente no contexto (em minúsculas) define o valor.
+MAIN_FEATURE_RULES = (
+    (("login", "autenticação"), "sistema de autenticação"),
+    (("cadastro", "registro"), "sistema de cadastro"),
+    (("relatório", "dashboard"), "sistema de relatórios"),
+    (("pagamento", "transação"), "sistema de pagamentos"),
+)
+USER_TYPE_RULES = (
+    (("administrador", "admin"), "administrador"),
+    (("cliente",), "cliente"),
+    (("colaborador",), "colaborador"),
+    (("gerente", "gestor"), "gestor"),
+)
+ACTION_RULES = (
+    (("criar", "cadastrar"), "criar/cadastrar informações"),
+    (("visualizar", "consultar"), "visualizar/consultar dados"),
+    (("editar", "alterar"), "editar/alterar informações"),
+    (("excluir", "remover"), "excluir/remover dados"),
+)
+BENEFIT_RULES = (
+    (("segurança",), "garantir segurança do sistema"),
+    (("eficiência", "produtividade"), "melhorar eficiência e produtividade"),
+    (("controle",), "ter maior controle sobre as operações"),
+)
+
+# Recursos identificados no contexto (em minúsculas): recurso -> termos
+FEATURE_TAG_KEYWORDS = {
+    "form": ("formulário", "cadastro"),
+    "notification": ("notificação", "alerta"),
+    "report": ("relatório", "dashboard"),
+    "database": ("banco de dados", "persistência"),
+    "api": ("api", "integração"),
+    "security": ("autenticação", "segurança"),
+    "mobile": ("mobile",),
+}
+_FEATURE_TAG_BY_KEYWORD = {
+    keyword: tag for tag, keywords in FEATURE_TAG_KEYWORDS.items() for keyword in keywords
+}
+_FEATURE_TAG_PATTERN = re.compile("|".join(map(re.escape, _FEATURE_TAG_BY_KEYWORD)))
+
+
+def _match_rule(rules: tuple, context_lower: str, default: Optional[str]) -> Optional[str]:
+    """
+    Retorna o valor da primeira regra cujos termos aparecem no contexto.
+    
+    Args:
+        rules: Regras no formato (termos, valor)
+        context_lower: Contexto em minúsculas
+        default: Valor retornado quando nenhuma regra se aplica
+        
+    Returns:
+        Optional[str]: Valor da regra encontrada ou o padrão
+    """
+    return next(
+        (value for keywords, value in rules if any(keyword in context_lower for keyword in keywords)),
+        default
+    )
+
+
+def _normalize_request(request: StoryRequest) -> StoryRequest:
+    """
+    Normaliza o contexto da requisição uma única vez antes da geração.
+    
+    Espaços em branco consecutivos são colapsados e o texto é limitado a
+    MAX_CONTEXT_LENGTH caracteres, reduzindo o prompt enviado ao LLM e o
+    trabalho das etapas seguintes sobre o contexto.
+    
+    Args:
+        request: Dados da requisição de geração
+        
+    Returns:
+        StoryRequest: Requisição com o contexto normalizado
+    """
+    context = _WHITESPACE_PATTERN.sub(" ", request.context).strip()[:MAX_CONTEXT_LENGTH]
+    if context == request.context:
+        return request
+    return request.model_copy(update={"context": context})
+
+
+def _scan_feature_tags(context_lower: str) -> FrozenSet[str]:
+    """
+    Identifica, em uma única varredura, os recursos mencionados no contexto.
+    
+    Args:
+        context_lower: Contexto em minúsculas
+        
+    Returns:
+        FrozenSet[str]: Recursos de FEATURE_TAG_KEYWORDS encontrados
+    """
+    return frozenset(_FEATURE_TAG_BY_KEYWORD[match.group(0)] for match in _FEATURE_TAG_PATTERN.finditer(context_lower))
+
+
+def _items_for_tags(base: tuple, items_by_tag: Dict[str, tuple], tags: FrozenSet[str]) -> list:
+    """
+    Combina os itens básicos com os itens dos recursos encontrados.
+    
+    Args:
+        base: Itens sempre incluídos
+        items_by_tag: Itens adicionais por recurso
+        tags: Recursos encontrados no contexto
+        
+    Returns:
+        list: Itens básicos seguidos dos adicionais, na ordem da tabela
+    """
+    return [*base, *(item for tag, items in items_by_tag.items() if tag in tags for item in items)]
+
+
+# Critérios e tarefas fixos dos geradores mock. São construídos uma única vez
+# na importação e compartilhados entre as histórias geradas; os itens
+# contextuais são indexados pelos recursos de FEATURE_TAG_KEYWORDS.
+INNOVATION_ACCEPTANCE_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que o colaborador está autenticado no app corporativo",
+        when="Ele acessa a funcionalidade 'Ideia no Bolso'",
+        then="Ele deve conseguir visualizar o formulário de submissão de ideias"
+    ),
+    AcceptanceCriteria(
+        given="Que o colaborador preencheu todos os campos obrigatórios da ideia",
+        when="Ele clica em 'Submeter Ideia'",
+        then="O sistema deve salvar a ideia com status 'em análise' e enviar confirmação"
+    ),
+    AcceptanceCriteria(
+        given="Que a ideia foi submetida",
+        when="O status da ideia é alterado pelo time de inovação",
+        then="O colaborador deve receber notificação em tempo real sobre a mudança"
+    ),
+)
+INNOVATION_TASKS = (
+    DetailedTask(
+        title="Criar interface de submissão de ideias",
+        description="Desenvolver interface responsiva (web e mobile) para submissão de ideias pelos colaboradores",
+        examples=("Formulário com campos: título, descrição, categoria, anexos", "Validação de campos obrigatórios")
+    ),
+    DetailedTask(
+        title="Implementar sistema de categorização",
+        description="Criar sistema para categorizar ideias por tipo, área de negócio e impacto",
+        examples=("Categorias: Produto, Processo, Tecnologia, Atendimento", "Tags personalizáveis")
+    ),
+    DetailedTask(
+        title="Desenvolver fluxo de validação",
+        description="Implementar workflow de aprovação pelo time de inovação com comentários e feedbacks",
+        examples=("Estados: Submetida, Em análise, Aprovada, Rejeitada", "Sistema de comentários")
+    ),
+    DetailedTask(
+        title="Criar sistema de notificações",
+        description="Implementar notificações em tempo real para mudanças de status das ideias",
+        examples=("Push notifications", "E-mail notifications", "Notificações in-app")
+    ),
+)
+
+BASE_ACCEPTANCE_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que o usuário possui credenciais válidas",
+        when="Ele acessa a funcionalidade",
+        then="Ele deve ser autenticado com sucesso"
+    ),
+)
+CRITERIA_BY_FEATURE = {
+    "form": (
+        AcceptanceCriteria(
+            given="Que todos os campos obrigatórios foram preenchidos",
+            when="O usuário submete o formulário",
+            then="Os dados devem ser validados e salvos no sistema"
+        ),
+    ),
+    "notification": (
+        AcceptanceCriteria(
+            given="Que uma ação relevante foi executada",
+            when="O sistema processa a ação",
+            then="Uma notificação deve ser enviada ao usuário apropriado"
+        ),
+    ),
+    "report": (
+        AcceptanceCriteria(
+            given="Que existem dados disponíveis no sistema",
+            when="O usuário solicita visualização de relatórios",
+            then="Os dados devem ser apresentados de forma clara e organizada"
+        ),
+    ),
+}
+
+BASE_TASKS = (
+    "Criar interface de usuário responsiva",
+    "Implementar validações de entrada",
+    "Desenvolver lógica de negócio backend",
+    "Criar testes unitários e de integração",
+)
+TASKS_BY_FEATURE = {
+    "database": (
+        "Modelar e criar estruturas no banco de dados",
+        "Implementar camada de acesso a dados",
+    ),
+    "api": (
+        "Desenvolver endpoints REST",
+        "Implementar integração com sistemas externos",
+    ),
+    "security": (
+        "Implementar sistema de autenticação e autorização",
+        "Configurar políticas de segurança",
+    ),
+    "mobile": (
+        "Adaptar interface para dispositivos móveis",
+        "Implementar funcionalidades específicas mobile",
+    ),
+    "report": (
+        "Criar visualizações de dados",
+        "Implementar filtros e exportação",
+    ),
+}
+
+BASE_DETAILED_TASKS = (
+    DetailedTask(
+        title="Criar interface de usuário",
+        description="Desenvolver interface responsiva e acessível para a funcionalidade",
+        examples=("Design system consistente", "Responsividade mobile-first", "Acessibilidade WCAG")
+    ),
+    DetailedTask(
+        title="Implementar validações",
+        description="Desenvolver validações de entrada e regras de negócio",
+        examples=("Validação de campos obrigatórios", "Sanitização de dados", "Feedback de erro")
+    ),
+)
+DETAILED_TASKS_BY_FEATURE = {
+    "database": (
+        DetailedTask(
+            title="Modelar estruturas de dados",
+            description="Criar modelos de dados e estruturas no banco de dados",
+            examples=("Diagrama ER", "Scripts de migração", "Índices para performance")
+        ),
+    ),
+    "api": (
+        DetailedTask(
+            title="Desenvolver endpoints REST",
+            description="Implementar APIs RESTful para comunicação entre sistemas",
+            examples=("Documentação OpenAPI", "Versionamento de API", "Rate limiting")
+        ),
+    ),
+    "security": (
+        DetailedTask(
+            title="Implementar segurança",
+            description="Configurar autenticação, autorização e políticas de segurança",
+            examples=("JWT tokens", "RBAC permissions", "Audit logs")
+        ),
+    ),
+}
+
+# Critérios e tarefas fixos das histórias relacionadas geradas pelo mock
+INNOVATION_VALIDATION_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que existem ideias aguardando validação",
+        when="Eu acesso o painel de validação",
+        then="Devo visualizar todas as ideias pendentes com seus detalhes"
+    ),
+    AcceptanceCriteria(
+        given="Que estou analisando uma ideia",
+        when="Eu aprovar ou reprovar a ideia",
+        then="O sistema deve atualizar o status e notificar o colaborador"
+    ),
+)
+INNOVATION_VALIDATION_TASKS = (
+    DetailedTask(
+        title="Criar painel de validação",
+        description="Desenvolver interface para o time de inovação revisar e validar ideias submetidas",
+        examples=("Lista de ideias pendentes", "Formulário de feedback", "Sistema de aprovação/reprovação")
+    ),
+    DetailedTask(
+        title="Implementar sistema de comentários",
+        description="Criar funcionalidade para adicionar comentários e feedback nas ideias",
+        examples=("Editor de texto rico", "Histórico de comentários", "Notificações de novos comentários")
+    ),
+)
+INNOVATION_DASHBOARD_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que existem dados de ideias no sistema",
+        when="Eu acesso o dashboard administrativo",
+        then="Devo visualizar métricas consolidadas com filtros por período e categoria"
+    ),
+    AcceptanceCriteria(
+        given="Que quero analisar dados específicos",
+        when="Eu aplico filtros no dashboard",
+        then="Os dados devem ser atualizados em tempo real conforme os filtros"
+    ),
+)
+INNOVATION_DASHBOARD_TASKS = (
+    DetailedTask(
+        title="Criar dashboard com visualizações de dados",
+        description="Desenvolver interface gráfica com charts e métricas visuais para o dashboard administrativo",
+        examples=("Gráficos de barras", "Charts de pizza", "Tabelas interativas")
+    ),
+    DetailedTask(
+        title="Implementar métricas de engajamento e aprovação",
+        description="Desenvolver cálculos e indicadores de performance do programa de inovação",
+        examples=("Taxa de aprovação por categoria", "Tempo médio de análise", "Ranking de colaboradores")
+    ),
+    DetailedTask(
+        title="Desenvolver sistema de filtros",
+        description="Implementar filtros dinâmicos por categoria, período, área e status das ideias",
+        examples=("Filtro por data range", "Filtro por departamento", "Filtro por status")
+    ),
+    DetailedTask(
+        title="Implementar funcionalidade de exportação",
+        description="Desenvolver exportação de dados em múltiplos formatos (Excel, PDF, CSV)",
+        examples=("Export to Excel", "Export to PDF", "Scheduled reports")
+    ),
+)
+ADMIN_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que tenho permissões de administrador",
+        when="Acesso o painel administrativo",
+        then="Devo ter acesso a todas as configurações do sistema"
+    ),
+)
+ADMIN_TASKS = (
+    DetailedTask(
+        title="Criar interface administrativa",
+        description="Desenvolver painel para gerenciar e monitorar a funcionalidade",
+        examples=("Listagem e busca de registros", "Ações em lote", "Indicadores de uso")
+    ),
+    DetailedTask(
+        title="Implementar controle de permissões",
+        description="Restringir as operações administrativas aos perfis autorizados",
+        examples=("Perfis de acesso", "Verificação de permissão por ação", "Registro de auditoria")
+    ),
+    DetailedTask(
+        title="Desenvolver funcionalidades de configuração",
+        description="Permitir ajustar parâmetros da funcionalidade sem novo deploy",
+        examples=("Tela de parâmetros", "Validação das configurações", "Histórico de alterações")
+    ),
+)
+REPORTS_CRITERIA = (
+    AcceptanceCriteria(
+        given="Que existem dados no sistema",
+        when="Solicito relatórios",
+        then="Devo visualizar dados organizados e filtráveis"
+    ),
+)
+REPORTS_TASKS = (
+    DetailedTask(
+        title="Implementar geração de relatórios",
+        description="Consolidar os dados de uso da funcionalidade em relatórios",
+        examples=("Relatório por período", "Agrupamento por categoria", "Totais e médias")
+    ),
+    DetailedTask(
+        title="Criar visualizações de dados",
+        description="Apresentar as métricas em gráficos e tabelas",
+        examples=("Gráficos de barras", "Tabelas interativas", "Indicadores resumidos")
+    ),
+    DetailedTask(
+        title="Desenvolver filtros e exportação",
+        description="Permitir filtrar os relatórios e exportá-los",
+        examples=("Filtro por data", "Export to Excel", "Export to PDF")
+    ),
+)
+
+# Verificações de qualidade das histórias: (falha, problema, sugestão)
+STORY_QUALITY_CHECKS = (
+    (lambda story: len(story.title) < 10,
+     "Título muito curto", "Expandir o título para ser mais descritivo"),
+    (lambda story: len(story.description) < 20,
+     "Descrição muito curta", "Adicionar mais detalhes na descrição"),
+    (lambda story: not story.acceptance_criteria,
+     "Critérios de aceitação ausentes", "Adicionar critérios de aceitação em formato Gherkin"),
+)
+
+# Quantidade de histórias relacionadas geradas para cada épico
+RELATED_STORIES_COUNT = 2
+
+EPIC_SYSTEM_PROMPT = """
+Você é um especialista em metodologias ágeis, engenharia de software e product management.
+Sua tarefa é gerar um épico a partir do contexto fornecido e desdobrá-lo em histórias de
+usuário relacionadas, complementares entre si e sem repetir o escopo do épico.
+
+Para o épico e para cada história, gere título no padrão "Como [persona], eu quero [funcionalidade] para [benefício]",
+descrição detalhada, critérios de aceitação em formato Gherkin (Dado/Quando/Então), tarefas
+específicas e acionáveis, prioridade com justificativa e estimativa em Story Points (1-21)
+com justificativa.
+"""
+EPIC_SYSTEM_MESSAGE = SystemMessage(content=EPIC_SYSTEM_PROMPT)
 
 
 class StoryAgent:
@@ -28,15 +492,85 @@ class StoryAgent:
     de criação de histórias em formato Gherkin.
     """
     
-    def __init__(self):
-        """Inicializa o agente de histórias."""
-        try:
-            self.llm = load_llm()
-            self.use_llm = True
-        except Exception as e:
-            print(f"Aviso: Não foi possível carregar LLM ({e}). Usando implementação mock.")
-            self.llm = None
-            self.use_llm = False
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        """
+        Inicializa o agente de histórias.
+        
+        O LLM é carregado de forma preguiçosa, no primeiro acesso, de modo
+        que instanciar o agente não dispara a inicialização do provedor.
+        
+        Args:
+            llm: Instância de LLM a ser utilizada; por padrão, a compartilhada pela aplicação
+        """
+        self._llm = llm
+        self._llm_retry_at = 0.0
+        self._use_llm = True
+        self._structured_llms: Dict[type, Any] = {}
+    
+    @property
+    def llm(self) -> Optional[BaseChatModel]:
+        """
+        LLM utilizado pelo agente ou None se não for possível carregá-lo.
+        
+        Só um LLM carregado com sucesso é guardado. Após uma falha, uma nova
+        tentativa é feita depois de LLM_RETRY_INTERVAL segundos, de modo que o
+        agente compartilhado não fique preso à implementação mock quando o
+        provedor volta a ficar disponível.
+        """
+        if self._llm is None and time.monotonic() >= self._llm_retry_at:
+            try:
+                self._llm = load_llm()
+            except Exception as e:
+                retry_interval = float(os.getenv("LLM_RETRY_INTERVAL", DEFAULT_LLM_RETRY_INTERVAL))
+                self._llm_retry_at = time.monotonic() + retry_interval
+                print(f"Aviso: Não foi possível carregar LLM ({e}). Usando implementação mock.")
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm: Optional[BaseChatModel]) -> None:
+        self._llm = llm
+        self._structured_llms.clear()
+    
+    @property
+    def use_llm(self) -> bool:
+        """Indica se as histórias serão geradas pelo LLM ou pela implementação mock."""
+        return self._use_llm and self.llm is not None
+    
+    @use_llm.setter
+    def use_llm(self, use_llm: bool) -> None:
+        self._use_llm = use_llm
+    
+    @property
+    def story_llm(self):
+        """LLM com saída estruturada para uma história."""
+        return self._structured_llm(StoryDraft)
+    
+    @property
+    def epic_llm(self):
+        """LLM com saída estruturada para um épico e suas histórias relacionadas."""
+        return self._structured_llm(EpicDraft)
+    
+    def _structured_llm(self, schema: type):
+        """
+        Obtém o LLM com saída estruturada para um schema.
+        
+        O objeto é criado uma vez por LLM carregado e descartado se o LLM for
+        substituído.
+        
+        Args:
+            schema: Modelo Pydantic da saída esperada
+            
+        Returns:
+            Runnable: LLM configurado com with_structured_output
+        """
+        if schema not in self._structured_llms:
+            self._structured_llms[schema] = self.llm.with_structured_output(schema)
+        return self._structured_llms[schema]
+    
+    @cached_property
+    def semantic_cache(self):
+        """Cache semântico das histórias geradas pelo LLM, se habilitado."""
+        return get_semantic_cache("story")
         
     async def generate_stories(self, request: StoryRequest) -> List[GeneratedStory]:
         """
@@ -48,6 +582,7 @@ class StoryAgent:
         Returns:
             List[GeneratedStory]: Lista de histórias geradas
         """
+        request = _normalize_request(request)
         if self.use_llm:
             return await self._generate_stories_with_llm(request)
         else:
@@ -57,134 +592,286 @@ class StoryAgent:
         """
         Gera histórias usando o LLM real.
         
+        Para épicos, o épico e as histórias relacionadas são gerados em uma
+        única chamada ao LLM.
+        
         Args:
             request: Dados da requisição de geração
             
         Returns:
             List[GeneratedStory]: Lista de histórias geradas
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
-        import json
-        
-        # Prompt sistema para geração de histórias com estrutura aprimorada
-        system_prompt = """
-        Você é um especialista em metodologias ágeis, engenharia de software e product management.
-        Sua tarefa é gerar histórias de usuário, épicos e tarefas em formato estruturado e detalhado.
-        
-        Baseado no contexto fornecido, gere:
-        1. Título claro e contextualizado (seguindo padrão: "Como [persona], eu quero [funcionalidade] para [benefício]")
-        2. Descrição detalhada (parágrafo explicativo compreensível por todo o time)
-        3. Critérios de aceitação em formato Gherkin (Dado/Quando/Então)
-        4. Lista de tarefas detalhadas com ações específicas
-        5. Prioridade com justificativa (baixa, media, alta, urgente)
-        6. Estimativa numérica em Story Points (1-21) com justificativa de complexidade
-        
-        IMPORTANTE: Tarefas devem ser específicas e acionáveis. Em vez de "Analisar requisitos", 
-        use "Analisar requisitos de autenticação: login via Active Directory, validação de sessão e logout automático".
-        
-        Responda SEMPRE em formato JSON válido com a estrutura:
-        {
-          "title": "Título claro e contextualizado",
-          "description": "Parágrafo explicativo detalhado da funcionalidade",
-          "acceptance_criteria": [
-            {"given": "condição inicial", "when": "ação do usuário", "then": "resultado esperado"},
-            {"given": "condição inicial", "when": "ação do usuário", "then": "resultado esperado"}
-          ],
-          "tasks": [
-            {"title": "Título da tarefa", "description": "Descrição detalhada com ações específicas", "examples": ["exemplo 1", "exemplo 2"]},
-            {"title": "Título da tarefa", "description": "Descrição detalhada com ações específicas", "examples": []}
-          ],
-          "priority": "alta",
-          "justificativa_prioridade": "Explicação do por que essa prioridade foi atribuída",
-          "estimation": 8,
-          "justificativa_estimativa": "Explicação da complexidade e fatores considerados na estimativa"
-        }
+        cache_key, cache_scope = self._semantic_cache_key(request)
+        cached = await self._lookup_semantic_cache(cache_key, cache_scope)
+        if cached is not None:
+            # IDs novos a cada resposta; o restante da história é reaproveitado
+            return [GeneratedStory(id=_new_story_id(), **story) for story in cached]
+        
+        try:
+            if request.story_type == StoryType.EPIC:
+                stories = await self._generate_epic_with_llm(request)
+            else:
+                stories = [await self._generate_single_story_with_llm(request)]
+            
+        except LLM_FALLBACK_ERRORS as e:
+            print(f"Erro ao gerar história com LLM: {e}")
+            # Fallback para implementação mock
+            return await self._generate_stories_mock(request)
+        
+        await self._store_semantic_cache(
+            cache_key, cache_scope, [story.model_dump(exclude={"id"}) for story in stories]
+        )
+        return stories
+    
+    def _semantic_cache_key(self, request: StoryRequest) -> Tuple[str, str]:
         """
+        Calcula o texto e o escopo usados no cache semântico.
         
-        # Prompt humano com o contexto
-        human_prompt = f"""
-        Contexto da funcionalidade:
-        {request.context}
+        O escopo separa requisições de contexto parecido que pedem saídas
+        diferentes (tipo, critérios de aceitação ou idioma).
         
-        Tipo de história desejada: {request.story_type}
-        Incluir critérios de aceitação: {request.include_acceptance_criteria}
-        Idioma: {request.language}
+        Args:
+            request: Dados da requisição de geração
+            
+        Returns:
+            Tuple[str, str]: Texto comparado por similaridade e escopo exato
+        """
+        text = request.context
+        if request.additional_requirements:
+            text = f"{text}\n{', '.join(request.additional_requirements)}"
+        scope = f"{request.story_type.value}|{request.include_acceptance_criteria}|{request.language}"
+        return text, scope
+    
+    async def _lookup_semantic_cache(self, text: str, scope: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Consulta o cache semântico por histórias equivalentes já geradas.
         
-        {f"Requisitos adicionais: {', '.join(request.additional_requirements)}" if request.additional_requirements else ""}
+        Falhas no serviço de embeddings são tratadas como ausência no cache.
         
-        Gere uma história de usuário completa e detalhada baseada neste contexto.
+        Args:
+            text: Contexto da requisição
+            scope: Escopo da requisição
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: Campos das histórias armazenadas ou None
         """
+        if self.semantic_cache is None:
+            return None
+        try:
+            return await self.semantic_cache.lookup(text, scope=scope)
+        except Exception as e:
+            logger.warning("Falha ao consultar cache semântico: %s", e)
+            return None
+    
+    async def _store_semantic_cache(self, text: str, scope: str, stories: List[Dict[str, Any]]) -> None:
+        """
+        Armazena histórias geradas pelo LLM no cache semântico.
         
+        Args:
+            text: Contexto da requisição
+            scope: Escopo da requisição
+            stories: Campos das histórias, sem os IDs
+        """
+        if self.semantic_cache is None:
+            return
         try:
-            # Executar prompt no LLM
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+            await self.semantic_cache.store(text, stories, scope=scope)
+        except Exception as e:
+            logger.warning("Falha ao armazenar no cache semântico: %s", e)
+    
+    async def _generate_single_story_with_llm(self, request: StoryRequest) -> GeneratedStory:
+        """
+        Gera a história principal da requisição usando o LLM.
+        
+        Args:
+            request: Dados da requisição de geração
             
-            response = self.llm.invoke(messages)
+        Returns:
+            GeneratedStory: História gerada
+        """
+        # Saída estruturada: o provedor devolve a história já no schema
+        async with get_llm_semaphore():
+            draft = await self.story_llm.ainvoke(self._build_story_messages(request))
+        
+        return self._stories_from_llm_output(request, draft)[0]
+    
+    async def _generate_epic_with_llm(self, request: StoryRequest) -> List[GeneratedStory]:
+        """
+        Gera um épico e suas histórias relacionadas em uma única chamada ao LLM.
+        
+        Com saída estruturada, o contexto é enviado e processado uma única vez
+        para todas as histórias, em vez de uma chamada por história.
+        
+        Args:
+            request: Dados da requisição de geração
             
-            # Parsear resposta JSON
-            story_data = json.loads(response.content)
+        Returns:
+            List[GeneratedStory]: Épico seguido das histórias relacionadas
+        """
+        async with get_llm_semaphore():
+            result = await self.epic_llm.ainvoke(self._build_epic_messages(request))
+        
+        return self._stories_from_llm_output(request, result)
+    
+    async def stream_stories(self, request: StoryRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Gera histórias transmitindo a resposta do LLM à medida que é gerada.
+        
+        O JSON da saída estruturada é interpretado de forma incremental a cada
+        fragmento recebido, permitindo que o cliente exiba título e descrição
+        antes de a geração terminar. Assim como em generate_stories, o cache
+        semântico é consultado antes da chamada e, em caso de falha do LLM, as
+        histórias finais vêm da implementação mock.
+        
+        Args:
+            request: Dados da requisição de geração
             
-            # Criar história estruturada
-            story_id = str(uuid.uuid4())
+        Yields:
+            Tuple[str, Any]: ("partial", dict) com os campos já recebidos e, ao
+            final, ("stories", List[GeneratedStory]) com as histórias validadas
+        """
+        request = _normalize_request(request)
+        if not self.use_llm:
+            yield "stories", await self._generate_stories_mock(request)
+            return
+        
+        cache_key, cache_scope = self._semantic_cache_key(request)
+        cached = await self._lookup_semantic_cache(cache_key, cache_scope)
+        if cached is not None:
+            yield "stories", [GeneratedStory(id=_new_story_id(), **story) for story in cached]
+            return
+        
+        if request.story_type == StoryType.EPIC:
+            schema, messages = EpicDraft, self._build_epic_messages(request)
+        else:
+            schema, messages = StoryDraft, self._build_story_messages(request)
+        
+        # Mesmo mecanismo de with_structured_output (function calling), mas
+        # consumindo os argumentos da ferramenta fragmento a fragmento
+        llm = self.llm.bind_tools([schema], tool_choice=schema.__name__)
+        
+        buffer = ""
+        try:
+            # A vaga do semáforo não fica presa enquanto o cliente lê os eventos
+            async for chunk in iterate_with_llm_slot(llm.astream(messages)):
+                args = "".join(tool_chunk.get("args") or "" for tool_chunk in chunk.tool_call_chunks)
+                if not args:
+                    continue
+                buffer += args
+                try:
+                    partial = from_json(buffer, allow_partial="trailing-strings")
+                except ValueError:
+                    # Ainda não é um prefixo de JSON (ex.: texto antes do objeto);
+                    # a validação final decide entre as histórias e o fallback
+                    continue
+                yield "partial", partial
             
-            acceptance_criteria = []
-            if story_data.get('acceptance_criteria') and request.include_acceptance_criteria:
-                for criteria in story_data['acceptance_criteria']:
-                    acceptance_criteria.append(AcceptanceCriteria(
-                        given=criteria.get('given', ''),
-                        when=criteria.get('when', ''),
-                        then=criteria.get('then', '')
-                    ))
+            stories = self._stories_from_llm_output(request, schema.model_validate_json(buffer))
             
-            # Processar tarefas detalhadas
-            detailed_tasks = []
-            for task_data in story_data.get('tasks', []):
-                if isinstance(task_data, dict):
-                    detailed_tasks.append(DetailedTask(
-                        title=task_data.get('title', ''),
-                        description=task_data.get('description', ''),
-                        examples=task_data.get('examples', [])
-                    ))
-                elif isinstance(task_data, str):
-                    detailed_tasks.append(DetailedTask(
-                        title=task_data,
-                        description="Tarefa gerada pelo LLM",
-                        examples=[]
-                    ))
+        except LLM_FALLBACK_ERRORS as e:
+            print(f"Erro ao gerar história com LLM: {e}")
+            # Fallback para implementação mock; os eventos parciais já enviados
+            # são substituídos pelas histórias finais
+            yield "stories", await self._generate_stories_mock(request)
+            return
+        
+        await self._store_semantic_cache(
+            cache_key, cache_scope, [story.model_dump(exclude={"id"}) for story in stories]
+        )
+        yield "stories", stories
+    
+    def _build_story_messages(self, request: StoryRequest) -> List[Any]:
+        """
+        Monta as mensagens enviadas ao LLM para gerar uma história.
+        
+        Args:
+            request: Dados da requisição de geração
             
-            # Mapear prioridade corretamente
-            priority_mapping = {
-                'baixa': Priority.BAIXA,
-                'media': Priority.MEDIA,
-                'média': Priority.MEDIA,
-                'alta': Priority.ALTA,
-                'urgente': Priority.URGENTE
-            }
-            priority_str = story_data.get('priority', 'media').lower()
-            priority = priority_mapping.get(priority_str, Priority.MEDIA)
+        Returns:
+            List[Any]: Mensagens de sistema e humana
+        """
+        # Prompt humano com o contexto. A instrução fixa vem antes dos dados
+        # variáveis para ampliar o prefixo reaproveitável pelo cache de prompt.
+        human_prompt = f"""
+        Gere uma história de usuário completa e detalhada baseada no contexto abaixo.
+        
+        Tipo de história desejada: {request.story_type}
+        Incluir critérios de aceitação: {request.include_acceptance_criteria}
+        Idioma: {request.language}
+        
+        Contexto da funcionalidade:
+        {request.context}
+        
+        {f"Requisitos adicionais: {', '.join(request.additional_requirements)}" if request.additional_requirements else ""}
+        """
+        
+        return [
+            STORY_SYSTEM_MESSAGE,
+            HumanMessage(content=human_prompt)
+        ]
+    
+    def _build_epic_messages(self, request: StoryRequest) -> List[Any]:
+        """
+        Monta as mensagens enviadas ao LLM para gerar um épico e suas histórias.
+        
+        Args:
+            request: Dados da requisição de geração
             
-            generated_story = GeneratedStory(
-                id=story_id,
-                title=story_data.get('title', 'História Gerada'),
-                description=story_data.get('description', ''),
-                story_type=request.story_type,
-                acceptance_criteria=acceptance_criteria,
-                tasks=detailed_tasks,
-                priority=priority,
-                justificativa_prioridade=story_data.get('justificativa_prioridade', 'Prioridade atribuída com base na análise do contexto'),
-                estimation=story_data.get('estimation', 5),
-                justificativa_estimativa=story_data.get('justificativa_estimativa', 'Estimativa baseada na complexidade identificada')
-            )
+        Returns:
+            List[Any]: Mensagens de sistema e humana
+        """
+        human_prompt = f"""
+        Gere um épico e {RELATED_STORIES_COUNT} histórias de usuário relacionadas a ele.
+        
+        Incluir critérios de aceitação: {request.include_acceptance_criteria}
+        Idioma: {request.language}
+        
+        Contexto do épico:
+        {request.context}
+        
+        {f"Requisitos adicionais: {', '.join(request.additional_requirements)}" if request.additional_requirements else ""}
+        """
+        
+        return [
+            EPIC_SYSTEM_MESSAGE,
+            HumanMessage(content=human_prompt)
+        ]
+    
+    def _stories_from_llm_output(self, request: StoryRequest, output: Union[StoryDraft, EpicDraft]) -> List[GeneratedStory]:
+        """
+        Converte a saída estruturada do LLM nas histórias da resposta.
+        
+        Args:
+            request: Dados da requisição de geração
+            output: História ou épico produzido pelo LLM
             
-            return [generated_story]
+        Returns:
+            List[GeneratedStory]: Histórias geradas; para épicos, o épico vem primeiro
+        """
+        if isinstance(output, EpicDraft):
+            drafts = [(output.epic, StoryType.EPIC)]
+            drafts.extend((draft, StoryType.USER_STORY) for draft in output.related_stories)
+        else:
+            drafts = [(output, request.story_type)]
+        
+        if not request.include_acceptance_criteria:
+            for draft, _ in drafts:
+                draft.acceptance_criteria = []
+        
+        return [self._story_from_draft(draft, story_type) for draft, story_type in drafts]
+    
+    def _story_from_draft(self, draft: StoryDraft, story_type: StoryType) -> GeneratedStory:
+        """
+        Converte uma história produzida pelo LLM em uma história gerada.
+        
+        Args:
+            draft: História produzida pelo LLM
+            story_type: Tipo atribuído à história
             
-        except Exception as e:
-            print(f"Erro ao gerar história com LLM: {e}")
-            # Fallback para implementação mock
-            return await self._generate_stories_mock(request)
+        Returns:
+            GeneratedStory: História com ID e tipo preenchidos
+        """
+        return GeneratedStory(id=_new_story_id(), story_type=story_type, **draft.model_dump())
     
     async def _generate_stories_mock(self, request: StoryRequest) -> List[GeneratedStory]:
         """
@@ -196,18 +883,17 @@ class StoryAgent:
         Returns:
             List[GeneratedStory]: Lista de histórias geradas
         """
-        stories = []
-        
+        # Se for épico, gerar história principal e relacionadas concorrentemente
+        if request.story_type == StoryType.EPIC:
+            main_story, related_stories = await asyncio.gather(
+                self._generate_single_story(request),
+                self._generate_related_stories(request)
+            )
+            return [main_story, *related_stories]
+
         # Gerar história principal
         main_story = await self._generate_single_story(request)
-        stories.append(main_story)
-        
-        # Se for épico, gerar histórias relacionadas
-        if request.story_type == StoryType.EPIC:
-            related_stories = await self._generate_related_stories(request, main_story)
-            stories.extend(related_stories)
-            
-        return stories
+        return [main_story]
         
     async def _generate_single_story(self, request: StoryRequest) -> GeneratedStory:
         """
@@ -219,33 +905,32 @@ class StoryAgent:
         Returns:
             GeneratedStory: História gerada
         """
-        story_id = str(uuid.uuid4())
+        story_id = _new_story_id()
         
         # Extrair informações relevantes do contexto fornecido
         context_lower = request.context.lower()
         
-        # Identificar se é sobre o "Ideia no Bolso" ou outro contexto
-        if "ideia no bolso" in context_lower or "inovação" in context_lower:
-            return self._generate_innovation_story(request, story_id)
+        # Contextos conhecidos (ex.: "Ideia no Bolso") têm geradores específicos
+        specialized_context = _match_rule(SPECIALIZED_CONTEXTS, context_lower, None)
+        if specialized_context is not None:
+            generator = self._SPECIALIZED_STORY_GENERATORS[specialized_context]
+            return generator(self, request, story_id)
         
         # Para outros contextos, gerar baseado no conteúdo real
-        feature_keywords = self._extract_feature_keywords(request.context)
+        feature_keywords = self._extract_feature_keywords(request.context, context_lower)
         
         # Gerar título baseado no contexto real
-        if request.story_type == StoryType.EPIC:
-            title = f"Épico: {feature_keywords['main_feature']}"
-        elif request.story_type == StoryType.USER_STORY:
-            title = f"Como {feature_keywords['user_type']}, eu quero {feature_keywords['action']} para {feature_keywords['benefit']}"
-        else:
-            title = f"Implementar {feature_keywords['main_feature']}"
+        title = TITLE_TEMPLATES.get(request.story_type, DEFAULT_TITLE_TEMPLATE).format(**feature_keywords)
         
         # Gerar critérios de aceitação baseados no contexto
-        acceptance_criteria = []
-        if request.include_acceptance_criteria:
-            acceptance_criteria = self._generate_contextual_criteria(request.context)
+        tags = _scan_feature_tags(context_lower)
+        acceptance_criteria = (
+            self._generate_contextual_criteria(request.context, tags)
+            if request.include_acceptance_criteria else []
+        )
         
         # Gerar tarefas baseadas no contexto
-        tasks = self._generate_contextual_detailed_tasks(request.context)
+        tasks = self._generate_contextual_detailed_tasks(request.context, tags)
         
         return GeneratedStory(
             id=story_id,
@@ -260,88 +945,56 @@ class StoryAgent:
             justificativa_estimativa="Estimativa baseada na complexidade média identificada no contexto"
         )
         
-    async def _generate_related_stories(self, request: StoryRequest, main_story: GeneratedStory) -> List[GeneratedStory]:
+    async def _generate_related_stories(self, request: StoryRequest) -> List[GeneratedStory]:
         """
         Gera histórias relacionadas a um épico baseado no contexto.
-        
+
+        Não depende da história principal, o que permite gerá-las
+        em paralelo com ela.
+
         Args:
             request: Dados da requisição
-            main_story: História principal
-            
+
         Returns:
             List[GeneratedStory]: Histórias relacionadas
         """
-        related_stories = []
         context_lower = request.context.lower()
         
-        # Se for sobre "Ideia no Bolso", gerar histórias específicas
-        if "ideia no bolso" in context_lower or "inovação" in context_lower:
-            related_stories = self._generate_innovation_related_stories(request)
-        else:
-            # Para outros contextos, gerar histórias relacionadas baseadas no contexto
-            feature_keywords = self._extract_feature_keywords(request.context)
-            related_stories = self._generate_contextual_related_stories(request, feature_keywords)
+        # Contextos conhecidos (ex.: "Ideia no Bolso") têm geradores específicos
+        specialized_context = _match_rule(SPECIALIZED_CONTEXTS, context_lower, None)
+        if specialized_context is not None:
+            generator = self._SPECIALIZED_RELATED_STORIES_GENERATORS[specialized_context]
+            return generator(self, request)
         
-        return related_stories
+        # Para outros contextos, gerar histórias relacionadas baseadas no contexto
+        feature_keywords = self._extract_feature_keywords(request.context, context_lower)
+        return self._generate_contextual_related_stories(request, feature_keywords)
     
-    def _extract_feature_keywords(self, context: str) -> Dict[str, str]:
+    def _extract_feature_keywords(self, context: str, context_lower: Optional[str] = None) -> Dict[str, str]:
         """
         Extrai palavras-chave do contexto para gerar histórias mais precisas.
         
         Args:
             context: Contexto fornecido pelo usuário
+            context_lower: Contexto em minúsculas, quando já calculado pelo chamador
             
         Returns:
             Dict[str, str]: Dicionário com palavras-chave extraídas
         """
-        context_lower = context.lower()
+        if context_lower is None:
+            context_lower = context.lower()
         
         # Extrair funcionalidade principal
-        main_feature = "funcionalidade"
-        if "login" in context_lower or "autenticação" in context_lower:
-            main_feature = "sistema de autenticação"
-        elif "cadastro" in context_lower or "registro" in context_lower:
-            main_feature = "sistema de cadastro"
-        elif "relatório" in context_lower or "dashboard" in context_lower:
-            main_feature = "sistema de relatórios"
-        elif "pagamento" in context_lower or "transação" in context_lower:
-            main_feature = "sistema de pagamentos"
-        else:
+        main_feature = _match_rule(MAIN_FEATURE_RULES, context_lower, None)
+        if main_feature is None:
             # Tentar extrair da primeira frase
             sentences = context.split('.')[0].split()
-            if len(sentences) > 2:
-                main_feature = ' '.join(sentences[:3])
-        
-        # Identificar tipo de usuário
-        user_type = "usuário"
-        if "administrador" in context_lower or "admin" in context_lower:
-            user_type = "administrador"
-        elif "cliente" in context_lower:
-            user_type = "cliente"
-        elif "colaborador" in context_lower:
-            user_type = "colaborador"
-        elif "gerente" in context_lower or "gestor" in context_lower:
-            user_type = "gestor"
-        
-        # Identificar ação principal
-        action = "utilizar a funcionalidade"
-        if "criar" in context_lower or "cadastrar" in context_lower:
-            action = "criar/cadastrar informações"
-        elif "visualizar" in context_lower or "consultar" in context_lower:
-            action = "visualizar/consultar dados"
-        elif "editar" in context_lower or "alterar" in context_lower:
-            action = "editar/alterar informações"
-        elif "excluir" in context_lower or "remover" in context_lower:
-            action = "excluir/remover dados"
-        
-        # Identificar benefício
-        benefit = "atender aos requisitos do sistema"
-        if "segurança" in context_lower:
-            benefit = "garantir segurança do sistema"
-        elif "eficiência" in context_lower or "produtividade" in context_lower:
-            benefit = "melhorar eficiência e produtividade"
-        elif "controle" in context_lower:
-            benefit = "ter maior controle sobre as operações"
+            main_feature = ' '.join(sentences[:3]) if len(sentences) > 2 else "funcionalidade"
+        
+        # Identificar tipo de usuário, ação principal e benefício
+        user_type = _match_rule(USER_TYPE_RULES, context_lower, "usuário")
+        action = _match_rule(ACTION_RULES, context_lower, "utilizar a funcionalidade")
+        benefit = _match_rule(BENEFIT_RULES, context_lower, "atender aos requisitos do sistema")
         
         return {
             "main_feature": main_feature,
@@ -372,49 +1025,10 @@ class StoryAgent:
             description = "Desenvolver a funcionalidade que permite aos colaboradores submeterem suas ideias através do aplicativo corporativo, incluindo formulário de submissão e validação inicial."
         
         # Critérios específicos para Ideia no Bolso
-        acceptance_criteria = []
-        if request.include_acceptance_criteria:
-            acceptance_criteria = [
-                AcceptanceCriteria(
-                    given="Que o colaborador está autenticado no app corporativo",
-                    when="Ele acessa a funcionalidade 'Ideia no Bolso'",
-                    then="Ele deve conseguir visualizar o formulário de submissão de ideias"
-                ),
-                AcceptanceCriteria(
-                    given="Que o colaborador preencheu todos os campos obrigatórios da ideia",
-                    when="Ele clica em 'Submeter Ideia'",
-                    then="O sistema deve salvar a ideia com status 'em análise' e enviar confirmação"
-                ),
-                AcceptanceCriteria(
-                    given="Que a ideia foi submetida",
-                    when="O status da ideia é alterado pelo time de inovação",
-                    then="O colaborador deve receber notificação em tempo real sobre a mudança"
-                )
-            ]
+        acceptance_criteria = list(INNOVATION_ACCEPTANCE_CRITERIA) if request.include_acceptance_criteria else []
         
         # Tarefas específicas para Ideia no Bolso com DetailedTask
-        tasks = [
-            DetailedTask(
-                title="Criar interface de submissão de ideias",
-                description="Desenvolver interface responsiva (web e mobile) para submissão de ideias pelos colaboradores",
-                examples=["Formulário com campos: título, descrição, categoria, anexos", "Validação de campos obrigatórios"]
-            ),
-            DetailedTask(
-                title="Implementar sistema de categorização",
-                description="Criar sistema para categorizar ideias por tipo, área de negócio e impacto",
-                examples=["Categorias: Produto, Processo, Tecnologia, Atendimento", "Tags personalizáveis"]
-            ),
-            DetailedTask(
-                title="Desenvolver fluxo de validação",
-                description="Implementar workflow de aprovação pelo time de inovação com comentários e feedbacks",
-                examples=["Estados: Submetida, Em análise, Aprovada, Rejeitada", "Sistema de comentários"]
-            ),
-            DetailedTask(
-                title="Criar sistema de notificações",
-                description="Implementar notificações em tempo real para mudanças de status das ideias",
-                examples=["Push notifications", "E-mail notifications", "Notificações in-app"]
-            )
-        ]
+        tasks = list(INNOVATION_TASKS)
         
         return GeneratedStory(
             id=story_id,
@@ -429,141 +1043,50 @@ class StoryAgent:
             justificativa_estimativa="Complexidade alta devido à necessidade de implementar múltiplas interfaces, integrações com sistemas existentes e workflow de aprovação"
         )
     
-    def _generate_contextual_criteria(self, context: str) -> List[AcceptanceCriteria]:
+    def _generate_contextual_criteria(self, context: str, tags: Optional[FrozenSet[str]] = None) -> List[AcceptanceCriteria]:
         """
         Gera critérios de aceitação baseados no contexto fornecido.
         
         Args:
             context: Contexto da funcionalidade
+            tags: Recursos do contexto, quando já identificados pelo chamador
             
         Returns:
             List[AcceptanceCriteria]: Lista de critérios contextuais
         """
-        context_lower = context.lower()
-        criteria = []
-        
-        # Critério básico de autenticação
-        criteria.append(AcceptanceCriteria(
-            given="Que o usuário possui credenciais válidas",
-            when="Ele acessa a funcionalidade",
-            then="Ele deve ser autenticado com sucesso"
-        ))
-        
-        # Critérios específicos baseados no contexto
-        if "formulário" in context_lower or "cadastro" in context_lower:
-            criteria.append(AcceptanceCriteria(
-                given="Que todos os campos obrigatórios foram preenchidos",
-                when="O usuário submete o formulário",
-                then="Os dados devem ser validados e salvos no sistema"
-            ))
-        
-        if "notificação" in context_lower or "alerta" in context_lower:
-            criteria.append(AcceptanceCriteria(
-                given="Que uma ação relevante foi executada",
-                when="O sistema processa a ação",
-                then="Uma notificação deve ser enviada ao usuário apropriado"
-            ))
-        
-        if "relatório" in context_lower or "dashboard" in context_lower:
-            criteria.append(AcceptanceCriteria(
-                given="Que existem dados disponíveis no sistema",
-                when="O usuário solicita visualização de relatórios",
-                then="Os dados devem ser apresentados de forma clara e organizada"
-            ))
-        
-        return criteria
-    
-    def _generate_contextual_tasks(self, context: str) -> List[str]:
+        if tags is None:
+            tags = _scan_feature_tags(context.lower())
+        return _items_for_tags(BASE_ACCEPTANCE_CRITERIA, CRITERIA_BY_FEATURE, tags)
+    
+    def _generate_contextual_tasks(self, context: str, tags: Optional[FrozenSet[str]] = None) -> List[str]:
         """
         Gera tarefas baseadas no contexto fornecido.
         
         Args:
             context: Contexto da funcionalidade
+            tags: Recursos do contexto, quando já identificados pelo chamador
             
         Returns:
             List[str]: Lista de tarefas contextuais
         """
-        context_lower = context.lower()
-        tasks = []
-        
-        # Tarefas básicas
-        tasks.append("Criar interface de usuário responsiva")
-        tasks.append("Implementar validações de entrada")
-        tasks.append("Desenvolver lógica de negócio backend")
-        tasks.append("Criar testes unitários e de integração")
-        
-        # Tarefas específicas baseadas no contexto
-        if "banco de dados" in context_lower or "persistência" in context_lower:
-            tasks.append("Modelar e criar estruturas no banco de dados")
-            tasks.append("Implementar camada de acesso a dados")
-        
-        if "api" in context_lower or "integração" in context_lower:
-            tasks.append("Desenvolver endpoints REST")
-            tasks.append("Implementar integração com sistemas externos")
-        
-        if "autenticação" in context_lower or "segurança" in context_lower:
-            tasks.append("Implementar sistema de autenticação e autorização")
-            tasks.append("Configurar políticas de segurança")
-        
-        if "mobile" in context_lower:
-            tasks.append("Adaptar interface para dispositivos móveis")
-            tasks.append("Implementar funcionalidades específicas mobile")
-        
-        if "relatório" in context_lower or "dashboard" in context_lower:
-            tasks.append("Criar visualizações de dados")
-            tasks.append("Implementar filtros e exportação")
-        
-        return tasks
+        if tags is None:
+            tags = _scan_feature_tags(context.lower())
+        return _items_for_tags(BASE_TASKS, TASKS_BY_FEATURE, tags)
     
-    def _generate_contextual_detailed_tasks(self, context: str) -> List[DetailedTask]:
+    def _generate_contextual_detailed_tasks(self, context: str, tags: Optional[FrozenSet[str]] = None) -> List[DetailedTask]:
         """
         Gera tarefas detalhadas baseadas no contexto fornecido.
         
         Args:
             context: Contexto da funcionalidade
+            tags: Recursos do contexto, quando já identificados pelo chamador
             
         Returns:
             List[DetailedTask]: Lista de tarefas detalhadas contextuais
         """
-        context_lower = context.lower()
-        tasks = []
-        
-        # Tarefas básicas
-        tasks.append(DetailedTask(
-            title="Criar interface de usuário",
-            description="Desenvolver interface responsiva e acessível para a funcionalidade",
-            examples=["Design system consistente", "Responsividade mobile-first", "Acessibilidade WCAG"]
-        ))
-        
-        tasks.append(DetailedTask(
-            title="Implementar validações",
-            description="Desenvolver validações de entrada e regras de negócio",
-            examples=["Validação de campos obrigatórios", "Sanitização de dados", "Feedback de erro"]
-        ))
-        
-        # Tarefas específicas baseadas no contexto
-        if "banco de dados" in context_lower or "persistência" in context_lower:
-            tasks.append(DetailedTask(
-                title="Modelar estruturas de dados",
-                description="Criar modelos de dados e estruturas no banco de dados",
-                examples=["Diagrama ER", "Scripts de migração", "Índices para performance"]
-            ))
-        
-        if "api" in context_lower or "integração" in context_lower:
-            tasks.append(DetailedTask(
-                title="Desenvolver endpoints REST",
-                description="Implementar APIs RESTful para comunicação entre sistemas",
-                examples=["Documentação OpenAPI", "Versionamento de API", "Rate limiting"]
-            ))
-        
-        if "autenticação" in context_lower or "segurança" in context_lower:
-            tasks.append(DetailedTask(
-                title="Implementar segurança",
-                description="Configurar autenticação, autorização e políticas de segurança",
-                examples=["JWT tokens", "RBAC permissions", "Audit logs"]
-            ))
-        
-        return tasks
+        if tags is None:
+            tags = _scan_feature_tags(context.lower())
+        return _items_for_tags(BASE_DETAILED_TASKS, DETAILED_TASKS_BY_FEATURE, tags)
     
     def _generate_innovation_related_stories(self, request: StoryRequest) -> List[GeneratedStory]:
         """
@@ -575,38 +1098,14 @@ class StoryAgent:
         Returns:
             List[GeneratedStory]: Histórias relacionadas para inovação
         """
-        related_stories = []
-        
         # História 1: Validação pelo time de inovação
         story1 = GeneratedStory(
-            id=str(uuid.uuid4()),
+            id=_new_story_id(),
             title="Como membro do time de inovação, eu quero validar ideias submetidas para garantir qualidade e alinhamento estratégico",
             description="Como membro do time de inovação, eu quero ter acesso a um painel para revisar, comentar e aprovar/reprovar ideias submetidas pelos colaboradores, para garantir que apenas ideias viáveis e alinhadas com a estratégia sejam encaminhadas para desenvolvimento.",
             story_type=StoryType.USER_STORY,
-            acceptance_criteria=[
-                AcceptanceCriteria(
-                    given="Que existem ideias aguardando validação",
-                    when="Eu acesso o painel de validação",
-                    then="Devo visualizar todas as ideias pendentes com seus detalhes"
-                ),
-                AcceptanceCriteria(
-                    given="Que estou analisando uma ideia",
-                    when="Eu aprovar ou reprovar a ideia",
-                    then="O sistema deve atualizar o status e notificar o colaborador"
-                )
-            ],
-            tasks=[
-                DetailedTask(
-                    title="Criar painel de validação",
-                    description="Desenvolver interface para o time de inovação revisar e validar ideias submetidas",
-                    examples=["Lista de ideias pendentes", "Formulário de feedback", "Sistema de aprovação/reprovação"]
-                ),
-                DetailedTask(
-                    title="Implementar sistema de comentários",
-                    description="Criar funcionalidade para adicionar comentários e feedback nas ideias",
-                    examples=["Editor de texto rico", "Histórico de comentários", "Notificações de novos comentários"]
-                )
-            ],
+            acceptance_criteria=list(INNOVATION_VALIDATION_CRITERIA),
+            tasks=list(INNOVATION_VALIDATION_TASKS),
             priority=Priority.ALTA,
             justificativa_prioridade="Alta prioridade para garantir qualidade das ideias aprovadas",
             estimation=5,
@@ -615,52 +1114,19 @@ class StoryAgent:
         
         # História 2: Dashboard administrativo
         story2 = GeneratedStory(
-            id=str(uuid.uuid4()),
+            id=_new_story_id(),
             title="Como gestor de inovação, eu quero visualizar métricas das ideias para tomar decisões estratégicas",
             description="Como gestor de inovação, eu quero ter acesso a um dashboard com métricas como número de ideias por mês, áreas mais ativas, taxa de aprovação e outros indicadores, para poder tomar decisões estratégicas sobre o programa de inovação.",
             story_type=StoryType.USER_STORY,
-            acceptance_criteria=[
-                AcceptanceCriteria(
-                    given="Que existem dados de ideias no sistema",
-                    when="Eu acesso o dashboard administrativo",
-                    then="Devo visualizar métricas consolidadas com filtros por período e categoria"
-                ),
-                AcceptanceCriteria(
-                    given="Que quero analisar dados específicos",
-                    when="Eu aplico filtros no dashboard",
-                    then="Os dados devem ser atualizados em tempo real conforme os filtros"
-                )
-            ],
-            tasks=[
-                DetailedTask(
-                    title="Criar dashboard com visualizações de dados",
-                    description="Desenvolver interface gráfica com charts e métricas visuais para o dashboard administrativo",
-                    examples=["Gráficos de barras", "Charts de pizza", "Tabelas interativas"]
-                ),
-                DetailedTask(
-                    title="Implementar métricas de engajamento e aprovação",
-                    description="Desenvolver cálculos e indicadores de performance do programa de inovação",
-                    examples=["Taxa de aprovação por categoria", "Tempo médio de análise", "Ranking de colaboradores"]
-                ),
-                DetailedTask(
-                    title="Desenvolver sistema de filtros",
-                    description="Implementar filtros dinâmicos por categoria, período, área e status das ideias",
-                    examples=["Filtro por data range", "Filtro por departamento", "Filtro por status"]
-                ),
-                DetailedTask(
-                    title="Implementar funcionalidade de exportação",
-                    description="Desenvolver exportação de dados em múltiplos formatos (Excel, PDF, CSV)",
-                    examples=["Export to Excel", "Export to PDF", "Scheduled reports"]
-                )
-            ],
+            acceptance_criteria=list(INNOVATION_DASHBOARD_CRITERIA),
+            tasks=list(INNOVATION_DASHBOARD_TASKS),
             priority=Priority.MEDIA,
             justificativa_prioridade="Prioridade média devido à importância para gestão, mas não é crítica para o funcionamento básico",
             estimation=8,
             justificativa_estimativa="8 story points devido à complexidade de implementar dashboards com múltiplas visualizações e sistema de filtros avançados"
         )
         
-        related_stories.extend([story1, story2])
-        return related_stories
+        return [story1, story2]
     
     def _generate_contextual_related_stories(self, request: StoryRequest, feature_keywords: Dict[str, str]) -> List[GeneratedStory]:
         """
@@ -673,88 +1139,86 @@ class StoryAgent:
         Returns:
             List[GeneratedStory]: Histórias relacionadas contextuais
         """
-        related_stories = []
+        main_feature = feature_keywords['main_feature']
+        user_type = feature_keywords['user_type']
         
         # História relacionada 1: Interface administrativa
         story1 = GeneratedStory(
-            id=str(uuid.uuid4()),
-            title=f"Como administrador, eu quero gerenciar {feature_keywords['main_feature']} para manter o controle do sistema",
-            description=f"Como administrador do sistema, eu quero ter uma interface para gerenciar e configurar {feature_keywords['main_feature']}, incluindo permissões, configurações e monitoramento.",
+            id=_new_story_id(),
+            title=f"Como administrador, eu quero gerenciar {main_feature} para manter o controle do sistema",
+            description=f"Como administrador do sistema, eu quero ter uma interface para gerenciar e configurar {main_feature}, incluindo permissões, configurações e monitoramento.",
             story_type=StoryType.USER_STORY,
-            acceptance_criteria=[
-                AcceptanceCriteria(
-                    given="Que tenho permissões de administrador",
-                    when="Acesso o painel administrativo",
-                    then="Devo ter acesso a todas as configurações do sistema"
-                )
-            ],
-            tasks=[
-                "Criar interface administrativa",
-                "Implementar controle de permissões",
-                "Desenvolver funcionalidades de configuração"
-            ],
-            priority="Média",
-            estimation="5 Story Points"
+            acceptance_criteria=list(ADMIN_CRITERIA),
+            tasks=list(ADMIN_TASKS),
+            priority=Priority.MEDIA,
+            justificativa_prioridade="Prioridade média: a gestão da funcionalidade é necessária, mas não bloqueia o uso principal",
+            estimation=5,
+            justificativa_estimativa="Complexidade média envolvendo interface administrativa, permissões e configurações"
         )
         
         # História relacionada 2: Relatórios e monitoramento
         story2 = GeneratedStory(
-            id=str(uuid.uuid4()),
-            title=f"Como {feature_keywords['user_type']}, eu quero visualizar relatórios sobre {feature_keywords['main_feature']} para acompanhar o desempenho",
-            description=f"Como {feature_keywords['user_type']}, eu quero ter acesso a relatórios e métricas sobre o uso de {feature_keywords['main_feature']} para poder acompanhar o desempenho e tomar decisões informadas.",
+            id=_new_story_id(),
+            title=f"Como {user_type}, eu quero visualizar relatórios sobre {main_feature} para acompanhar o desempenho",
+            description=f"Como {user_type}, eu quero ter acesso a relatórios e métricas sobre o uso de {main_feature} para poder acompanhar o desempenho e tomar decisões informadas.",
             story_type=StoryType.USER_STORY,
-            acceptance_criteria=[
-                AcceptanceCriteria(
-                    given="Que existem dados no sistema",
-                    when="Solicito relatórios",
-                    then="Devo visualizar dados organizados e filtráveis"
-                )
-            ],
-            tasks=[
-                "Implementar geração de relatórios",
-                "Criar visualizações de dados",
-                "Desenvolver filtros e exportação"
-            ],
-            priority="Baixa",
-            estimation="3 Story Points"
+            acceptance_criteria=list(REPORTS_CRITERIA),
+            tasks=list(REPORTS_TASKS),
+            priority=Priority.BAIXA,
+            justificativa_prioridade="Prioridade baixa: relatórios complementam a funcionalidade principal",
+            estimation=3,
+            justificativa_estimativa="Complexidade baixa, reaproveitando os dados já existentes no sistema"
         )
         
-        related_stories.extend([story1, story2])
-        return related_stories
+        return [story1, story2]
         
-    async def validate_story(self, story: GeneratedStory) -> Dict[str, Any]:
+    # Geradores dos contextos listados em SPECIALIZED_CONTEXTS
+    _SPECIALIZED_STORY_GENERATORS = {
+        "innovation": _generate_innovation_story,
+    }
+    _SPECIALIZED_RELATED_STORIES_GENERATORS = {
+        "innovation": _generate_innovation_related_stories,
+    }
+        
+    def validate_story(self, story: GeneratedStory) -> Dict[str, Any]:
         """
         Valida uma história gerada.
         
+        A validação é puramente local (sem LLM), por isso o método é síncrono.
+        
         Args:
             story: História a ser validada
             
         Returns:
             Dict[str, Any]: Resultado da validação
         """
-        # Mock implementation
-        issues = []
-        suggestions = []
+        failed = [(issue, suggestion) for check, issue, suggestion in STORY_QUALITY_CHECKS if check(story)]
         
-        # Validações básicas
-        if len(story.title) < 10:
-            issues.append("Título muito curto")
-            suggestions.append("Expandir o título para ser mais descritivo")
-            
-        if len(story.description) < 20:
-            issues.append("Descrição muito curta")
-            suggestions.append("Adicionar mais detalhes na descrição")
-            
-        if not story.acceptance_criteria:
-            issues.append("Critérios de aceitação ausentes")
-            suggestions.append("Adicionar critérios de aceitação em formato Gherkin")
-            
-        # Calcular score
-        score = max(0, 100 - (len(issues) * 20))
+        # Caso mais comum: história sem problemas
+        if not failed:
+            return {"valid": True, "issues": [], "suggestions": [], "score": 100}
+        
+        issues, suggestions = (list(column) for column in zip(*failed))
         
         return {
-            "valid": len(issues) == 0,
+            "valid": False,
             "issues": issues,
             "suggestions": suggestions,
-            "score": score
+            # As verificações não somam mais de 100 pontos
+            "score": 100 - len(failed) * 20
         }
+
+
+@lru_cache(maxsize=1)
+def get_story_agent() -> StoryAgent:
+    """
+    Obtém o agente de histórias compartilhado pela aplicação.
+    
+    O agente não guarda estado por requisição, então uma única instância
+    atende a todas elas, reaproveitando o LLM já carregado e seus
+    objetos de saída estruturada.
+    
+    Returns:
+        StoryAgent: Instância compartilhada do agente
+    """
+    return StoryAgent()
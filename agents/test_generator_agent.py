@@ -5,8 +5,22 @@ Este módulo implementa um agente baseado em LangGraph para
 geração automatizada de testes unitários a partir de código.
 """
 
-import uuid
-from typing import List, Tuple, Dict, Any
+import ast
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Any, AsyncIterator, Mapping, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import ValidationError
+from pydantic_core import from_json
 
 from schemas.code_schemas import (
     CodeRequest, 
@@ -17,93 +31,849 @@ from schemas.code_schemas import (
     CodeLanguage
 )
 from services.llm_factory import load_llm
+from services.llm_limiter import get_llm_semaphore, iterate_with_llm_slot
 from services.gitlab_service import GitLabService
 
 
-unit_test_policy = {
-    "version": "1.0",
-    "generated_for": "IA Agent - Test Generator",
-    "last_updated": "2025-07-10",
+logger = logging.getLogger(__name__)
+
+# orjson (opcional) interpreta respostas grandes do LLM bem mais rápido que
+# o json da biblioteca padrão; ambos aceitam str e levantam ValueError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Converte recursivamente dicionários e listas em estruturas imutáveis.
+    
+    Args:
+        value: Valor a ser congelado
+        
+    Returns:
+        Any: MappingProxyType para dicionários, tupla para listas ou o próprio valor
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=1)
+def get_unit_test_policy() -> Mapping[str, Any]:
+    """
+    Obtém a política de testes unitários seguida pelo agente.
+    
+    A política é montada apenas no primeiro uso e devolvida congelada
+    (mapeamentos somente leitura e tuplas), de modo que a mesma instância
+    possa ser compartilhada sem risco de alteração acidental.
+    
+    Returns:
+        Mapping[str, Any]: Política de testes somente leitura
+    """
+    return _freeze({
+        "version": "1.0",
+        "generated_for": "IA Agent - Test Generator",
+        "last_updated": "2025-07-10",
+
+        "naming": {
+            "style": "human_readable_sentence",
+            "examples": [
+                "should_return_false_when_balance_is_insufficient",
+                "should_throw_error_when_user_is_not_authenticated",
+                "deve_retornar_erro_quando_usuario_estiver_desconectado"
+            ],
+            "guidelines": [
+                "Use sentenças descritivas que expressem comportamento esperado",
+                "Evite acoplamento a nomes internos de métodos ou variáveis",
+                "Use snake_case ou camelCase conforme a linguagem exigir",
+                "Use prefixos como 'should_', 'deve_', 'quando_', 'retorna_'"
+            ]
+        },
+
+        "structure": {
+            "format": "AAA",
+            "steps": [
+                {"arrange": "Configure os dados, mocks e contexto necessários"},
+                {"act": "Execute a ação ou função sob teste"},
+                {"assert": "Verifique o comportamento ou valor esperado"}
+            ],
+            "example_structure": [
+                "Dado que uma conta tem saldo zero",
+                "Quando uma retirada é solicitada",
+                "Então deve retornar erro de saldo insuficiente"
+            ]
+        },
+
+        "organization": {
+            "project_folders": {
+                "source_code": "/src/<project_name>/",
+                "test_code": "/tests/<project_name>.Tests/"
+            },
+            "test_file_naming": {
+                "pattern": "<ClassName>Should"
+            },
+            "test_grouping": [
+                "Organizar testes por componente ou classe principal",
+                "Testes relacionados a métodos similares podem estar no mesmo arquivo"
+            ]
+        },
+
+        "quality_criteria": [
+            "Testes devem ser rápidos (execução em milissegundos)",
+            "Devem ser determinísticos (sem flutuação de resultados)",
+            "Isolados de dependências externas (sem acesso real à rede, banco ou tempo)",
+            "Utilizar mocks, stubs ou fakes para dependências externas",
+            "Testes devem ser autoexplicativos sem necessidade de comentários",
+            "Cobrir caminhos principais, bordas e exceções de forma independente"
+        ],
+
+        "test_design": {
+            "test_type": "unit",
+            "mock_usage": "true",
+            "coverage_expectation": {
+                "min_expected_coverage": 80,
+                "required_for": ["critical modules", "core business logic"]
+            },
+            "language_independent_expectations": [
+                "Os testes devem refletir regras de negócio, não apenas cobertura técnica",
+                "Um teste por cenário, evitando múltiplos asserts se possível",
+                "Falhas devem fornecer mensagens claras sobre a causa do erro"
+            ]
+        },
+
+        "agent_instructions": {
+            "expected_input": "Código-fonte em linguagem suportada, em texto puro ou estruturado",
+            "expected_output": [
+                "Arquivo ou trecho de teste com nomes claros e estruturado conforme esta política",
+                "Uso explícito de AAA",
+                "Inclusão de mocks quando detectadas dependências externas"
+            ],
+            "fallback_behavior": [
+                "Se houver ambiguidade, gerar o teste mais simples possível e sinalizar incerteza",
+                "Nunca inventar lógicas de negócio: basear-se apenas no código fornecido"
+            ]
+        }
+    })
+
+# Padrões da análise estrutural por regex, compilados uma única vez
+_PY_FUNCTION_PATTERN = re.compile(r'def\s+(\w+)\s*\([^)]*\):')
+_PY_CLASS_PATTERN = re.compile(r'class\s+(\w+)\s*[\(:]')
+_JS_CLASS_PATTERN = re.compile(r'class\s+(\w+)\s*(?:extends\s+\w+)?\s*\{')
+# Tokens relevantes para casar chaves em JavaScript: strings e comentários
+# (consumidos inteiros, mesmo sem fechamento) e as próprias chaves
+_JS_BRACE_TOKEN_PATTERN = re.compile(
+    r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*(?:`|\Z)'
+    r'|//[^\n]*|/\*.*?(?:\*/|\Z)|[{}]',
+    re.DOTALL
+)
+_JS_METHOD_PATTERN = re.compile(r'(constructor|\w+)(?=\s*\([^)]*\)\s*\{)')
+_JS_FUNCTION_PATTERN = re.compile(r'function\s+(\w+)\s*\([^)]*\)')
+_JS_IMPORT_PATTERNS = (
+    re.compile(r'import\s+.*?from\s+["\']([^"\']+)["\']'),
+    re.compile(r'require\s*\(\s*["\']([^"\']+)["\']\s*\)'),
+    re.compile(r'import\s*\(\s*["\']([^"\']+)["\']\s*\)'),
+)
+
+# Critérios de validação dos testes gerados; cada categoria é verificada com
+# uma única varredura do código por meio de uma alternância
+GENERIC_TEST_REFS = ("my_function", "my_module", "example_function")
+_GENERIC_TEST_REF_PATTERN = re.compile("|".join(map(re.escape, GENERIC_TEST_REFS)))
+# Pytest, nomes no estilo should, classe unittest, Jest/describe, anotação Java/C#
+_TEST_STRUCTURE_PATTERN = re.compile(r'def test_|def should_|class Test|test\(|describe\(|@Test')
+# Asserções Python/Java/C#, expect do JavaScript, estilo BDD (qualquer caixa) e pytest.raises
+_TEST_VERIFICATION_PATTERN = re.compile(r'assert|expect\(|Assert\.|(?i:should)|pytest\.raises')
+
+# Módulos de topo que indicam dependências externas (rede, banco, tempo,
+# sistema). Cada importação é verificada pelo seu pacote raiz ("os.path" -> "os").
+EXTERNAL_DEPENDENCIES = frozenset({
+    'requests', 'httpx', 'aiohttp', 'http', 'urllib', 'urllib3', 'socket',
+    'database', 'sqlite', 'sqlite3', 'mysql', 'postgres', 'psycopg2', 'redis',
+    'time', 'random', 'os', 'sys',
+})
+
+# Análise estrutural compartilhada, somente leitura, das linguagens sem
+# analisador dedicado
+EMPTY_CODE_STRUCTURE = MappingProxyType({
+    "functions": (),
+    "classes": (),
+    "dependencies": (),
+    "complexity": "medium",
+    "has_external_dependencies": False,
+    "imports": (),
+    "class_details": MappingProxyType({}),
+})
+
+# Análise devolvida pela implementação mock de _analyze_code; CodeAnalysis é
+# imutável, então a mesma instância é compartilhada entre as requisições
+MOCK_CODE_ANALYSIS = CodeAnalysis(
+    complexity_score=75,
+    maintainability_index=80,
+    test_coverage_potential=85,
+    code_smells=(
+        "Função muito longa",
+        "Falta de documentação"
+    ),
+    suggestions=(
+        "Dividir função em funções menores",
+        "Adicionar docstrings",
+        "Implementar validação de entrada"
+    )
+)
+
+# Framework padrão de cada linguagem quando o solicitado é AUTO
+DEFAULT_TEST_FRAMEWORKS = MappingProxyType({
+    CodeLanguage.PYTHON: TestFramework.PYTEST,
+    CodeLanguage.JAVASCRIPT: TestFramework.JEST,
+    CodeLanguage.TYPESCRIPT: TestFramework.JEST,
+    CodeLanguage.JAVA: TestFramework.JUNIT,
+    CodeLanguage.CSHARP: TestFramework.NUNIT,
+    CodeLanguage.GO: TestFramework.GOTEST,
+    CodeLanguage.RUST: TestFramework.PYTEST,  # Usando pytest como fallback genérico
+    CodeLanguage.PHP: TestFramework.PYTEST,  # Usando pytest como fallback genérico
+})
+
+# Modelos do código de teste gerado pelo fallback, indexados por
+# (linguagem, framework) e preenchidos com str.format
+_JEST_FALLBACK_TEST_BODY = '''
+
+describe('{class_name} Tests', () => {{
+    test('{name}', () => {{
+        // Arrange
+        const instance = new {class_name}();
+        
+        // Act
+        const result = instance.{method_name}();
+        
+        // Assert
+        expect(result).toBeDefined();
+    }});
+}});'''
+
+FALLBACK_TEST_TEMPLATES = MappingProxyType({
+    (CodeLanguage.PYTHON, TestFramework.PYTEST): '''
+import pytest
+from src.main import {method_name}
+
+def {name}():
+    \"\"\"
+    {description}
+    \"\"\"
+    # Arrange
+    test_input = "test_value"
+    
+    # Act
+    result = {method_name}(test_input)
+    
+    # Assert
+    assert result is not None
+''',
+    (CodeLanguage.JAVASCRIPT, TestFramework.JEST):
+        "\nconst {{ {class_name} }} = require('./counter');" + _JEST_FALLBACK_TEST_BODY,
+    (CodeLanguage.TYPESCRIPT, TestFramework.JEST):
+        "\nimport {{ {class_name} }} from './counter';" + _JEST_FALLBACK_TEST_BODY,
+})
+
+GENERIC_FALLBACK_TEST_TEMPLATE = "// Teste: {name}\n// {description}\n// TODO: Implementar teste específico (fallback)"
+
+# Cabeçalhos (imports) compartilhados pelos modelos de testes específicos;
+# concatenados aos corpos uma única vez, na importação do módulo
+_PYTEST_FREEZEGUN_HEADER = "\nimport pytest\nfrom datetime import datetime\nfrom src.main import {class_name}\nfrom freezegun import freeze_time\n"
+_PYTEST_SRC_MAIN_TRANSACTION_HEADER = "\nimport pytest\nfrom src.main import {class_name}, Transaction\n"
+_PYTEST_SRC_MAIN_HEADER = "\nimport pytest\nfrom src.main import {class_name}\n"
+_PYTEST_YOUR_MODULE_TRANSACTION_HEADER = "\nimport pytest\nfrom your_module import {class_name}, Transaction\n"
+_PYTEST_YOUR_MODULE_HEADER = "\nimport pytest\nfrom your_module import {class_name}\n"
+
+# Modelos dos testes específicos por tipo de método (e cenário), preenchidos
+# com str.format por _render_specific_test
+INIT_TEST_TEMPLATE = _PYTEST_SRC_MAIN_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    description = "Test transaction"
+    amount = 100.0
+    
+    # Act
+    instance = {class_name}(description, amount)
+    
+    # Assert
+    assert instance.description == description
+    assert instance.amount == amount
+    assert instance.date is not None
+'''
+
+REPR_TEST_TEMPLATE = _PYTEST_FREEZEGUN_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    description = "Test transaction"
+    amount = 100.0
+    test_date = datetime(2023, 1, 1)
+    with freeze_time("2023-01-01"):
+        instance = {class_name}(description, amount, test_date)
+    
+    # Act
+    result = str(instance)
+    
+    # Assert
+    assert description in result
+    assert "100.00" in result
+    assert "2023-01-01" in result
+'''
+
+BALANCE_TEST_TEMPLATES = MappingProxyType({
+    "happy_path": _PYTEST_SRC_MAIN_TRANSACTION_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    transaction1 = Transaction("Deposit", 100.0)
+    transaction2 = Transaction("Withdrawal", -50.0)
+    wallet.add_transaction(transaction1)
+    wallet.add_transaction(transaction2)
+    
+    # Act
+    balance = wallet.{method_name}()
+    
+    # Assert
+    assert balance == 50.0
+''',
+    "edge_cases": _PYTEST_SRC_MAIN_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    
+    # Act
+    balance = wallet.{method_name}()
+    
+    # Assert
+    assert balance == 0.0
+''',
+    "error_handling": _PYTEST_SRC_MAIN_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    
+    # Act & Assert
+    # Teste se o método é robusto para casos extremos
+    balance = wallet.{method_name}()
+    assert isinstance(balance, (int, float))
+''',
+})
+
+TRANSACTION_TEST_TEMPLATES = MappingProxyType({
+    "happy_path": _PYTEST_YOUR_MODULE_TRANSACTION_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    transaction = Transaction("Test Transaction", 100.0)
+    
+    # Act
+    wallet.{method_name}(transaction)
+    
+    # Assert
+    assert len(wallet.transactions) == 1
+    assert wallet.transactions[0] == transaction
+''',
+    "edge_cases": _PYTEST_YOUR_MODULE_TRANSACTION_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    large_transaction = Transaction("Large Transaction", 999999.99)
+    negative_transaction = Transaction("Negative Transaction", -999999.99)
+    
+    # Act
+    wallet.{method_name}(large_transaction)
+    wallet.{method_name}(negative_transaction)
+    
+    # Assert
+    assert len(wallet.transactions) == 2
+    assert wallet.get_balance() == 0.0
+''',
+    "error_handling": _PYTEST_YOUR_MODULE_TRANSACTION_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    invalid_transaction = Transaction("Invalid", 0.0)
+    
+    # Act
+    # Act & Assert combinados para teste de exceção
+    with pytest.raises(ValueError, match="O valor da transação não pode ser zero"):
+        wallet.{method_name}(invalid_transaction)
+        
+    # Assert
+    # Validação adicional se necessária
+    assert len(wallet.transactions) == 0
+''',
+})
+
+STATEMENT_TEST_TEMPLATES = MappingProxyType({
+    "happy_path": _PYTEST_YOUR_MODULE_TRANSACTION_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    transaction1 = Transaction("Transaction 1", 100.0)
+    transaction2 = Transaction("Transaction 2", -50.0)
+    wallet.add_transaction(transaction1)
+    wallet.add_transaction(transaction2)
+    
+    # Act
+    statement = wallet.{method_name}()
+    
+    # Assert
+    assert len(statement) == 2
+    assert isinstance(statement, list)
+    assert all(isinstance(item, str) for item in statement)
+''',
+    "edge_cases": _PYTEST_YOUR_MODULE_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    
+    # Act
+    statement = wallet.{method_name}()
+    
+    # Assert
+    assert isinstance(statement, list)
+    assert len(statement) == 0
+''',
+    "error_handling": _PYTEST_YOUR_MODULE_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    wallet = {class_name}("Test User")
+    
+    # Act
+    statement = wallet.{method_name}()
+    
+    # Assert
+    assert isinstance(statement, list)
+''',
+})
+
+GENERIC_METHOD_TEST_TEMPLATE = _PYTEST_YOUR_MODULE_HEADER + '''
+def {test_name}():
+    """
+    {test_description}
+    """
+    # Arrange
+    instance = {class_name}("test_param")
+    {param_setup}
+    
+    # Act
+    result = instance.{method_name}({param_call})
+    
+    # Assert
+    assert result is not None
+'''
+
+
+# Dependências de cada framework de teste, compartilhadas (somente leitura)
+# entre os testes gerados
+TEST_DEPENDENCIES = MappingProxyType({
+    TestFramework.PYTEST: ("pytest", "pytest-cov"),
+    TestFramework.UNITTEST: (),  # Biblioteca padrão
+    TestFramework.JEST: ("jest", "@types/jest"),
+    TestFramework.MOCHA: ("mocha", "chai"),
+    TestFramework.JUNIT: ("junit", "mockito"),
+    TestFramework.NUNIT: ("NUnit", "Moq"),
+    TestFramework.GOTEST: (),  # Biblioteca padrão do Go
+    TestFramework.AUTO: (),  # Será determinado dinamicamente
+})
+
+# Cenários gerados para cada método: (cenário, nome, descrição, cobertura)
+TEST_CASE_SCENARIOS = (
+    ("happy_path",
+     "should_return_expected_value_when_{class_name}_{method_name}_called_with_valid_input",
+     "Deve retornar o valor esperado quando {class_name}.{method_name} é chamada com entrada válida",
+     85),
+    ("edge_cases",
+     "should_handle_edge_cases_when_{class_name}_{method_name}_receives_boundary_values",
+     "Deve tratar casos extremos quando {class_name}.{method_name} recebe valores limítrofes",
+     80),
+    ("error_handling",
+     "should_raise_error_when_{class_name}_{method_name}_receives_invalid_input",
+     "Deve lançar erro apropriado quando {class_name}.{method_name} recebe entrada inválida",
+     75),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _TestCase:
+    """Caso de teste derivado de um método e de um cenário da política de testes."""
+    name: str
+    description: str
+    coverage: int
+    scenario: str
+    target_function: str
+
+
+# Tipo de teste específico de cada método especial; os demais métodos são
+# classificados pelas palavras-chave abaixo, verificadas em ordem
+SPECIAL_METHOD_TEST_KINDS = MappingProxyType({
+    "__init__": "init",
+    "__repr__": "repr",
+    "__str__": "repr",
+})
+METHOD_KIND_KEYWORDS = (
+    ("balance", "balance"),
+    ("add", "transaction"),
+    ("transaction", "transaction"),
+    ("statement", "statement"),
+)
+
+# Modelo do teste específico por (tipo de método, cenário), resolvido uma
+# única vez; métodos genéricos usam GENERIC_METHOD_TEST_TEMPLATE
+SPECIFIC_TEST_TEMPLATES = MappingProxyType({
+    (kind, scenario): template
+    for scenario, *_ in TEST_CASE_SCENARIOS
+    for kind, template in (
+        ("init", INIT_TEST_TEMPLATE),
+        ("repr", REPR_TEST_TEMPLATE),
+        ("balance", BALANCE_TEST_TEMPLATES[scenario]),
+        ("transaction", TRANSACTION_TEST_TEMPLATES[scenario]),
+        ("statement", STATEMENT_TEST_TEMPLATES[scenario]),
+    )
+})
+
+# Tamanhos dos caches de geração do fallback, cada um indexado por uma chave
+# diferente: nome do método, par (classe, método) e teste renderizado
+METHOD_TEST_KIND_CACHE_MAXSIZE = 2048
+TEST_CASES_CACHE_MAXSIZE = 4096
+FALLBACK_TEST_CACHE_MAXSIZE = 2048
+SPECIFIC_TEST_CACHE_MAXSIZE = 2048
+
+
+@lru_cache(maxsize=METHOD_TEST_KIND_CACHE_MAXSIZE)
+def _method_test_kind(method_name: str) -> str:
+    """
+    Classifica um método pelo tipo de teste específico que deve receber.
+    
+    Args:
+        method_name: Nome do método
+        
+    Returns:
+        str: Tipo do teste ("init", "repr", "balance", "transaction", "statement" ou "generic")
+    """
+    kind = SPECIAL_METHOD_TEST_KINDS.get(method_name)
+    if kind is not None:
+        return kind
+    
+    lowered = method_name.lower()
+    return next((kind for keyword, kind in METHOD_KIND_KEYWORDS if keyword in lowered), "generic")
+
+
+# Número de árvores sintáticas mantidas em cache
+AST_CACHE_MAXSIZE = 32
+
+
+@lru_cache(maxsize=AST_CACHE_MAXSIZE)
+def _parse_python(code_content: str) -> ast.Module:
+    """
+    Interpreta código Python, reaproveitando a árvore de fontes já vistas.
+    
+    Requisições repetidas com o mesmo código (novas tentativas, outro
+    framework) evitam um novo ast.parse. A árvore retornada é compartilhada
+    e deve ser tratada como somente leitura.
+    
+    Args:
+        code_content: Código-fonte Python
+        
+    Returns:
+        ast.Module: Árvore sintática do código
+        
+    Raises:
+        SyntaxError: Se o código for inválido (erros não são armazenados em cache)
+    """
+    return ast.parse(code_content)
+
+
+def _find_block_members(code_content: str, open_brace: int) -> Optional[str]:
+    """
+    Localiza o primeiro nível de um bloco JavaScript contando a profundidade das chaves.
+    
+    A varredura é linear no tamanho do código. Apenas o texto no nível das
+    declarações do bloco é mantido: blocos aninhados (corpos de métodos, if,
+    for, catch...) são reduzidos a "{}" e strings e comentários são
+    descartados, de modo que só os cabeçalhos dos membros permaneçam.
+    
+    Args:
+        code_content: Código-fonte
+        open_brace: Posição da chave que abre o bloco
+        
+    Returns:
+        Optional[str]: Primeiro nível do bloco ou None se o bloco não fecha
+    """
+    depth = 0
+    parts = []
+    position = open_brace + 1
+    for token in _JS_BRACE_TOKEN_PATTERN.finditer(code_content, open_brace):
+        brace = token.group()
+        if brace == "{":
+            depth += 1
+            if depth == 2:
+                parts.append(code_content[position:token.start()])
+                parts.append("{")
+        elif brace == "}":
+            depth -= 1
+            if depth == 1:
+                parts.append("}")
+                position = token.end()
+            elif depth == 0:
+                parts.append(code_content[position:token.start()])
+                return "".join(parts)
+        elif depth == 1:
+            # String ou comentário no primeiro nível: não contém declarações
+            parts.append(code_content[position:token.start()])
+            parts.append(" ")
+            position = token.end()
+    return None
+
+
+def _extract_return_type(func_node: ast.FunctionDef) -> str:
+    """
+    Extrai o tipo de retorno de uma função AST.
+    """
+    returns = func_node.returns
+    if isinstance(returns, ast.Name):
+        return returns.id
+    if isinstance(returns, ast.Attribute):
+        return returns.attr
+    if isinstance(returns, ast.Constant) and returns.value is None:
+        return "None"
+    if isinstance(returns, ast.Subscript):
+        return ast.unparse(returns)
+    return "Any"
+
+
+class _CodeStructureVisitor(ast.NodeVisitor):
+    """
+    Coleta a estrutura de um módulo Python em uma única passada.
+    
+    Percorre o módulo e o corpo das classes, mas não desce no corpo das
+    funções: importações e classes locais a funções não fazem parte da
+    estrutura usada na geração de testes.
+    """
+    
+    def __init__(self, analysis: Dict[str, Any]):
+        """
+        Inicializa o visitante.
+        
+        Args:
+            analysis: Análise estrutural a ser preenchida
+        """
+        self.analysis = analysis
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        self.analysis["imports"].extend(alias.name for alias in node.names)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.analysis["imports"].append(node.module)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # Funções globais; métodos são tratados em visit_ClassDef
+        self.analysis["functions"].append(node.name)
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        # Não descer no corpo de funções assíncronas
+        return None
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        class_name = node.name
+        class_details = {
+            "methods": [],
+            "init_params": []
+        }
+        self.analysis["classes"].append(class_name)
+        self.analysis["class_details"][class_name] = class_details
+        
+        # Analisar métodos da classe
+        for item in node.body:
+            if not isinstance(item, ast.FunctionDef):
+                # Classes aninhadas e importações no corpo da classe
+                self.visit(item)
+                continue
+            
+            method_name = item.name
+            params = [arg.arg for arg in item.args.args[1:]]  # Pular 'self'
+            
+            # Extrair parâmetros do __init__
+            if method_name == "__init__":
+                class_details["init_params"] = params
+            
+            # Classificar métodos públicos/privados
+            is_private = method_name.startswith("_") and not method_name.startswith("__")
+            class_details["methods"].append({
+                "name": method_name,
+                "params": params,
+                "returns": _extract_return_type(item),
+                "docstring": ast.get_docstring(item),
+                "visibility": "private" if is_private else "public"
+            })
+
+
+def _strip_json_fence(content: str) -> str:
+    """
+    Remove a cerca de markdown (```json ... ```) da resposta do LLM.
+    
+    Args:
+        content: Texto retornado pelo LLM, completo ou parcial
+        
+    Returns:
+        str: JSON sem a cerca de markdown
+    """
+    content = content.strip()
+    if content.startswith('```json'):
+        content = content[7:]  # Remove ```json
+    if content.endswith('```'):
+        content = content[:-3]  # Remove ```
+    return content.strip()
+
 
-    "naming": {
-        "style": "human_readable_sentence",
-        "examples": [
-            "should_return_false_when_balance_is_insufficient",
-            "should_throw_error_when_user_is_not_authenticated",
-            "deve_retornar_erro_quando_usuario_estiver_desconectado"
-        ],
-        "guidelines": [
-            "Use sentenças descritivas que expressem comportamento esperado",
-            "Evite acoplamento a nomes internos de métodos ou variáveis",
-            "Use snake_case ou camelCase conforme a linguagem exigir",
-            "Use prefixos como 'should_', 'deve_', 'quando_', 'retorna_'"
-        ]
-    },
-
-    "structure": {
-        "format": "AAA",
-        "steps": [
-            {"arrange": "Configure os dados, mocks e contexto necessários"},
-            {"act": "Execute a ação ou função sob teste"},
-            {"assert": "Verifique o comportamento ou valor esperado"}
-        ],
-        "example_structure": [
-            "Dado que uma conta tem saldo zero",
-            "Quando uma retirada é solicitada",
-            "Então deve retornar erro de saldo insuficiente"
-        ]
-    },
+# Testes gerados pelo LLM, indexados pelo conteúdo do código, linguagem,
+# framework e versão da política. Entradas idênticas (comum em pipelines de
+# CI) são atendidas sem nova chamada ao LLM; descarte LRU.
+DEFAULT_TEST_RESULT_CACHE_MAXSIZE = 512
+_TEST_RESULT_CACHE: "OrderedDict[bytes, Tuple[GeneratedTest, ...]]" = OrderedDict()
 
-    "organization": {
-        "project_folders": {
-            "source_code": "/src/<project_name>/",
-            "test_code": "/tests/<project_name>.Tests/"
-        },
-        "test_file_naming": {
-            "pattern": "<ClassName>Should"
-        },
-        "test_grouping": [
-            "Organizar testes por componente ou classe principal",
-            "Testes relacionados a métodos similares podem estar no mesmo arquivo"
-        ]
-    },
-
-    "quality_criteria": [
-        "Testes devem ser rápidos (execução em milissegundos)",
-        "Devem ser determinísticos (sem flutuação de resultados)",
-        "Isolados de dependências externas (sem acesso real à rede, banco ou tempo)",
-        "Utilizar mocks, stubs ou fakes para dependências externas",
-        "Testes devem ser autoexplicativos sem necessidade de comentários",
-        "Cobrir caminhos principais, bordas e exceções de forma independente"
-    ],
-
-    "test_design": {
-        "test_type": "unit",
-        "mock_usage": "true",
-        "coverage_expectation": {
-            "min_expected_coverage": 80,
-            "required_for": ["critical modules", "core business logic"]
-        },
-        "language_independent_expectations": [
-            "Os testes devem refletir regras de negócio, não apenas cobertura técnica",
-            "Um teste por cenário, evitando múltiplos asserts se possível",
-            "Falhas devem fornecer mensagens claras sobre a causa do erro"
-        ]
-    },
-
-    "agent_instructions": {
-        "expected_input": "Código-fonte em linguagem suportada, em texto puro ou estruturado",
-        "expected_output": [
-            "Arquivo ou trecho de teste com nomes claros e estruturado conforme esta política",
-            "Uso explícito de AAA",
-            "Inclusão de mocks quando detectadas dependências externas"
-        ],
-        "fallback_behavior": [
-            "Se houver ambiguidade, gerar o teste mais simples possível e sinalizar incerteza",
-            "Nunca inventar lógicas de negócio: basear-se apenas no código fornecido"
-        ]
+
+def _test_result_cache_key(code_content: str, language: CodeLanguage, framework: TestFramework) -> bytes:
+    """
+    Calcula a chave do cache de testes gerados.
+    
+    Args:
+        code_content: Conteúdo do código
+        language: Linguagem de programação
+        framework: Framework de teste efetivo
+        
+    Returns:
+        bytes: Digest BLAKE2 da entrada
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{language.value}|{framework.value}|{get_unit_test_policy()['version']}|".encode("utf-8"))
+    digest.update(code_content.encode("utf-8"))
+    return digest.digest()
+
+
+def _lookup_test_results(key: bytes) -> Optional[List[GeneratedTest]]:
+    """
+    Busca os testes já gerados pelo LLM para uma entrada.
+    
+    GeneratedTest é mutável e o cache é compartilhado entre requisições,
+    por isso cada acerto recebe cópias dos testes armazenados.
+    
+    Args:
+        key: Chave calculada por _test_result_cache_key
+        
+    Returns:
+        Optional[List[GeneratedTest]]: Cópias dos testes ou None se ausentes
+    """
+    cached = _TEST_RESULT_CACHE.get(key)
+    if cached is None:
+        return None
+    _TEST_RESULT_CACHE.move_to_end(key)
+    return [test.model_copy(deep=True) for test in cached]
+
+
+def _store_test_results(key: bytes, tests: List[GeneratedTest]) -> None:
+    """
+    Armazena os testes gerados pelo LLM para uma entrada.
+    
+    São guardadas cópias, para que alterações feitas por quem recebeu os
+    testes originais não cheguem ao cache.
+    
+    Args:
+        key: Chave calculada por _test_result_cache_key
+        tests: Testes gerados
+    """
+    _TEST_RESULT_CACHE[key] = tuple(test.model_copy(deep=True) for test in tests)
+    _TEST_RESULT_CACHE.move_to_end(key)
+    
+    maxsize = int(os.getenv("TEST_RESULT_CACHE_MAXSIZE", DEFAULT_TEST_RESULT_CACHE_MAXSIZE))
+    while len(_TEST_RESULT_CACHE) > maxsize:
+        _TEST_RESULT_CACHE.popitem(last=False)
+
+
+# Quantidade padrão de códigos enviados em uma mesma chamada ao LLM na
+# geração em lote (variável de ambiente TEST_BATCH_SIZE)
+DEFAULT_TEST_BATCH_SIZE = 4
+
+# Prompt sistema da geração em lote. Não depende da requisição, então é
+# idêntico entre chamadas e seu prefixo pode ser reaproveitado pelo provedor.
+BATCH_SYSTEM_MESSAGE = SystemMessage(content="""
+Você é um especialista em testes unitários e qualidade de software.
+Sua tarefa é gerar testes unitários para cada um dos códigos fornecidos,
+seguindo as melhores práticas:
+
+POLÍTICA DE TESTES:
+- Usar padrão AAA (Arrange, Act, Assert)
+- Nomes descritivos que explicam o comportamento testado
+- Testes isolados com mocks para dependências externas
+- Cobertura de casos normais, extremos e de erro
+- Usar a linguagem e o framework indicados para cada código
+
+Responda SEMPRE em formato JSON válido, com um item por código, usando o ID informado:
+{
+  "results": [
+    {
+      "id": "1",
+      "tests": [
+        {
+          "test_name": "nome_do_teste_descritivo",
+          "test_code": "código completo do teste",
+          "description": "descrição do que o teste verifica",
+          "coverage_estimation": 85,
+          "dependencies": ["pytest", "mock"]
+        }
+      ]
     }
+  ]
 }
+""")
+
+
+class PartialTestGenerationError(RuntimeError):
+    """
+    Falha do LLM depois de parte dos testes já ter sido entregue.
+    
+    Os testes já entregues não podem ser retirados do fluxo; quem consome
+    os testes de forma incremental deve sinalizar o erro ao cliente, e
+    quem os coleta deve descartá-los e recorrer ao fallback local.
+    """
+
 
 class TestGeneratorAgent:
     """
@@ -128,16 +898,200 @@ class TestGeneratorAgent:
         Returns:
             Tuple[List[GeneratedTest], CodeAnalysis]: Testes gerados e análise
         """
-        # Obter código baseado no tipo de entrada
-        code_content = await self._get_code_content(request)
-        
-        # Analisar código
-        analysis = await self._analyze_code(code_content, request.language)
+        code_content, analysis = await self._load_and_analyze(request)
         
         # Gerar testes
-        tests = await self._generate_tests_for_code(code_content, request, analysis)
+        try:
+            tests = [
+                test async for test in self._generate_tests_for_code(code_content, request, analysis)
+            ]
+        except PartialTestGenerationError:
+            # Nada foi entregue ainda: descartar a resposta parcial e gerar localmente
+            logger.warning("LLM interrompido com testes parciais; usando geração local", exc_info=True)
+            tests = await self._generate_tests_fallback(code_content, request, analysis)
         
         return tests, analysis
+    
+    async def generate_tests_stream(self, request: CodeRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Gera testes unitários entregando cada teste assim que fica pronto.
+        
+        Args:
+            request: Dados da requisição de geração de testes
+            
+        Yields:
+            Tuple[str, Any]: ("analysis", CodeAnalysis) primeiro e, em seguida,
+            ("test", GeneratedTest) para cada teste gerado
+            
+        Raises:
+            PartialTestGenerationError: Se o LLM falhar depois de algum teste ter sido entregue
+        """
+        code_content, analysis = await self._load_and_analyze(request)
+        yield "analysis", analysis
+        
+        async for test in self._generate_tests_for_code(code_content, request, analysis):
+            yield "test", test
+    
+    async def generate_tests_batch(self, requests: List[CodeRequest]) -> List[Tuple[List[GeneratedTest], CodeAnalysis]]:
+        """
+        Gera testes para várias requisições agrupando os códigos em chamadas ao LLM.
+        
+        Códigos já presentes no cache de resultados são atendidos por ele; os
+        demais são divididos em grupos de até TEST_BATCH_SIZE, cada um enviado
+        em uma única chamada, compartilhando o prompt sistema. Os grupos são
+        processados concorrentemente. Códigos sem resposta válida no lote são
+        gerados individualmente.
+        
+        Args:
+            requests: Lista de requisições de geração de testes
+            
+        Returns:
+            List[Tuple[List[GeneratedTest], CodeAnalysis]]: Resultados na mesma ordem das requisições
+        """
+        code_contents = await asyncio.gather(*(self._get_code_content(request) for request in requests))
+        
+        results: List[Optional[Tuple[List[GeneratedTest], CodeAnalysis]]] = [None] * len(requests)
+        pending = []
+        for index, (request, code_content) in enumerate(zip(requests, code_contents)):
+            framework = self._determine_test_framework(request.test_framework, request.language)
+            cached = _lookup_test_results(_test_result_cache_key(code_content, request.language, framework))
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index] = cached, await self._analyze_code(code_content, request.language)
+        
+        batch_size = max(1, int(os.getenv("TEST_BATCH_SIZE", DEFAULT_TEST_BATCH_SIZE)))
+        groups = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        group_results = await asyncio.gather(*(
+            self._generate_tests_group([requests[i] for i in group], [code_contents[i] for i in group])
+            for group in groups
+        ))
+        for group, group_result in zip(groups, group_results):
+            for index, result in zip(group, group_result):
+                results[index] = result
+        return results
+    
+    async def _generate_tests_group(self, requests: List[CodeRequest],
+                                    code_contents: List[str]) -> List[Tuple[List[GeneratedTest], CodeAnalysis]]:
+        """
+        Gera testes para um grupo de requisições em uma única chamada ao LLM.
+        
+        Args:
+            requests: Requisições do grupo
+            code_contents: Código de cada requisição
+            
+        Returns:
+            List[Tuple[List[GeneratedTest], CodeAnalysis]]: Resultados na mesma ordem das requisições
+        """
+        if len(requests) == 1:
+            return [await self.generate_tests(requests[0])]
+        
+        analyses = await asyncio.gather(*(
+            self._analyze_code(code_content, request.language)
+            for code_content, request in zip(code_contents, requests)
+        ))
+        
+        try:
+            messages = self._build_batch_messages(requests, code_contents, analyses)
+            async with get_llm_semaphore():
+                response = await self.llm.ainvoke(messages)
+            
+            test_data = _json_loads(_strip_json_fence(response.content))
+            results_data = test_data.get("results", []) if isinstance(test_data, dict) else []
+            tests_by_id = {
+                str(item.get("id")): item.get("tests")
+                for item in results_data if isinstance(item, dict)
+            }
+        except Exception:
+            logger.warning("Falha ao gerar testes em lote com LLM; usando geração individual", exc_info=True)
+            tests_by_id = {}
+        
+        async def result_for(index: int) -> Tuple[List[GeneratedTest], CodeAnalysis]:
+            request = requests[index]
+            framework = self._determine_test_framework(request.test_framework, request.language)
+            tests = self._tests_from_batch_item(tests_by_id.get(str(index + 1)), framework)
+            if tests is None:
+                # Sem resposta válida no lote: gerar individualmente
+                return await self.generate_tests(request)
+            _store_test_results(_test_result_cache_key(code_contents[index], request.language, framework), tests)
+            return tests, analyses[index]
+        
+        return list(await asyncio.gather(*(result_for(index) for index in range(len(requests)))))
+    
+    def _tests_from_batch_item(self, tests_info: Any, framework: TestFramework) -> Optional[List[GeneratedTest]]:
+        """
+        Converte os testes de um código na resposta da geração em lote.
+        
+        Args:
+            tests_info: Valor de "tests" do item correspondente ao código
+            framework: Framework de teste
+            
+        Returns:
+            Optional[List[GeneratedTest]]: Testes gerados ou None se o item
+            estiver ausente ou malformado
+        """
+        if not isinstance(tests_info, list) or not tests_info:
+            return None
+        if not all(isinstance(test_info, dict) for test_info in tests_info):
+            logger.warning("Item malformado na resposta em lote; usando geração individual")
+            return None
+        try:
+            return [self._build_generated_test(test_info, framework) for test_info in tests_info]
+        except ValidationError:
+            logger.warning("Item malformado na resposta em lote; usando geração individual", exc_info=True)
+            return None
+    
+    def _build_batch_messages(self, requests: List[CodeRequest], code_contents: List[str],
+                              analyses: List[CodeAnalysis]) -> List[Any]:
+        """
+        Monta as mensagens da geração em lote, identificando cada código pela posição.
+        
+        Args:
+            requests: Requisições do grupo
+            code_contents: Código de cada requisição
+            analyses: Análise de cada código
+            
+        Returns:
+            List[Any]: Mensagens de sistema e humana
+        """
+        sections = []
+        for index, (request, code_content, analysis) in enumerate(zip(requests, code_contents, analyses), start=1):
+            framework = self._determine_test_framework(request.test_framework, request.language)
+            sections.append(
+                f"## CÓDIGO ID {index}\n"
+                f"- Linguagem: {request.language.value}\n"
+                f"- Framework: {framework.value}\n"
+                f"- Possíveis problemas: {', '.join(analysis.code_smells)}\n"
+                f"```{request.language.value}\n{code_content}\n```"
+            )
+        
+        human_prompt = (
+            "Por favor, gere testes unitários abrangentes para cada código abaixo, "
+            "seguindo a política de testes especificada.\n\n" + "\n\n".join(sections)
+        )
+        return [
+            BATCH_SYSTEM_MESSAGE,
+            HumanMessage(content=human_prompt)
+        ]
+    
+    async def _load_and_analyze(self, request: CodeRequest) -> Tuple[str, CodeAnalysis]:
+        """
+        Obtém o código da requisição e executa as análises necessárias à geração.
+        
+        A análise estrutural (AST) só é usada pelo fallback e, por isso, só é
+        feita por ele, quando o cache e o LLM não produzem os testes.
+        
+        Args:
+            request: Dados da requisição de geração de testes
+            
+        Returns:
+            Tuple[str, CodeAnalysis]: Código e análise
+        """
+        # Obter código baseado no tipo de entrada
+        code_content = await self._get_code_content(request)
+        
+        analysis = await self._analyze_code(code_content, request.language)
+        return code_content, analysis
         
     async def _get_code_content(self, request: CodeRequest) -> str:
         """
@@ -149,23 +1103,36 @@ class TestGeneratorAgent:
         Returns:
             str: Conteúdo do código
         """
-        if request.input_type == InputType.DIRECT:
-            return request.code_content
-            
-        elif request.input_type == InputType.FILE_UPLOAD:
-            # Usar o conteúdo real do arquivo se disponível
-            if request.code_content:
-                return request.code_content
-            else:
-                # Fallback se não houver conteúdo
-                return f"# Código do arquivo: {request.file_name}\n\ndef exemplo_funcao():\n    return 'Hello World'"
-            
-        elif request.input_type == InputType.GITLAB_REPO:
-            # Mock implementation - em produção, usar GitLabService
-            return "# Código do repositório GitLab\n\ndef gitlab_function():\n    return 'From GitLab'"
-            
-        else:
+        loader = self._CODE_CONTENT_LOADERS.get(request.input_type)
+        if loader is None:
             raise ValueError(f"Tipo de entrada não suportado: {request.input_type}")
+        return await loader(self, request)
+    
+    async def _load_direct_code(self, request: CodeRequest) -> str:
+        """Obtém o código enviado diretamente na requisição."""
+        if not request.code_content:
+            raise ValueError("code_content é obrigatório para entrada direta")
+        return request.code_content
+    
+    async def _load_uploaded_code(self, request: CodeRequest) -> str:
+        """Obtém o código de um arquivo enviado."""
+        # Usar o conteúdo real do arquivo se disponível
+        if request.code_content:
+            return request.code_content
+        # Fallback se não houver conteúdo
+        return f"# Código do arquivo: {request.file_name}\n\ndef exemplo_funcao():\n    return 'Hello World'"
+    
+    async def _load_gitlab_code(self, request: CodeRequest) -> str:
+        """Obtém o código de um repositório GitLab."""
+        # Mock implementation - em produção, usar GitLabService
+        return "# Código do repositório GitLab\n\ndef gitlab_function():\n    return 'From GitLab'"
+    
+    # Carregadores de código por tipo de entrada
+    _CODE_CONTENT_LOADERS = {
+        InputType.DIRECT: _load_direct_code,
+        InputType.FILE_UPLOAD: _load_uploaded_code,
+        InputType.GITLAB_REPO: _load_gitlab_code,
+    }
             
     async def _analyze_code(self, code_content: str, language: CodeLanguage) -> CodeAnalysis:
         """
@@ -179,43 +1146,57 @@ class TestGeneratorAgent:
             CodeAnalysis: Análise do código
         """
         # Mock implementation
-        return CodeAnalysis(
-            complexity_score=75,
-            maintainability_index=80,
-            test_coverage_potential=85,
-            code_smells=[
-                "Função muito longa",
-                "Falta de documentação"
-            ],
-            suggestions=[
-                "Dividir função em funções menores",
-                "Adicionar docstrings",
-                "Implementar validação de entrada"
-            ]
-        )
+        return MOCK_CODE_ANALYSIS
         
-    async def _generate_tests_for_code(self, code_content: str, request: CodeRequest, analysis: CodeAnalysis) -> List[GeneratedTest]:
+    async def _generate_tests_for_code(self, code_content: str, request: CodeRequest,
+                                       analysis: CodeAnalysis) -> AsyncIterator[GeneratedTest]:
         """
         Gera testes unitários para o código usando o LLM e seguindo a política de testes.
         
+        Os testes são entregues à medida que o LLM conclui cada um. Se o LLM
+        falhar antes de entregar algum teste, usa-se o fallback local; depois
+        disso, a falha é propagada, pois a lista entregue estaria incompleta.
+        
         Args:
             code_content: Conteúdo do código
             request: Dados da requisição
             analysis: Análise do código
             
-        Returns:
-            List[GeneratedTest]: Lista de testes gerados
+        Yields:
+            GeneratedTest: Cada teste gerado
+            
+        Raises:
+            PartialTestGenerationError: Se o LLM falhar depois de algum teste ter sido entregue
         """
+        framework = self._determine_test_framework(request.test_framework, request.language)
+        cache_key = _test_result_cache_key(code_content, request.language, framework)
+        cached = _lookup_test_results(cache_key)
+        if cached is not None:
+            for test in cached:
+                yield test
+            return
+        
+        tests = []
         try:
             # Usar o LLM para gerar testes
-            return await self._generate_tests_with_llm(code_content, request, analysis)
+            async for test in self._stream_tests_with_llm(code_content, request, analysis):
+                tests.append(test)
+                yield test
+            _store_test_results(cache_key, tests)
+            return
         except Exception as e:
-            print(f"Erro ao gerar testes com LLM: {e}")
-            # Fallback para implementação local
-            return await self._generate_tests_fallback(code_content, request, analysis)
+            if tests:
+                raise PartialTestGenerationError(
+                    f"LLM interrompido após {len(tests)} teste(s) entregue(s): {e}"
+                ) from e
+            logger.warning("Falha ao gerar testes com LLM; usando geração local", exc_info=True)
+        
+        # Fallback para implementação local
+        for test in await self._generate_tests_fallback(code_content, request, analysis):
+            yield test
 
 
-    def _generate_test_cases_for_method(self, class_name, method_info) -> List[Dict[str, Any]]:
+    def _generate_test_cases_for_method(self, class_name, method_info) -> Tuple[_TestCase, ...]:
         """
         Gera casos de teste para um método da classe seguindo a política de testes.
         
@@ -224,56 +1205,54 @@ class TestGeneratorAgent:
             method_info: Informações do método extraídas do AST
             
         Returns:
-            List[Dict[str, Any]]: Lista de casos de teste
+            Tuple[_TestCase, ...]: Casos de teste
+        """
+        return self._test_cases_for(class_name, method_info["name"])
+    
+    @staticmethod
+    @lru_cache(maxsize=TEST_CASES_CACHE_MAXSIZE)
+    def _test_cases_for(class_name: str, method_name: str) -> Tuple[_TestCase, ...]:
+        """
+        Monta os casos de teste de um par (classe, método).
+        
+        Os casos dependem apenas dos nomes, então são memorizados e
+        compartilhados entre requisições (_TestCase é imutável).
+        
+        Args:
+            class_name: Nome da classe
+            method_name: Nome do método
+            
+        Returns:
+            Tuple[_TestCase, ...]: Casos de teste
         """
-        test_cases = []
-        prefix = "should_"
-        method_name = method_info["name"]
-
-        # Gerar teste para comportamento normal
-        test_cases.append({
-            "name": f"{prefix}return_expected_value_when_{class_name}_{method_name}_called_with_valid_input",
-            "description": f"Deve retornar o valor esperado quando {class_name}.{method_name} é chamada com entrada válida",
-            "coverage": 85,
-            "scenario": "happy_path",
-            "target_function": method_name
-        })
-
-        # Gerar teste para casos extremos
-        test_cases.append({
-            "name": f"{prefix}handle_edge_cases_when_{class_name}_{method_name}_receives_boundary_values",
-            "description": f"Deve tratar casos extremos quando {class_name}.{method_name} recebe valores limítrofes",
-            "coverage": 80,
-            "scenario": "edge_cases",
-            "target_function": method_name
-        })
-
-        # Gerar teste para handling de erros
-        test_cases.append({
-            "name": f"{prefix}raise_error_when_{class_name}_{method_name}_receives_invalid_input",
-            "description": f"Deve lançar erro apropriado quando {class_name}.{method_name} recebe entrada inválida",
-            "coverage": 75,
-            "scenario": "error_handling",
-            "target_function": method_name
-        })
-
-        return test_cases
-    
-    async def _generate_tests_with_llm(self, code_content: str, request: CodeRequest, analysis: CodeAnalysis) -> List[GeneratedTest]:
+        return tuple(
+            _TestCase(
+                name=name_template.format(class_name=class_name, method_name=method_name),
+                description=description_template.format(class_name=class_name, method_name=method_name),
+                coverage=coverage,
+                scenario=scenario,
+                target_function=method_name
+            )
+            for scenario, name_template, description_template, coverage in TEST_CASE_SCENARIOS
+        )
+    
+    async def _stream_tests_with_llm(self, code_content: str, request: CodeRequest,
+                                     analysis: CodeAnalysis) -> AsyncIterator[GeneratedTest]:
         """
-        Gera testes unitários usando o LLM.
+        Gera testes unitários usando o LLM, transmitindo a resposta.
+        
+        O JSON é interpretado de forma incremental a cada fragmento: quando um
+        novo item de "tests" começa, o anterior já está completo e é entregue,
+        sem aguardar o fim da geração.
         
         Args:
             code_content: Conteúdo do código
             request: Dados da requisição
             analysis: Análise do código
             
-        Returns:
-            List[GeneratedTest]: Lista de testes gerados
+        Yields:
+            GeneratedTest: Cada teste gerado
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
-        import json
-        
         # Determinar framework de teste
         framework = self._determine_test_framework(request.test_framework, request.language)
         
@@ -323,35 +1302,58 @@ class TestGeneratorAgent:
             HumanMessage(content=human_prompt)
         ]
         
-        response = self.llm.invoke(messages)
-        
-        # Limpar resposta removendo markdown se presente
-        content = response.content.strip()
-        if content.startswith('```json'):
-            content = content[7:]  # Remove ```json
-        if content.endswith('```'):
-            content = content[:-3]  # Remove ```
-        content = content.strip()
-        
-        # Parsear resposta JSON
-        test_data = json.loads(content)
-        
-        # Converter para objetos GeneratedTest
-        tests = []
-        for test_info in test_data.get("tests", []):
-            test = GeneratedTest(
-                test_name=test_info.get("test_name", "test_generated"),
-                test_code=test_info.get("test_code", "# Teste gerado"),
-                framework=framework,
-                coverage_estimation=test_info.get("coverage_estimation", 80),
-                dependencies=test_info.get("dependencies", self._get_test_dependencies(framework)),
-                description=test_info.get("description", "Teste gerado pelo LLM")
-            )
-            tests.append(test)
+        # Chamada assíncrona: não bloqueia o event loop, permitindo que
+        # requisições concorrentes aguardem o LLM em paralelo
+        content = ""
+        emitted = 0
+        # A vaga do semáforo é liberada ao fim da resposta do provedor, sem
+        # esperar o consumidor processar os testes entregues
+        async for chunk in iterate_with_llm_slot(self.llm.astream(messages)):
+            if not chunk.content:
+                continue
+            content += chunk.content
+            # Um item só se completa quando o seguinte é aberto; sem "{"
+            # no fragmento, a lista de itens completos não muda
+            if "{" not in chunk.content:
+                continue
+            try:
+                partial = from_json(_strip_json_fence(content), allow_partial=True)
+            except ValueError:
+                continue
+            
+            # Todos os itens antes do último já estão completos
+            completed = partial.get("tests", [])[:-1] if isinstance(partial, dict) else []
+            for test_info in completed[emitted:]:
+                yield self._build_generated_test(test_info, framework)
+            emitted = max(emitted, len(completed))
+        
+        # Parsear resposta JSON completa e entregar os testes restantes
+        test_data = _json_loads(_strip_json_fence(content))
+        for test_info in test_data.get("tests", [])[emitted:]:
+            yield self._build_generated_test(test_info, framework)
+    
+    def _build_generated_test(self, test_info: Dict[str, Any], framework: TestFramework) -> GeneratedTest:
+        """
+        Converte um item da resposta do LLM em GeneratedTest.
         
-        return tests
+        Args:
+            test_info: Item da lista "tests" retornada pelo LLM
+            framework: Framework de teste
+            
+        Returns:
+            GeneratedTest: Teste gerado
+        """
+        return GeneratedTest(
+            test_name=test_info.get("test_name", "test_generated"),
+            test_code=test_info.get("test_code", "# Teste gerado"),
+            framework=framework,
+            coverage_estimation=test_info.get("coverage_estimation", 80),
+            dependencies=test_info.get("dependencies", self._get_test_dependencies(framework)),
+            description=test_info.get("description", "Teste gerado pelo LLM")
+        )
     
-    async def _generate_tests_fallback(self, code_content: str, request: CodeRequest, analysis: CodeAnalysis) -> List[GeneratedTest]:
+    async def _generate_tests_fallback(self, code_content: str, request: CodeRequest,
+                                       analysis: CodeAnalysis) -> List[GeneratedTest]:
         """
         Gera testes usando implementação de fallback (quando LLM falha).
         
@@ -363,34 +1365,30 @@ class TestGeneratorAgent:
         Returns:
             List[GeneratedTest]: Lista de testes gerados
         """
-        tests = []
-        
         # Determinar framework de teste
         framework = self._determine_test_framework(request.test_framework, request.language)
+        dependencies = self._get_test_dependencies(framework)
         
-        # Analisar código para extrair informações estruturais
-        code_analysis = self._analyze_code_structure(code_content, request.language)
+        # Analisar código para extrair informações estruturais; a análise (AST)
+        # roda em uma thread para não bloquear o event loop
+        code_analysis = await asyncio.to_thread(self._analyze_code_structure, code_content, request.language)
         
         # Gerar testes para cada classe e método
-        for class_name, class_info in code_analysis["class_details"].items():
-            for method in class_info["methods"]:
-                test_cases = self._generate_test_cases_for_method(class_name, method)
-                
-                for test_case in test_cases:
-                    test_code = self._generate_test_code_fallback(
-                        test_case, framework, request.language, class_name, method
-                    )
-                    
-                    test = GeneratedTest(
-                        test_name=test_case["name"],
-                        test_code=test_code,
-                        framework=framework,
-                        coverage_estimation=test_case["coverage"],
-                        dependencies=self._get_test_dependencies(framework),
-                        description=test_case["description"]
-                    )
-                    
-                    tests.append(test)
+        tests = [
+            GeneratedTest(
+                test_name=test_case.name,
+                test_code=self._generate_test_code_fallback(
+                    test_case, framework, request.language, class_name, method
+                ),
+                framework=framework,
+                coverage_estimation=test_case.coverage,
+                dependencies=dependencies,
+                description=test_case.description
+            )
+            for class_name, class_info in code_analysis["class_details"].items()
+            for method in class_info["methods"]
+            for test_case in self._generate_test_cases_for_method(class_name, method)
+        ]
         
         # Se não encontrou classes/métodos, gerar testes genéricos
         if not tests:
@@ -398,7 +1396,7 @@ class TestGeneratorAgent:
         
         return tests
     
-    def _analyze_code_structure(self, code_content: str, language: CodeLanguage) -> Dict[str, Any]:
+    def _analyze_code_structure(self, code_content: str, language: CodeLanguage) -> Mapping[str, Any]:
         """
         Analisa a estrutura do código para extrair informações relevantes usando AST.
         
@@ -407,95 +1405,42 @@ class TestGeneratorAgent:
             language: Linguagem de programação
             
         Returns:
-            Dict[str, Any]: Análise estrutural do código
+            Mapping[str, Any]: Análise estrutural do código
         """
+        if language in (CodeLanguage.JAVASCRIPT, CodeLanguage.TYPESCRIPT):
+            # Análise de código JavaScript/TypeScript usando regex
+            return self._analyze_javascript_structure(code_content)
+        
+        if language != CodeLanguage.PYTHON:
+            # Demais linguagens ainda não têm análise estrutural
+            return EMPTY_CODE_STRUCTURE
+        
         analysis = {
             "functions": [],
             "classes": [],
-            "methods": {},  # {class_name: [method_names]}
             "dependencies": [],
             "complexity": "medium",
             "has_external_dependencies": False,
             "imports": [],
-            "class_details": {}  # {class_name: {"methods": [...], "init_params": [...]}}
+            "class_details": {}  # {class_name: {"methods": [{"name", "params", "visibility", ...}], "init_params": [...]}}
         }
         
-        if language == CodeLanguage.PYTHON:
-            try:
-                import ast
-                tree = ast.parse(code_content)
-                
-                for node in ast.walk(tree):
-                    # Extrair importações
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            analysis["imports"].append(alias.name)
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module:
-                            analysis["imports"].append(node.module)
-                    
-                    # Extrair funções globais
-                    elif isinstance(node, ast.FunctionDef) and not hasattr(node, 'parent_class'):
-                        analysis["functions"].append(node.name)
-                    
-                    # Extrair classes e seus métodos
-                    elif isinstance(node, ast.ClassDef):
-                        class_name = node.name
-                        analysis["classes"].append(class_name)
-                        analysis["methods"][class_name] = []
-                        analysis["class_details"][class_name] = {
-                            "methods": [],
-                            "init_params": [],
-                            "public_methods": [],
-                            "private_methods": []
-                        }
+        try:
+            tree = _parse_python(code_content)
+            
+            _CodeStructureVisitor(analysis).visit(tree)
+            
+            # Detectar dependências externas
+            analysis["dependencies"] = [
+                imp for imp in analysis["imports"]
+                if imp.split('.', 1)[0].lower() in EXTERNAL_DEPENDENCIES
+            ]
+            analysis["has_external_dependencies"] = bool(analysis["dependencies"])
                         
-                        # Analisar métodos da classe
-                        for item in node.body:
-                            if isinstance(item, ast.FunctionDef):
-                                method_name = item.name
-                                analysis["methods"][class_name].append(method_name)
-                                
-                                # Extrair parâmetros do __init__
-                                if method_name == "__init__":
-                                    init_params = []
-                                    for arg in item.args.args[1:]:  # Pular 'self'
-                                        init_params.append(arg.arg)
-                                    analysis["class_details"][class_name]["init_params"] = init_params
-                                
-                                # Classificar métodos públicos/privados
-                                method_info = {
-                                    "name": method_name,
-                                    "params": [arg.arg for arg in item.args.args[1:]],  # Pular 'self'
-                                    "returns": self._extract_return_type(item),
-                                    "docstring": ast.get_docstring(item)
-                                }
-                                
-                                analysis["class_details"][class_name]["methods"].append(method_info)
-                                
-                                if method_name.startswith("_") and not method_name.startswith("__"):
-                                    analysis["class_details"][class_name]["private_methods"].append(method_name)
-                                else:
-                                    analysis["class_details"][class_name]["public_methods"].append(method_name)
-                
-                # Detectar dependências externas
-                external_deps = ['requests', 'database', 'sqlite', 'mysql', 'postgres', 'redis', 
-                                'http', 'urllib', 'socket', 'time', 'random', 'os', 'sys']
-                for imp in analysis["imports"]:
-                    for dep in external_deps:
-                        if dep in imp.lower():
-                            analysis["has_external_dependencies"] = True
-                            analysis["dependencies"].append(imp)
-                            break
-                            
-            except SyntaxError as e:
-                print(f"Erro ao analisar código Python: {e}")
-                # Fallback para regex se AST falhar
-                return self._analyze_code_structure_regex(code_content)
-        
-        elif language in [CodeLanguage.JAVASCRIPT, CodeLanguage.TYPESCRIPT]:
-            # Análise de código JavaScript/TypeScript usando regex
-            return self._analyze_javascript_structure(code_content)
+        except SyntaxError as e:
+            logger.debug("Falha ao analisar código Python com AST: %s", e)
+            # Fallback para regex se AST falhar
+            return self._analyze_code_structure_regex(code_content)
         
         return analysis
     
@@ -503,27 +1448,22 @@ class TestGeneratorAgent:
         """
         Fallback usando regex quando AST falha.
         """
-        import re
-        
         analysis = {
             "functions": [],
             "classes": [],
-            "methods": {},
             "dependencies": [],
             "complexity": "medium",
             "has_external_dependencies": False,
             "class_details": {}
         }
         
-        # Extrair funções
-        function_pattern = r'def\s+(\w+)\s*\([^)]*\):'
-        functions = re.findall(function_pattern, code_content)
-        analysis["functions"] = functions
+        # Extrair funções e classes; a busca de substring descarta rapidamente
+        # códigos sem a palavra-chave antes de executar a regex
+        if "def" in code_content:
+            analysis["functions"] = _PY_FUNCTION_PATTERN.findall(code_content)
         
-        # Extrair classes
-        class_pattern = r'class\s+(\w+)\s*[\(:]'
-        classes = re.findall(class_pattern, code_content)
-        analysis["classes"] = classes
+        if "class" in code_content:
+            analysis["classes"] = _PY_CLASS_PATTERN.findall(code_content)
         
         return analysis
     
@@ -531,12 +1471,9 @@ class TestGeneratorAgent:
         """
         Analisa estrutura de código JavaScript/TypeScript usando regex.
         """
-        import re
-        
         analysis = {
             "functions": [],
             "classes": [],
-            "methods": {},
             "dependencies": [],
             "complexity": "medium",
             "has_external_dependencies": False,
@@ -544,132 +1481,62 @@ class TestGeneratorAgent:
             "class_details": {}
         }
         
+        # Palavras-chave presentes no código; cada regex só é executada se a
+        # busca de substring (bem mais barata) indicar que pode haver ocorrências
+        has_class = "class" in code_content
+        has_function = "function" in code_content
+        has_import = "import" in code_content or "require" in code_content
+        
         # Extrair classes JavaScript
-        class_pattern = r'class\s+(\w+)\s*(?:extends\s+\w+)?\s*\{'
-        classes = re.findall(class_pattern, code_content)
-        analysis["classes"] = classes
+        class_matches = list(_JS_CLASS_PATTERN.finditer(code_content)) if has_class else []
+        analysis["classes"] = [class_match.group(1) for class_match in class_matches]
         
         # Para cada classe, extrair seus métodos
-        for class_name in classes:
+        for declaration in class_matches:
             class_methods = []
-            analysis["methods"][class_name] = []
-            analysis["class_details"][class_name] = {
-                "methods": [],
-                "init_params": [],
-                "public_methods": [],
-                "private_methods": []
+            analysis["class_details"][declaration.group(1)] = {
+                "methods": class_methods,
+                "init_params": []
             }
             
-            # Encontrar o bloco da classe
-            class_block_pattern = rf'class\s+{class_name}\s*(?:extends\s+\w+)?\s*\{{([^{{}}]*(?:\{{[^{{}}]*\}}[^{{}}]*)*)\}}'
-            class_match = re.search(class_block_pattern, code_content, re.DOTALL)
+            # Encontrar o bloco da classe; a declaração termina na chave de abertura.
+            # Só o primeiro nível é analisado, para que if/for/catch dentro dos
+            # métodos não sejam confundidos com métodos
+            class_members = _find_block_members(code_content, declaration.end() - 1)
             
-            if class_match:
-                class_body = class_match.group(1)
-                
-                # Extrair métodos (incluindo constructor)
-                method_pattern = r'(?:constructor|\w+)\s*\([^)]*\)\s*\{'
-                methods = re.findall(r'(constructor|\w+)(?=\s*\([^)]*\)\s*\{)', class_body)
-                
-                for method_name in methods:
-                    method_info = {
+            if class_members is not None:
+                # Extrair métodos (incluindo constructor), sem repetições
+                class_methods.extend(
+                    {
                         "name": method_name,
                         "params": [],  # Simplificado por enquanto
                         "returns": "any",
-                        "docstring": None
+                        "docstring": None,
+                        "visibility": "private" if method_name.startswith('_') else "public"
                     }
-                    
-                    analysis["methods"][class_name].append(method_name)
-                    analysis["class_details"][class_name]["methods"].append(method_info)
-                    
-                    if method_name.startswith('_'):
-                        analysis["class_details"][class_name]["private_methods"].append(method_name)
-                    else:
-                        analysis["class_details"][class_name]["public_methods"].append(method_name)
+                    for method_name in dict.fromkeys(_JS_METHOD_PATTERN.findall(class_members))
+                )
         
         # Extrair funções globais
-        function_pattern = r'function\s+(\w+)\s*\([^)]*\)'
-        functions = re.findall(function_pattern, code_content)
-        analysis["functions"] = functions
+        if has_function:
+            analysis["functions"] = _JS_FUNCTION_PATTERN.findall(code_content)
         
         # Extrair imports/requires
-        import_patterns = [
-            r'import\s+.*?from\s+["\']([^"\']+)["\']',
-            r'require\s*\(\s*["\']([^"\']+)["\']\s*\)',
-            r'import\s*\(\s*["\']([^"\']+)["\']\s*\)'
-        ]
-        
-        for pattern in import_patterns:
-            imports = re.findall(pattern, code_content)
-            analysis["imports"].extend(imports)
+        if has_import:
+            for pattern in _JS_IMPORT_PATTERNS:
+                analysis["imports"].extend(pattern.findall(code_content))
         
         return analysis
     
-    def _extract_return_type(self, func_node) -> str:
-        """
-        Extrai o tipo de retorno de uma função AST.
-        """
-        if func_node.returns:
-            if hasattr(func_node.returns, 'id'):
-                return func_node.returns.id
-            elif hasattr(func_node.returns, 'attr'):
-                return func_node.returns.attr
-        return "Any"
-    
-    def _generate_test_cases_for_method(self, class_name, method_info) -> List[Dict[str, Any]]:
-        """
-        Gera casos de teste para um método da classe seguindo a política de testes.
-        
-        Args:
-            class_name: Nome da classe
-            method_info: Informações do método extraídas do AST
-            
-        Returns:
-            List[Dict[str, Any]]: Lista de casos de teste
-        """
-        test_cases = []
-        
-        # Definir prefixos baseados na linguagem
-        prefix = "should_"
-        
-        method_name = method_info["name"]
-        
-        # Gerar teste para comportamento normal
-        case_name = f"{prefix}return_expected_value_when_{class_name}_{method_name}_called_with_valid_input"
-        test_cases.append({
-            "name": case_name,
-            "description": f"Deve retornar o valor esperado quando {class_name}.{method_name} é chamada com entrada válida",
-            "coverage": 85,
-            "scenario": "happy_path",
-            "target_function": method_name
-        })
-        
-        # Gerar teste para casos extremos
-        case_name = f"{prefix}handle_edge_cases_when_{class_name}_{method_name}_receives_boundary_values"
-        test_cases.append({
-            "name": case_name,
-            "description": f"Deve tratar casos extremos quando {class_name}.{method_name} recebe valores limítrofes",
-            "coverage": 80,
-            "scenario": "edge_cases",
-            "target_function": method_name
-        })
-        
-        # Gerar teste para handling de erros
-        case_name = f"{prefix}raise_error_when_{class_name}_{method_name}_receives_invalid_input"
-        test_cases.append({
-            "name": case_name,
-            "description": f"Deve lançar erro apropriado quando {class_name}.{method_name} recebe entrada inválida",
-            "coverage": 75,
-            "scenario": "error_handling",
-            "target_function": method_name
-        })
-        
-        return test_cases
-        
-    def _determine_test_framework(self, requested_framework: TestFramework, language: CodeLanguage) -> TestFramework:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _determine_test_framework(requested_framework: TestFramework, language: CodeLanguage) -> TestFramework:
         """
         Determina o framework de teste a ser usado.
         
+        Função pura de um domínio pequeno (framework x linguagem), por isso
+        o resultado é memorizado.
+        
         Args:
             requested_framework: Framework solicitado
             language: Linguagem de programação
@@ -679,23 +1546,11 @@ class TestGeneratorAgent:
         """
         if requested_framework != TestFramework.AUTO:
             return requested_framework
-            
-        # Mapear linguagem para framework padrão com fallback documentado
-        language_framework_map = {
-            CodeLanguage.PYTHON: TestFramework.PYTEST,
-            CodeLanguage.JAVASCRIPT: TestFramework.JEST,
-            CodeLanguage.TYPESCRIPT: TestFramework.JEST,
-            CodeLanguage.JAVA: TestFramework.JUNIT,
-            CodeLanguage.CSHARP: TestFramework.NUNIT,
-            CodeLanguage.GO: TestFramework.GOTEST,
-            CodeLanguage.RUST: TestFramework.PYTEST,  # Usando pytest como fallback genérico
-            CodeLanguage.PHP: TestFramework.PYTEST   # Usando pytest como fallback genérico
-        }
         
         # Fallback para linguagens não mapeadas: usar PYTEST como padrão universal
-        return language_framework_map.get(language, TestFramework.PYTEST)
+        return DEFAULT_TEST_FRAMEWORKS.get(language, TestFramework.PYTEST)
         
-    def _generate_test_code_fallback(self, test_case: Dict[str, Any], framework: TestFramework, language: CodeLanguage, class_name: str = None, method_info: Dict[str, Any] = None) -> str:
+    def _generate_test_code_fallback(self, test_case: _TestCase, framework: TestFramework, language: CodeLanguage, class_name: str = None, method_info: Dict[str, Any] = None) -> str:
         """
         Gera o código do teste usando implementação de fallback.
         
@@ -710,75 +1565,45 @@ class TestGeneratorAgent:
             str: Código do teste
         """
         # Implementação de fallback quando LLM não está disponível
-        if language == CodeLanguage.PYTHON and framework == TestFramework.PYTEST:
-            method_name = test_case.get("target_function", "target_method")
-            
-            if class_name:
-                # Gerar testes específicos baseados no método
-                test_code = self._generate_specific_test_for_method(class_name, method_name, test_case, method_info)
-                return test_code
-            else:
-                # Teste para função standalone
-                return f'''
-import pytest
-from src.main import {method_name}
-
-def {test_case["name"]}():
-    \"\"\"
-    {test_case["description"]}
-    \"\"\"
-    # Arrange
-    test_input = "test_value"
-    
-    # Act
-    result = {method_name}(test_input)
-    
-    # Assert
-    assert result is not None
-'''
+        if language == CodeLanguage.PYTHON and framework == TestFramework.PYTEST and class_name:
+            # Gerar testes específicos baseados no método
+            return self._generate_specific_test_for_method(class_name, test_case.target_function, test_case, method_info)
         
-        elif language == CodeLanguage.JAVASCRIPT and framework == TestFramework.JEST:
-            method_name = test_case.get("target_function", "targetMethod")
-            class_name = class_name or "TargetClass"
-            return f'''
-const {{ {class_name} }} = require('./counter');
-
-describe('{class_name} Tests', () => {{
-    test('{test_case["name"]}', () => {{
-        // Arrange
-        const instance = new {class_name}();
-        
-        // Act
-        const result = instance.{method_name}();
-        
-        // Assert
-        expect(result).toBeDefined();
-    }});
-}});'''
-        
-        elif language == CodeLanguage.TYPESCRIPT and framework == TestFramework.JEST:
-            method_name = test_case.get("target_function", "targetMethod")
-            class_name = class_name or "TargetClass"
-            return f'''
-import {{ {class_name} }} from './counter';
-
-describe('{class_name} Tests', () => {{
-    test('{test_case["name"]}', () => {{
-        // Arrange
-        const instance = new {class_name}();
-        
-        // Act
-        const result = instance.{method_name}();
+        return self._render_fallback_test(test_case, framework, language, class_name)
+    
+    @staticmethod
+    @lru_cache(maxsize=FALLBACK_TEST_CACHE_MAXSIZE)
+    def _render_fallback_test(test_case: _TestCase, framework: TestFramework, language: CodeLanguage,
+                              class_name: Optional[str]) -> str:
+        """
+        Renderiza o teste de fallback a partir do modelo do par (linguagem, framework).
         
-        // Assert
-        expect(result).toBeDefined();
-    }});
-}});'''
+        Assim como os testes específicos, o resultado é memorizado e
+        reaproveitado entre requisições com as mesmas entradas.
         
-        # Código genérico para outros casos
-        return f"// Teste: {test_case['name']}\n// {test_case['description']}\n// TODO: Implementar teste específico (fallback)"
+        Args:
+            test_case: Dados do caso de teste
+            framework: Framework de teste
+            language: Linguagem de programação
+            class_name: Nome da classe sendo testada, se houver
+            
+        Returns:
+            str: Código do teste
+        """
+        template = FALLBACK_TEST_TEMPLATES.get((language, framework))
+        if template is None:
+            # Código genérico para outros casos
+            return GENERIC_FALLBACK_TEST_TEMPLATE.format(name=test_case.name, description=test_case.description)
+        
+        default_method = "target_method" if language == CodeLanguage.PYTHON else "targetMethod"
+        return template.format(
+            name=test_case.name,
+            description=test_case.description,
+            method_name=test_case.target_function or default_method,
+            class_name=class_name or "TargetClass",
+        )
         
-    def _get_test_dependencies(self, framework: TestFramework) -> List[str]:
+    def _get_test_dependencies(self, framework: TestFramework) -> Tuple[str, ...]:
         """
         Obtém as dependências necessárias para o framework de teste.
         
@@ -786,20 +1611,9 @@ describe('{class_name} Tests', () => {{
             framework: Framework de teste
             
         Returns:
-            List[str]: Lista de dependências
+            Tuple[str, ...]: Dependências do framework
         """
-        dependencies_map = {
-            TestFramework.PYTEST: ["pytest", "pytest-cov"],
-            TestFramework.UNITTEST: [],  # Biblioteca padrão
-            TestFramework.JEST: ["jest", "@types/jest"],
-            TestFramework.MOCHA: ["mocha", "chai"],
-            TestFramework.JUNIT: ["junit", "mockito"],
-            TestFramework.NUNIT: ["NUnit", "Moq"],
-            TestFramework.GOTEST: [],  # Biblioteca padrão do Go
-            TestFramework.AUTO: []  # Será determinado dinamicamente
-        }
-        
-        return dependencies_map.get(framework, [])
+        return TEST_DEPENDENCIES.get(framework, ())
     
     def _validate_test_integrity(self, tests: List[GeneratedTest]) -> Tuple[bool, List[str]]:
         """
@@ -818,50 +1632,33 @@ describe('{class_name} Tests', () => {{
             errors.append("Nenhum teste foi gerado")
             return False, errors
         
+        log_missing_verification = logger.isEnabledFor(logging.INFO)
+        
         for i, test in enumerate(tests):
-            test_errors = []
+            test_code = test.test_code
             
             # Validar se o código do teste não está vazio
-            if not test.test_code or test.test_code.strip() == "":
-                test_errors.append(f"Código do teste {i+1} está vazio")
+            if not test_code or test_code.isspace():
+                errors.append(f"Código do teste {i+1} está vazio")
                 continue  # Não continuar validação para código vazio
             
             # Validar se não contém referências genéricas (menos restritivo)
-            generic_refs = ["my_function", "my_module", "example_function"]
-            for ref in generic_refs:
-                if ref in test.test_code:
-                    test_errors.append(f"Teste {i+1} contém referência genérica: {ref}")
+            found_refs = set(_GENERIC_TEST_REF_PATTERN.findall(test_code))
+            if found_refs:
+                errors.extend(
+                    f"Teste {i+1} contém referência genérica: {ref}"
+                    for ref in GENERIC_TEST_REFS if ref in found_refs
+                )
             
             # Validar apenas se tem estrutura básica de um teste
-            # Verificar se é um teste válido por um dos critérios:
-            is_valid_test = (
-                "def test_" in test.test_code or  # Pytest
-                "def should_" in test.test_code or  # Style naming
-                "class Test" in test.test_code or  # Unittest class
-                "test(" in test.test_code or  # JavaScript Jest
-                "describe(" in test.test_code or  # JavaScript describe
-                "@Test" in test.test_code  # Java/C# annotation
-            )
-            
-            if not is_valid_test:
-                test_errors.append(f"Teste {i+1} não possui estrutura reconhecível de teste")
+            if not _TEST_STRUCTURE_PATTERN.search(test_code):
+                errors.append(f"Teste {i+1} não possui estrutura reconhecível de teste")
             
-            # Validar se contém pelo menos uma verificação (mais flexível)
-            has_verification = (
-                "assert" in test.test_code or 
-                "expect(" in test.test_code or  # JavaScript
-                "Assert." in test.test_code or  # C#/Java
-                "should" in test.test_code.lower() or  # BDD style
-                "pytest.raises" in test.test_code or
-                "with pytest.raises" in test.test_code
-            )
-            
-            # Não vamos ser tão rígidos com assertivas - avisar mas não falhar
-            if not has_verification:
+            # Não vamos ser tão rígidos com assertivas - avisar mas não falhar;
+            # a verificação só é feita se o aviso for de fato registrado
+            if log_missing_verification and not _TEST_VERIFICATION_PATTERN.search(test_code):
                 # Apenas aviso, não erro fatal
-                print(f"Aviso: Teste {i+1} pode não ter verificações explícitas")
-            
-            errors.extend(test_errors)
+                logger.info("Teste %s pode não ter verificações explícitas", i + 1)
         
         # Se todos os testes têm pelo menos estrutura básica, considerar válido
         # Ser mais permissivo com os testes gerados
@@ -869,7 +1666,7 @@ describe('{class_name} Tests', () => {{
         
         return len(critical_errors) == 0, errors
     
-    def _generate_specific_test_for_method(self, class_name: str, method_name: str, test_case: Dict[str, Any], method_info: Dict[str, Any] = None) -> str:
+    def _generate_specific_test_for_method(self, class_name: str, method_name: str, test_case: _TestCase, method_info: Dict[str, Any] = None) -> str:
         """
         Gera testes específicos baseados no método e classe sendo testados.
         
@@ -882,313 +1679,45 @@ describe('{class_name} Tests', () => {{
         Returns:
             str: Código do teste específico
         """
-        # Extrair parâmetros do método se disponível
-        method_params = []
-        init_params = []
-        
-        if method_info:
-            method_params = method_info.get("params", [])
-        
-        # Gerar diferentes tipos de teste baseado no cenário
-        scenario = test_case.get("scenario", "happy_path")
-        
-        if method_name == "__init__":
-            return self._generate_init_test(class_name, test_case, method_params)
-        elif method_name == "__repr__" or method_name == "__str__":
-            return self._generate_repr_test(class_name, method_name, test_case)
-        elif "balance" in method_name.lower() or "get_balance" in method_name.lower():
-            return self._generate_balance_test(class_name, method_name, test_case, scenario)
-        elif "add" in method_name.lower() or "transaction" in method_name.lower():
-            return self._generate_transaction_test(class_name, method_name, test_case, scenario)
-        elif "statement" in method_name.lower() or "get_statement" in method_name.lower():
-            return self._generate_statement_test(class_name, method_name, test_case, scenario)
-        else:
-            return self._generate_generic_method_test(class_name, method_name, test_case, method_params, scenario)
-    
-    def _generate_init_test(self, class_name: str, test_case: Dict[str, Any], params: List[str]) -> str:
-        """Gera teste para método __init__."""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
-        return f'''
-import pytest
-from src.main import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    description = "Test transaction"
-    amount = 100.0
-    
-    # Act
-    instance = {class_name}(description, amount)
-    
-    # Assert
-    assert instance.description == description
-    assert instance.amount == amount
-    assert instance.date is not None
-'''
-    
-    def _generate_repr_test(self, class_name: str, method_name: str, test_case: Dict[str, Any]) -> str:
-        """Gera teste para métodos __repr__ ou __str__."""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
-        return f'''
-import pytest
-from datetime import datetime
-from src.main import {class_name}
-from freezegun import freeze_time
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    description = "Test transaction"
-    amount = 100.0
-    test_date = datetime(2023, 1, 1)
-    with freeze_time("2023-01-01"):
-        instance = {class_name}(description, amount, test_date)
-    
-    # Act
-    result = str(instance)
-    
-    # Assert
-    assert description in result
-    assert "100.00" in result
-    assert "2023-01-01" in result
-'''
-    
-    def _generate_balance_test(self, class_name: str, method_name: str, test_case: Dict[str, Any], scenario: str) -> str:
-        """Gera teste para métodos relacionados a balanço."""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
-        
-        if scenario == "happy_path":
-            return f'''
-import pytest
-from src.main import {class_name}, Transaction
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    transaction1 = Transaction("Deposit", 100.0)
-    transaction2 = Transaction("Withdrawal", -50.0)
-    wallet.add_transaction(transaction1)
-    wallet.add_transaction(transaction2)
-    
-    # Act
-    balance = wallet.{method_name}()
-    
-    # Assert
-    assert balance == 50.0
-'''
-        elif scenario == "edge_cases":
-            return f'''
-import pytest
-from src.main import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    
-    # Act
-    balance = wallet.{method_name}()
-    
-    # Assert
-    assert balance == 0.0
-'''
-        else:  # error_handling
-            return f'''
-import pytest
-from src.main import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    
-    # Act & Assert
-    # Teste se o método é robusto para casos extremos
-    balance = wallet.{method_name}()
-    assert isinstance(balance, (int, float))
-'''
-    
-    def _generate_transaction_test(self, class_name: str, method_name: str, test_case: Dict[str, Any], scenario: str) -> str:
-        """Gera teste para métodos relacionados a transações."""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
-        
-        if scenario == "happy_path":
-            return f'''
-import pytest
-from your_module import {class_name}, Transaction
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    transaction = Transaction("Test Transaction", 100.0)
-    
-    # Act
-    wallet.{method_name}(transaction)
-    
-    # Assert
-    assert len(wallet.transactions) == 1
-    assert wallet.transactions[0] == transaction
-'''
-        elif scenario == "error_handling":
-            return f'''
-import pytest
-from your_module import {class_name}, Transaction
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    invalid_transaction = Transaction("Invalid", 0.0)
-    
-    # Act
-    # Act & Assert combinados para teste de exceção
-    with pytest.raises(ValueError, match="O valor da transação não pode ser zero"):
-        wallet.{method_name}(invalid_transaction)
-        
-    # Assert
-    # Validação adicional se necessária
-    assert len(wallet.transactions) == 0
-'''
-        else:  # edge_cases
-            return f'''
-import pytest
-from your_module import {class_name}, Transaction
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    large_transaction = Transaction("Large Transaction", 999999.99)
-    negative_transaction = Transaction("Negative Transaction", -999999.99)
-    
-    # Act
-    wallet.{method_name}(large_transaction)
-    wallet.{method_name}(negative_transaction)
-    
-    # Assert
-    assert len(wallet.transactions) == 2
-    assert wallet.get_balance() == 0.0
-'''
+        method_params = tuple(method_info.get("params", [])) if method_info else ()
+        return self._render_specific_test(class_name, method_name, test_case, method_params)
     
-    def _generate_statement_test(self, class_name: str, method_name: str, test_case: Dict[str, Any], scenario: str) -> str:
-        """Gera teste para métodos relacionados a extratos."""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
+    @staticmethod
+    @lru_cache(maxsize=SPECIFIC_TEST_CACHE_MAXSIZE)
+    def _render_specific_test(class_name: str, method_name: str, test_case: _TestCase,
+                              params: Tuple[str, ...]) -> str:
+        """
+        Renderiza o teste específico de um método a partir dos modelos pré-montados.
         
-        if scenario == "happy_path":
-            return f'''
-import pytest
-from your_module import {class_name}, Transaction
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    transaction1 = Transaction("Transaction 1", 100.0)
-    transaction2 = Transaction("Transaction 2", -50.0)
-    wallet.add_transaction(transaction1)
-    wallet.add_transaction(transaction2)
-    
-    # Act
-    statement = wallet.{method_name}()
-    
-    # Assert
-    assert len(statement) == 2
-    assert isinstance(statement, list)
-    assert all(isinstance(item, str) for item in statement)
-'''
-        elif scenario == "edge_cases":
-            return f'''
-import pytest
-from your_module import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    
-    # Act
-    statement = wallet.{method_name}()
-    
-    # Assert
-    assert isinstance(statement, list)
-    assert len(statement) == 0
-'''
-        else:  # error_handling
-            return f'''
-import pytest
-from your_module import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    wallet = {class_name}("Test User")
-    
-    # Act
-    statement = wallet.{method_name}()
-    
-    # Assert
-    assert isinstance(statement, list)
-'''
-    
-    def _generate_generic_method_test(self, class_name: str, method_name: str, test_case: Dict[str, Any], params: List[str], scenario: str) -> str:
-        """Gera teste genérico para métodos não específicos."""
-        param_setup = ""
-        param_call = ""
-        test_name = test_case["name"]
-        test_description = test_case["description"]
+        O resultado depende apenas dos argumentos, então é memorizado e
+        reaproveitado entre requisições com as mesmas classes e métodos.
         
-        if params:
-            param_setup = "\n    ".join([f"{param} = 'test_{param}'" for param in params])
-            param_call = ", ".join(params)
+        Args:
+            class_name: Nome da classe
+            method_name: Nome do método
+            test_case: Dados do caso de teste
+            params: Parâmetros do método, sem 'self'
+            
+        Returns:
+            str: Código do teste específico
+        """
+        kind = _method_test_kind(method_name)
+        if kind == "generic":
+            return GENERIC_METHOD_TEST_TEMPLATE.format(
+                class_name=class_name,
+                method_name=method_name,
+                test_name=test_case.name,
+                test_description=test_case.description,
+                param_setup="\n    ".join(f"{param} = 'test_{param}'" for param in params),
+                param_call=", ".join(params)
+            )
         
-        return f'''
-import pytest
-from your_module import {class_name}
-
-def {test_name}():
-    """
-    {test_description}
-    """
-    # Arrange
-    instance = {class_name}("test_param")
-    {param_setup}
-    
-    # Act
-    result = instance.{method_name}({param_call})
-    
-    # Assert
-    assert result is not None
-'''
+        return SPECIFIC_TEST_TEMPLATES[kind, test_case.scenario].format(
+            class_name=class_name,
+            method_name=method_name,
+            test_name=test_case.name,
+            test_description=test_case.description
+        )
     
     def _generate_generic_tests(self, code_content: str, request: CodeRequest, framework: TestFramework) -> List[GeneratedTest]:
         """
@@ -1202,8 +1731,6 @@ def {test_name}():
         Returns:
             List[GeneratedTest]: Lista de testes genéricos
         """
-        tests = []
-        
         # Gerar pelo menos um teste genérico para qualquer código
         if request.language == CodeLanguage.PYTHON:
             test_code = f'''
@@ -1284,15 +1811,27 @@ describe('Generic Code Tests', () => {{
 '''
         
         # Criar teste genérico
-        generic_test = GeneratedTest(
-            test_name="test_generic_code_functionality",
-            test_code=test_code,
-            framework=framework,
-            coverage_estimation=60,
-            dependencies=self._get_test_dependencies(framework),
-            description="Teste genérico para verificar a estrutura e funcionalidade básica do código"
-        )
-        
-        tests.append(generic_test)
-        
-        return tests
+        return [
+            GeneratedTest(
+                test_name="test_generic_code_functionality",
+                test_code=test_code,
+                framework=framework,
+                coverage_estimation=60,
+                dependencies=self._get_test_dependencies(framework),
+                description="Teste genérico para verificar a estrutura e funcionalidade básica do código"
+            )
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_test_generator_agent() -> TestGeneratorAgent:
+    """
+    Obtém o agente gerador de testes compartilhado pela aplicação.
+    
+    O agente não guarda estado por requisição; compartilhá-lo evita criar,
+    a cada requisição, um novo serviço GitLab com seu próprio cliente HTTP.
+    
+    Returns:
+        TestGeneratorAgent: Instância compartilhada do agente
+    """
+    return TestGeneratorAgent()
@@ -6,16 +6,52 @@ e otimização de código usando agentes de IA.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
-import time
+from fastapi.responses import Response, StreamingResponse
+import json
 from datetime import datetime
 
 from schemas.code_schemas import BugFixRequest, BugFixResponse, CodeAnalysis
 from schemas.common_schemas import ErrorResponse
-from agents.bug_fixer_agent import BugFixerAgent
+from agents.bug_fixer_agent import get_bug_fixer_agent
 
 router = APIRouter()
 
+# Sugestões de correção estáticas, organizadas por categoria
+FIX_SUGGESTIONS = {
+    "common_fixes": {
+        "null_pointer": [
+            "Verificar se a variável foi inicializada",
+            "Adicionar validação de nulo",
+            "Usar operador de navegação segura"
+        ],
+        "index_out_of_bounds": [
+            "Verificar o tamanho da lista/array",
+            "Adicionar validação de índice",
+            "Usar estruturas de controle apropriadas"
+        ],
+        "type_errors": [
+            "Verificar tipos de dados",
+            "Adicionar conversão de tipos",
+            "Usar type hints em Python"
+        ]
+    },
+    "best_practices": [
+        "Seguir convenções de nomenclatura",
+        "Adicionar documentação adequada",
+        "Implementar tratamento de erros",
+        "Usar padrões de design apropriados"
+    ],
+    "performance_tips": [
+        "Otimizar loops aninhados",
+        "Evitar operações desnecessárias",
+        "Usar estruturas de dados eficientes",
+        "Implementar cache quando apropriado"
+    ]
+}
+# Corpo JSON pré-serializado; a Response é criada por requisição porque os
+# middlewares alteram a lista de cabeçalhos da instância enviada
+FIX_SUGGESTIONS_BODY = json.dumps(FIX_SUGGESTIONS, ensure_ascii=False).encode("utf-8")
+
 
 @router.post(
     "/fix/bugs",
@@ -38,10 +74,8 @@ async def fix_bugs(request: BugFixRequest) -> BugFixResponse:
         HTTPException: Em caso de erro na correção
     """
     try:
-        start_time = time.time()
-        
-        # Inicializar agente corretor de código
-        bug_fixer = BugFixerAgent()
+        # Obter agente corretor de código compartilhado
+        bug_fixer = get_bug_fixer_agent()
         
         # Processar correção
         response = await bug_fixer.fix_bugs(request)
@@ -58,10 +92,48 @@ async def fix_bugs(request: BugFixRequest) -> BugFixResponse:
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_response.dict()
+            detail=error_response.model_dump(mode="json")
         )
 
 
+@router.post(
+    "/fix/bugs/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Corrigir Bugs (streaming)",
+    description="Corrige bugs no código fornecido transmitindo a resposta via Server-Sent Events"
+)
+async def fix_bugs_stream(request: BugFixRequest) -> StreamingResponse:
+    """
+    Endpoint para correção de bugs com resposta em streaming.
+    
+    Cada fragmento gerado pelo LLM é enviado como um evento SSE
+    (data: {"content": ...}); o último evento sinaliza o fim com
+    {"done": true} ou informa o erro ocorrido.
+    
+    Args:
+        request: Dados da requisição de correção de bugs
+        
+    Returns:
+        StreamingResponse: Fluxo de eventos text/event-stream
+    """
+    async def event_stream():
+        try:
+            # Obtido dentro do stream: LLM indisponível vira evento de erro
+            bug_fixer = get_bug_fixer_agent()
+            async for content in bug_fixer.fix_bugs_stream(request):
+                yield f"data: {json.dumps({'content': content}, ensure_ascii=False)}\n\n"
+            yield f"data: {json.dumps({'done': True})}\n\n"
+        except Exception as e:
+            error = {"error": "BUG_FIX_ERROR", "message": f"Erro ao corrigir código: {str(e)}"}
+            yield f"data: {json.dumps(error, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post(
     "/analyze/code",
     response_model=CodeAnalysis,
@@ -84,8 +156,8 @@ async def analyze_code(code: str, language: str = "python") -> CodeAnalysis:
         HTTPException: Em caso de erro na análise
     """
     try:
-        # Inicializar agente corretor de código
-        bug_fixer = BugFixerAgent()
+        # Obter agente corretor de código compartilhado
+        bug_fixer = get_bug_fixer_agent()
         
         # Processar análise
         analysis = await bug_fixer.analyze_code(code, language)
@@ -101,7 +173,7 @@ async def analyze_code(code: str, language: str = "python") -> CodeAnalysis:
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_response.dict()
+            detail=error_response.model_dump(mode="json")
         )
 
 
@@ -112,43 +184,18 @@ async def analyze_code(code: str, language: str = "python") -> CodeAnalysis:
     summary="Sugestões de Correção",
     description="Lista sugestões comuns para correção de bugs"
 )
-async def get_fix_suggestions() -> dict:
+async def get_fix_suggestions() -> Response:
     """
     Endpoint para obter sugestões de correção.
     
+    O corpo é serializado uma única vez na importação do módulo; cada
+    requisição apenas o envia. Como a Response é devolvida diretamente,
+    response_model só documenta o formato no OpenAPI.
+    
     Returns:
-        dict: Sugestões de correção organizadas por categoria
+        Response: Sugestões de correção organizadas por categoria, em JSON
     """
-    suggestions = {
-        "common_fixes": {
-            "null_pointer": [
-                "Verificar se a variável foi inicializada",
-                "Adicionar validação de nulo",
-                "Usar operador de navegação segura"
-            ],
-            "index_out_of_bounds": [
-                "Verificar o tamanho da lista/array",
-                "Adicionar validação de índice",
-                "Usar estruturas de controle apropriadas"
-            ],
-            "type_errors": [
-                "Verificar tipos de dados",
-                "Adicionar conversão de tipos",
-                "Usar type hints em Python"
-            ]
-        },
-        "best_practices": [
-            "Seguir convenções de nomenclatura",
-            "Adicionar documentação adequada",
-            "Implementar tratamento de erros",
-            "Usar padrões de design apropriados"
-        ],
-        "performance_tips": [
-            "Otimizar loops aninhados",
-            "Evitar operações desnecessárias",
-            "Usar estruturas de dados eficientes",
-            "Implementar cache quando apropriado"
-        ]
-    }
-    
-    return suggestions
+    return Response(
+        content=FIX_SUGGESTIONS_BODY,
+        media_type="application/json"
+    )
@@ -6,16 +6,30 @@ unitários e análise de código usando agentes de IA.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+import json
 import time
 from datetime import datetime
+from types import MappingProxyType
 
 from schemas.code_schemas import CodeRequest, CodeResponse, CodeLanguage, TestFramework
 from schemas.common_schemas import ErrorResponse
-from agents.test_generator_agent import TestGeneratorAgent
+from agents.test_generator_agent import get_test_generator_agent
 
 router = APIRouter()
 
+# Mapeamento de linguagens para frameworks compatíveis, montado uma única vez
+LANGUAGE_FRAMEWORK_COMPATIBILITY = MappingProxyType({
+    CodeLanguage.PYTHON: (TestFramework.PYTEST, TestFramework.UNITTEST, TestFramework.AUTO),
+    CodeLanguage.JAVASCRIPT: (TestFramework.JEST, TestFramework.MOCHA, TestFramework.AUTO),
+    CodeLanguage.TYPESCRIPT: (TestFramework.JEST, TestFramework.MOCHA, TestFramework.AUTO),
+    CodeLanguage.JAVA: (TestFramework.JUNIT, TestFramework.AUTO),
+    CodeLanguage.CSHARP: (TestFramework.NUNIT, TestFramework.AUTO),
+    CodeLanguage.GO: (TestFramework.GOTEST, TestFramework.AUTO),
+    CodeLanguage.RUST: (TestFramework.PYTEST, TestFramework.AUTO),  # Fallback
+    CodeLanguage.PHP: (TestFramework.PYTEST, TestFramework.AUTO),  # Fallback
+})
+
 
 def validate_language_framework_consistency(language: CodeLanguage, framework: TestFramework) -> tuple[bool, str]:
     """
@@ -28,19 +42,7 @@ def validate_language_framework_consistency(language: CodeLanguage, framework: T
     Returns:
         tuple[bool, str]: (é_válido, mensagem_erro)
     """
-    # Mapeamento de linguagens para frameworks compatíveis
-    language_framework_compatibility = {
-        CodeLanguage.PYTHON: [TestFramework.PYTEST, TestFramework.UNITTEST, TestFramework.AUTO],
-        CodeLanguage.JAVASCRIPT: [TestFramework.JEST, TestFramework.MOCHA, TestFramework.AUTO],
-        CodeLanguage.TYPESCRIPT: [TestFramework.JEST, TestFramework.MOCHA, TestFramework.AUTO],
-        CodeLanguage.JAVA: [TestFramework.JUNIT, TestFramework.AUTO],
-        CodeLanguage.CSHARP: [TestFramework.NUNIT, TestFramework.AUTO],
-        CodeLanguage.GO: [TestFramework.GOTEST, TestFramework.AUTO],
-        CodeLanguage.RUST: [TestFramework.PYTEST, TestFramework.AUTO],  # Fallback
-        CodeLanguage.PHP: [TestFramework.PYTEST, TestFramework.AUTO]   # Fallback
-    }
-    
-    compatible_frameworks = language_framework_compatibility.get(language, [TestFramework.AUTO])
+    compatible_frameworks = LANGUAGE_FRAMEWORK_COMPATIBILITY.get(language, (TestFramework.AUTO,))
     
     if framework in compatible_frameworks:
         return True, ""
@@ -78,7 +80,7 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
         HTTPException: Em caso de erro na geração
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Validar consistência entre linguagem e framework
         is_valid, error_message = validate_language_framework_consistency(request.language, request.test_framework)
@@ -94,8 +96,8 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
                 }
             )
         
-        # Inicializar agente gerador de testes
-        test_agent = TestGeneratorAgent()
+        # Obter agente gerador de testes compartilhado
+        test_agent = get_test_generator_agent()
         
         # Processar geração de testes
         tests, analysis = await test_agent.generate_tests(request)
@@ -105,7 +107,6 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
         
         if not tests_valid:
             # Se testes são inválidos, retornar erro 422 (Unprocessable Entity)
-            from fastapi import HTTPException
             error_details = {
                 "error": "INVALID_TESTS_GENERATED",
                 "message": "Os testes gerados não atendem aos critérios de qualidade",
@@ -117,7 +118,7 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
                 detail=error_details
             )
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         return CodeResponse(
             success=True,
@@ -132,6 +133,9 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
             processing_time=processing_time
         )
         
+    except HTTPException:
+        # Erros já formatados (422) seguem como estão, sem montar um novo ErrorResponse
+        raise
     except Exception as e:
         error_response = ErrorResponse(
             error="TEST_GENERATION_ERROR",
@@ -139,11 +143,67 @@ async def generate_tests(request: CodeRequest) -> CodeResponse:
             timestamp=datetime.now()
         )
         
-        # Serializar o ErrorResponse corretamente
-        error_dict = error_response.dict()
-        error_dict['timestamp'] = error_response.timestamp.isoformat()
-        
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_dict
+            detail=error_response.model_dump(mode="json")
+        )
+
+
+@router.post(
+    "/code/tests/generate/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Gerar Testes Unitários (streaming)",
+    description="Gera testes unitários enviando cada teste via Server-Sent Events assim que fica pronto"
+)
+async def generate_tests_stream(request: CodeRequest) -> StreamingResponse:
+    """
+    Endpoint para geração de testes unitários com resposta em streaming.
+    
+    O primeiro evento traz a análise do código (data: {"analysis": ...}),
+    seguido de um evento por teste (data: {"test": ...}); o último evento
+    informa o resultado da validação de integridade com "done": true ou o
+    erro ocorrido.
+    
+    Args:
+        request: Dados da requisição de geração de testes
+        
+    Returns:
+        StreamingResponse: Fluxo de eventos text/event-stream
+        
+    Raises:
+        HTTPException: Se a linguagem e o framework forem incompatíveis
+    """
+    is_valid, error_message = validate_language_framework_consistency(request.language, request.test_framework)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "error": "LANGUAGE_FRAMEWORK_INCOMPATIBLE",
+                "message": error_message,
+                "language": request.language.value,
+                "framework": request.test_framework.value,
+                "timestamp": datetime.now().isoformat()
+            }
         )
+    
+    async def event_stream():
+        tests = []
+        try:
+            # Obtido dentro do stream: LLM indisponível vira evento de erro
+            test_agent = get_test_generator_agent()
+            async for kind, payload in test_agent.generate_tests_stream(request):
+                if kind == "test":
+                    tests.append(payload)
+                yield f"data: {json.dumps({kind: payload.model_dump(mode='json')}, ensure_ascii=False)}\n\n"
+            
+            tests_valid, validation_errors = test_agent._validate_test_integrity(tests)
+            event = {"done": True, "valid": tests_valid, "validation_errors": validation_errors}
+        except Exception as e:
+            event = {"error": "TEST_GENERATION_ERROR", "message": f"Erro ao gerar testes: {str(e)}"}
+        yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -6,14 +6,14 @@ em formato Gherkin usando agentes de IA.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+import json
 import time
-import uuid
 from datetime import datetime
 
-from schemas.story_schemas import StoryRequest, StoryResponse, GeneratedStory, AcceptanceCriteria, StoryType
+from schemas.story_schemas import StoryRequest, StoryResponse, GeneratedStory, StoryType
 from schemas.common_schemas import ErrorResponse
-from agents.story_agent import StoryAgent
+from agents.story_agent import get_story_agent
 
 router = APIRouter()
 
@@ -39,15 +39,15 @@ async def generate_stories(request: StoryRequest) -> StoryResponse:
         HTTPException: Em caso de erro na geração
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Inicializar agente de histórias
-        story_agent = StoryAgent()
+        # Agente de histórias compartilhado
+        story_agent = get_story_agent()
         
         # Processar requisição
         stories = await story_agent.generate_stories(request)
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         
         return StoryResponse(
             success=True,
@@ -70,10 +70,51 @@ async def generate_stories(request: StoryRequest) -> StoryResponse:
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_response.dict()
+            detail=error_response.model_dump(mode="json")
         )
 
 
+@router.post(
+    "/stories/generate/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Gerar Histórias (streaming)",
+    description="Gera histórias transmitindo os campos parciais via Server-Sent Events"
+)
+async def generate_stories_stream(request: StoryRequest) -> StreamingResponse:
+    """
+    Endpoint para geração de histórias com resposta em streaming.
+    
+    Enquanto o LLM gera a saída, os campos já recebidos são enviados como
+    eventos SSE (data: {"partial": ...}); o último evento traz as histórias
+    validadas com {"stories": [...], "done": true} ou informa o erro ocorrido.
+    
+    Args:
+        request: Dados da requisição de geração
+        
+    Returns:
+        StreamingResponse: Fluxo de eventos text/event-stream
+    """
+    story_agent = get_story_agent()
+    
+    async def event_stream():
+        try:
+            async for kind, payload in story_agent.stream_stories(request):
+                if kind == "partial":
+                    event = {"partial": payload}
+                else:
+                    event = {"stories": [story.model_dump(mode="json") for story in payload], "done": True}
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            error = {"error": "STORY_GENERATION_ERROR", "message": f"Erro ao gerar histórias: {str(e)}"}
+            yield f"data: {json.dumps(error, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post(
     "/stories/validate",
     response_model=dict,
@@ -92,8 +133,8 @@ async def validate_story(story: GeneratedStory) -> dict:
         dict: Resultado da validação
     """
     try:
-        story_agent = StoryAgent()
-        validation_result = await story_agent.validate_story(story)
+        story_agent = get_story_agent()
+        validation_result = story_agent.validate_story(story)
         
         return {
             "valid": validation_result["valid"],
@@ -111,7 +152,7 @@ async def validate_story(story: GeneratedStory) -> dict:
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_response.dict()
+            detail=error_response.model_dump(mode="json")
         )
 
 
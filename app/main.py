@@ -9,6 +9,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from api.routers import health, story_creator, code_tester, code_fixer
+from agents.bug_fixer_agent import get_bug_fixer_agent
+from agents.story_agent import get_story_agent
+from agents.test_generator_agent import get_test_generator_agent
+from services.llm_cache import configure_llm_cache
+from services.llm_factory import close_http_async_client, open_http_async_client
+from services.llm_limiter import open_llm_semaphore
+from services.semantic_cache import get_semantic_cache
+
+# Instâncias compartilhadas que guardam modelos ligados ao cliente HTTP
+_SHARED_LLM_USERS = (get_story_agent, get_test_generator_agent, get_bug_fixer_agent, get_semantic_cache)
 
 
 @asynccontextmanager
@@ -21,9 +31,16 @@ async def lifespan(app: FastAPI):
     """
     # Inicialização
     print("🚀 Code Guardian API iniciando...")
+    # Recursos ligados ao event loop do servidor: criados aqui, e não na importação
+    open_http_async_client()
+    open_llm_semaphore()
     yield
     # Finalização
     print("🛑 Code Guardian API finalizando...")
+    await close_http_async_client()
+    # Agentes e caches criados com o cliente fechado são recriados no próximo startup
+    for get_shared in _SHARED_LLM_USERS:
+        get_shared.cache_clear()
 
 
 def create_app() -> FastAPI:
@@ -33,6 +50,9 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Instância configurada da aplicação
     """
+    # Cache global de respostas do LLM compartilhado pelos agentes
+    configure_llm_cache()
+    
     app = FastAPI(
         title="Code Guardian API",
         description="API para geração automatizada de testes unitários e correção de código",
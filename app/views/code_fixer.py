@@ -10,6 +10,10 @@ from pathlib import Path
 import sys
 import requests
 import base64
+import json
+import re
+import traceback
+from datetime import datetime
 
 # Adicionar diretório raiz ao path
 root_dir = Path(__file__).parent.parent.parent
@@ -193,8 +197,6 @@ class CodeFixerPage:
             tuple: (fixed_code, explanation, changes_made, prevention_tips)
         """
         try:
-            import json
-            
             # Obter dados JSON da resposta
             response_data = response.json()
             
@@ -240,7 +242,6 @@ class CodeFixerPage:
                 # Caso 2: fixed_code contém JSON com quebras de linha ou formatação markdown
                 elif "```json" in fixed_code or "```" in fixed_code:
                     # Extrair JSON de dentro do markdown
-                    import re
                     json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', fixed_code, re.DOTALL)
                     if json_match:
                         try:
@@ -268,7 +269,6 @@ class CodeFixerPage:
             
         except Exception as e:
             st.error(f"❌ Erro ao processar resposta da API: {str(e)}")
-            import traceback
             st.error(f"Traceback: {traceback.format_exc()}")
             return None, None, None, None
     
@@ -471,8 +471,6 @@ except Exception as e:
         Returns:
             str: Conteúdo formatado em texto
         """
-        from datetime import datetime
-        
         # Recuperar informações da sessão
         error_message = get_session_value("error_message", "Não especificado")
         bug_code = get_session_value("bug_code", "Não especificado")
@@ -8,6 +8,7 @@ usando metodologias ágeis e linguagem Gherkin.
 import streamlit as st
 import requests
 import json
+from datetime import datetime
 from typing import Dict, Any
 from pathlib import Path
 import sys
@@ -423,8 +424,6 @@ class StoryCreatorPage:
         Returns:
             str: Conteúdo formatado em texto
         """
-        from datetime import datetime
-        
         txt_content = []
         txt_content.append("=" * 80)
         txt_content.append("               HISTÓRIAS E TAREFAS - CODE GUARDIAN")
@@ -513,8 +512,6 @@ class StoryCreatorPage:
         Returns:
             str: Conteúdo formatado da história pronto para cópia
         """
-        from datetime import datetime
-        
         content = []
         content.append("=" * 60)
         content.append(f"          HISTÓRIA {story_number} - CODE GUARDIAN")
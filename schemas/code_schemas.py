@@ -5,8 +5,8 @@ Este módulo define os modelos de dados para entrada e saída
 das funcionalidades de geração de testes e correção de código.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, validator
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 import re
 
@@ -71,7 +71,7 @@ class CodeRequest(BaseModel):
     coverage_target: int = Field(default=80, ge=0, le=100, description="Meta de cobertura de código")
     additional_context: Optional[str] = Field(None, description="Contexto adicional para geração")
     
-    @validator('code_content')
+    @validator('code_content', always=True)
     def validate_code_content(cls, v, values):
         """
         Valida se o código foi fornecido quando necessário.
@@ -144,6 +144,8 @@ class CodeAnalysis(BaseModel):
     """
     Schema para análise de código.
     
+    Imutável, para que uma mesma análise possa ser compartilhada entre respostas.
+    
     Attributes:
         complexity_score: Pontuação de complexidade
         maintainability_index: Índice de manutenibilidade
@@ -154,8 +156,10 @@ class CodeAnalysis(BaseModel):
     complexity_score: int = Field(..., ge=0, le=100, description="Pontuação de complexidade")
     maintainability_index: int = Field(..., ge=0, le=100, description="Índice de manutenibilidade")
     test_coverage_potential: int = Field(..., ge=0, le=100, description="Potencial de cobertura de testes")
-    code_smells: List[str] = Field(default_factory=list, description="Lista de problemas identificados")
-    suggestions: List[str] = Field(default_factory=list, description="Sugestões de melhoria")
+    code_smells: Tuple[str, ...] = Field(default_factory=tuple, description="Lista de problemas identificados")
+    suggestions: Tuple[str, ...] = Field(default_factory=tuple, description="Sugestões de melhoria")
+
+    model_config = ConfigDict(frozen=True)
 
 
 class CodeResponse(BaseModel):
@@ -218,3 +222,19 @@ class BugFixResponse(BaseModel):
     changes_made: List[str] = Field(..., description="Lista de mudanças realizadas")
     prevention_tips: List[str] = Field(default_factory=list, description="Dicas para prevenir bugs similares")
     processing_time: float = Field(..., description="Tempo de processamento em segundos")
+
+
+class BugFixLLMOutput(BaseModel):
+    """
+    Schema da saída estruturada do LLM na correção de bugs.
+    
+    Attributes:
+        fixed_code: Código corrigido
+        explanation: Explicação do problema e da solução
+        changes_made: Lista de mudanças realizadas
+        prevention_tips: Dicas para prevenir problemas similares
+    """
+    fixed_code: str = Field(..., description="Código corrigido")
+    explanation: str = Field(..., description="Explicação do problema e da solução")
+    changes_made: List[str] = Field(..., description="Lista de mudanças realizadas")
+    prevention_tips: List[str] = Field(..., description="Dicas para prevenir problemas similares")
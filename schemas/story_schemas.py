@@ -5,8 +5,8 @@ Este módulo define os modelos de dados para entrada e saída
 da funcionalidade de criação de histórias em formato Gherkin.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Any, List, Optional, Tuple
 from enum import Enum
 
 
@@ -30,6 +30,13 @@ class Priority(str, Enum):
     URGENTE = "urgente"
 
 
+# Grafias aceitas para a prioridade devolvida pelo LLM, já em minúsculas
+PRIORITY_ALIASES = {
+    **{priority.value: priority for priority in Priority},
+    "média": Priority.MEDIA,
+}
+
+
 class StoryRequest(BaseModel):
     """
     Schema para requisição de criação de histórias.
@@ -57,6 +64,9 @@ class AcceptanceCriteria(BaseModel):
         when: Ação realizada
         then: Resultado esperado
     """
+    # Imutável: instâncias fixas dos geradores mock são compartilhadas entre histórias
+    model_config = ConfigDict(frozen=True)
+
     given: str = Field(..., description="Condições iniciais")
     when: str = Field(..., description="Ação realizada")
     then: str = Field(..., description="Resultado esperado")
@@ -71,9 +81,12 @@ class DetailedTask(BaseModel):
         description: Descrição detalhada da tarefa
         examples: Exemplos ou dados extras quando aplicável
     """
+    # Imutável: instâncias fixas dos geradores mock são compartilhadas entre histórias
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(..., description="Título da tarefa")
     description: str = Field(..., description="Descrição detalhada da tarefa")
-    examples: Optional[List[str]] = Field(default_factory=list, description="Exemplos ou dados extras")
+    examples: Tuple[str, ...] = Field(default=(), description="Exemplos ou dados extras")
 
 
 class GeneratedStory(BaseModel):
@@ -104,6 +117,71 @@ class GeneratedStory(BaseModel):
     justificativa_estimativa: str = Field(..., description="Justificativa para a complexidade estimada")
 
 
+class StoryDraft(BaseModel):
+    """
+    Schema de uma história como produzida pelo LLM, antes de receber ID e tipo.
+    
+    Aceita variações comuns da resposta do modelo: prioridade com acento ou
+    em maiúsculas e tarefas informadas apenas como texto.
+    
+    Attributes:
+        title: Título claro e contextualizado
+        description: Parágrafo explicativo detalhado
+        acceptance_criteria: Lista de critérios de aceitação em formato Gherkin
+        tasks: Lista de tarefas detalhadas
+        priority: Prioridade da história
+        justificativa_prioridade: Justificativa para a prioridade atribuída
+        estimation: Estimativa numérica em Story Points
+        justificativa_estimativa: Justificativa para a complexidade estimada
+    """
+    title: str = Field(..., description="Título claro e contextualizado")
+    description: str = Field(..., description="Parágrafo explicativo detalhado")
+    acceptance_criteria: List[AcceptanceCriteria] = Field(default_factory=list, description="Lista de critérios de aceitação")
+    tasks: List[DetailedTask] = Field(default_factory=list, description="Lista de tarefas detalhadas")
+    priority: Priority = Field(default=Priority.MEDIA, description="Prioridade da história")
+    justificativa_prioridade: str = Field(
+        default="Prioridade atribuída com base na análise do contexto",
+        description="Justificativa para a prioridade atribuída"
+    )
+    estimation: int = Field(default=5, ge=1, le=21, description="Estimativa numérica em Story Points (1-21)")
+    justificativa_estimativa: str = Field(
+        default="Estimativa baseada na complexidade identificada",
+        description="Justificativa para a complexidade estimada"
+    )
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def normalize_priority(cls, v: Any) -> Any:
+        """Normaliza a prioridade informada pelo LLM (ex.: "Média" -> "media")."""
+        if isinstance(v, str):
+            return PRIORITY_ALIASES.get(v.strip().lower(), Priority.MEDIA)
+        return v
+
+    @field_validator("tasks", mode="before")
+    @classmethod
+    def normalize_tasks(cls, v: Any) -> Any:
+        """Converte tarefas informadas apenas como texto em tarefas detalhadas."""
+        if isinstance(v, list):
+            return [
+                {"title": task, "description": "Tarefa gerada pelo LLM", "examples": ()}
+                if isinstance(task, str) else task
+                for task in v
+            ]
+        return v
+
+
+class EpicDraft(BaseModel):
+    """
+    Schema da saída estruturada do LLM para um épico e suas histórias relacionadas.
+    
+    Attributes:
+        epic: Épico gerado
+        related_stories: Histórias de usuário relacionadas ao épico
+    """
+    epic: StoryDraft = Field(..., description="Épico gerado")
+    related_stories: List[StoryDraft] = Field(default_factory=list, description="Histórias relacionadas ao épico")
+
+
 class StoryResponse(BaseModel):
     """
     Schema para resposta de criação de histórias.
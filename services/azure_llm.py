@@ -5,7 +5,7 @@ Implementação de comunicação e chamada aos serviços da
 plataforma Azure OpenAI, utilizando credenciais configuradas.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 import httpx
 import logging
 from config.settings import settings
@@ -41,7 +41,7 @@ class AzureLLMService:
         # Construir URL base
         self.base_url = self.config["endpoint"].rstrip('/') + '/openai/deployments/' + self.config["deployment_name"]
         
-        self.logger.info(f"AzureLLMService inicializado com endpoint: {self.config['endpoint']}")
+        self.logger.info("AzureLLMService inicializado com endpoint: %s", self.config['endpoint'])
     
     def _validate_config(self) -> None:
         """Valida as configurações necessárias."""
@@ -80,10 +80,10 @@ class AzureLLMService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
-            self.logger.error(f"Erro na chamada para Azure OpenAI: {e}")
+            self.logger.error("Erro na chamada para Azure OpenAI: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Erro inesperado: {e}")
+            self.logger.error("Erro inesperado: %s", e)
             raise
 
     async def close(self):
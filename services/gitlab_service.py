@@ -6,9 +6,7 @@ de código-fonte de repositórios GitLab corporativos.
 """
 
 import httpx
-import os
 from typing import Dict, Any, Optional
-from urllib.parse import urlparse
 
 
 class GitLabService:
@@ -0,0 +1,159 @@
+"""
+Configuração do cache global de respostas do LLM.
+
+Este módulo instala o cache do LangChain para que chamadas idênticas
+ao modelo (mesmas mensagens e parâmetros) sejam respondidas localmente,
+sem nova ida à rede e sem consumo de tokens.
+"""
+
+import os
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import BaseCache, InMemoryCache, RETURN_VAL_TYPE
+from langchain_core.globals import get_llm_cache, set_llm_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Backends suportados via variável de ambiente LLM_CACHE_BACKEND
+CACHE_BACKEND_MEMORY = "memory"
+CACHE_BACKEND_SQLITE = "sqlite"
+CACHE_BACKEND_NONE = "none"
+
+DEFAULT_CACHE_MAXSIZE = 1000
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_SQLITE_PATH = ".code_guardian_cache.db"
+
+
+class TTLInMemoryCache(InMemoryCache):
+    """
+    Cache em memória com expiração por tempo e descarte LRU.
+
+    As chaves são o hash SHA-256 do prompt serializado e da configuração
+    do modelo, evitando manter em memória cópias dos prompts completos.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_MAXSIZE, ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize: Número máximo de respostas armazenadas
+            ttl: Tempo de vida de cada resposta em segundos
+        """
+        super().__init__(maxsize=maxsize)
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """
+        Calcula a chave de uma entrada.
+
+        Args:
+            prompt: Prompt serializado
+            llm_string: Configuração serializada do modelo
+
+        Returns:
+            str: Hash SHA-256 da entrada
+        """
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Busca uma resposta válida para o prompt.
+
+        Args:
+            prompt: Prompt serializado
+            llm_string: Configuração serializada do modelo
+
+        Returns:
+            Optional[RETURN_VAL_TYPE]: Resposta armazenada ou None se ausente/expirada
+        """
+        key = self._key(prompt, llm_string)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, return_val = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return return_val
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Armazena a resposta de um prompt.
+
+        Args:
+            prompt: Prompt serializado
+            llm_string: Configuração serializada do modelo
+            return_val: Resposta a ser armazenada
+        """
+        key = self._key(prompt, llm_string)
+        self._entries[key] = (time.monotonic() + self._ttl, return_val)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove todas as respostas armazenadas."""
+        self._entries.clear()
+
+
+def _create_sqlite_cache() -> BaseCache:
+    """
+    Cria um cache persistente em SQLite.
+
+    Requer o pacote opcional langchain-community.
+
+    Returns:
+        BaseCache: Cache persistente em disco
+    """
+    try:
+        from langchain_community.cache import SQLiteCache
+    except ImportError:
+        raise ImportError(
+            "LangChain Community não está instalado. Execute: pip install langchain-community"
+        )
+
+    database_path = os.getenv("LLM_CACHE_DATABASE_PATH", DEFAULT_SQLITE_PATH)
+    return SQLiteCache(database_path=database_path)
+
+
+def configure_llm_cache() -> None:
+    """
+    Instala o cache global do LLM conforme o ambiente.
+
+    O backend é escolhido por LLM_CACHE_BACKEND ("memory", "sqlite" ou
+    "none"). A função é idempotente: se já houver um cache instalado,
+    ele é mantido.
+    """
+    if get_llm_cache() is not None:
+        return
+
+    backend = os.getenv("LLM_CACHE_BACKEND", CACHE_BACKEND_MEMORY).lower()
+
+    if backend == CACHE_BACKEND_NONE:
+        logger.info("Cache de respostas do LLM desabilitado")
+        return
+
+    if backend == CACHE_BACKEND_SQLITE:
+        try:
+            set_llm_cache(_create_sqlite_cache())
+            logger.info("Cache de respostas do LLM configurado em SQLite")
+            return
+        except ImportError as e:
+            logger.warning("%s. Usando cache em memória.", e)
+
+    maxsize = int(os.getenv("LLM_CACHE_MAXSIZE", DEFAULT_CACHE_MAXSIZE))
+    ttl = float(os.getenv("LLM_CACHE_TTL", DEFAULT_CACHE_TTL))
+    set_llm_cache(TTLInMemoryCache(maxsize=maxsize, ttl=ttl))
+    logger.info("Cache de respostas do LLM configurado em memória (maxsize=%s, ttl=%ss)", maxsize, ttl)
@@ -8,15 +8,18 @@ aplicação funcione tanto em ambiente corporativo quanto pessoal.
 
 import os
 import logging
+from functools import lru_cache
 from typing import Optional
+import httpx
 from dotenv import load_dotenv
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
 try:
-    from langchain_openai import ChatOpenAI, AzureChatOpenAI
+    from langchain_openai import ChatOpenAI, AzureChatOpenAI, OpenAIEmbeddings, AzureOpenAIEmbeddings
     from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.embeddings import Embeddings
 except ImportError:
     raise ImportError(
         "LangChain OpenAI não está instalado. Execute: pip install langchain-openai"
@@ -28,6 +31,82 @@ class LLMInitializationError(Exception):
     pass
 
 
+# Timeout padrão (segundos) das chamadas ao LLM e aos embeddings
+DEFAULT_LLM_TIMEOUT = 120
+
+# Cliente HTTP compartilhado; criado no startup da aplicação (ver app.main)
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_timeout() -> float:
+    """
+    Obtém o timeout das chamadas ao provedor, configurável por LLM_TIMEOUT.
+    
+    Returns:
+        float: Timeout em segundos
+    """
+    return float(os.getenv("LLM_TIMEOUT", DEFAULT_LLM_TIMEOUT))
+
+
+def open_http_async_client() -> httpx.AsyncClient:
+    """
+    Cria o cliente HTTP assíncrono compartilhado pelos modelos.
+    
+    Todos os LLMs e embeddings usam o mesmo pool de conexões keep-alive,
+    amortizando handshakes TCP/TLS entre requisições concorrentes. HTTP/2
+    é habilitado quando o pacote opcional h2 está instalado
+    (pip install "httpx[http2]"). Chamado no startup da aplicação; se já
+    houver um cliente aberto, ele é mantido.
+    
+    Returns:
+        httpx.AsyncClient: Cliente com pool de conexões configurado
+    """
+    global _http_async_client
+    if _http_async_client is not None and not _http_async_client.is_closed:
+        return _http_async_client
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    )
+    _http_async_client = httpx.AsyncClient(limits=limits, http2=http2, timeout=get_llm_timeout())
+    return _http_async_client
+
+
+async def close_http_async_client() -> None:
+    """
+    Fecha o cliente HTTP compartilhado, liberando as conexões do pool.
+    
+    Os modelos criados com o cliente fechado são descartados, para que
+    um novo startup os recrie com um cliente válido.
+    """
+    global _http_async_client
+    client, _http_async_client = _http_async_client, None
+    load_llm.cache_clear()
+    load_fast_llm.cache_clear()
+    if client is not None:
+        await client.aclose()
+
+
+def get_http_async_client() -> httpx.AsyncClient:
+    """
+    Obtém o cliente HTTP assíncrono compartilhado pelos modelos.
+    
+    Fora do ciclo de vida da API (por exemplo, em scripts), o cliente é
+    criado no primeiro uso.
+    
+    Returns:
+        httpx.AsyncClient: Cliente com pool de conexões configurado
+    """
+    return open_http_async_client()
+
+
 class LLMFactory:
     """
     Factory responsável pela criação de instâncias LLM com fallback automático.
@@ -121,8 +200,9 @@ class LLMFactory:
                 api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
                 temperature=0.7,
                 max_tokens=15000,
-                timeout=120,  # 2 minutos de timeout para chamadas LLM
-                max_retries=3
+                timeout=get_llm_timeout(),
+                max_retries=3,
+                http_async_client=get_http_async_client()
             )
             
             self.logger.info(
@@ -134,7 +214,7 @@ class LLMFactory:
             return azure_llm
             
         except Exception as e:
-            self.logger.error(f"❌ Erro ao inicializar Azure OpenAI: {e}")
+            self.logger.error("❌ Erro ao inicializar Azure OpenAI: %s", e)
             raise LLMInitializationError(f"Falha na inicialização do Azure OpenAI: {e}")
     
     def _create_openai_llm(self) -> ChatOpenAI:
@@ -150,8 +230,9 @@ class LLMFactory:
                 model=os.getenv("OPENAI_MODEL_NAME", "gpt-4"),
                 temperature=0.7,
                 max_tokens=15000,
-                timeout=120,  # 2 minutos de timeout para chamadas LLM
-                max_retries=3
+                timeout=get_llm_timeout(),
+                max_retries=3,
+                http_async_client=get_http_async_client()
             )
             
             self.logger.info(
@@ -162,7 +243,7 @@ class LLMFactory:
             return openai_llm
             
         except Exception as e:
-            self.logger.error(f"❌ Erro ao inicializar OpenAI padrão: {e}")
+            self.logger.error("❌ Erro ao inicializar OpenAI padrão: %s", e)
             raise LLMInitializationError(f"Falha na inicialização da OpenAI padrão: {e}")
     
     def initialize_llm_provider(self) -> BaseChatModel:
@@ -188,7 +269,7 @@ class LLMFactory:
                 self.logger.info("✅ Credenciais Azure OpenAI detectadas, inicializando...")
                 return self._create_azure_llm()
             except LLMInitializationError as e:
-                self.logger.warning(f"⚠️ Falha no Azure OpenAI: {e}, tentando fallback...")
+                self.logger.warning("⚠️ Falha no Azure OpenAI: %s, tentando fallback...", e)
         
         # Tentar OpenAI padrão como fallback
         openai_available = self._check_openai_credentials()
@@ -197,7 +278,7 @@ class LLMFactory:
                 self.logger.info("✅ Credenciais OpenAI padrão detectadas, inicializando...")
                 return self._create_openai_llm()
             except LLMInitializationError as e:
-                self.logger.error(f"❌ Falha também na OpenAI padrão: {e}")
+                self.logger.error("❌ Falha também na OpenAI padrão: %s", e)
         
         # Nenhum provedor disponível - gerar mensagem de erro apropriada
         error_parts = ["❌ Nenhum provedor LLM pode ser inicializado."]
@@ -235,6 +316,92 @@ class LLMFactory:
         """
         return self.initialize_llm_provider()
 
+    def load_fast_llm(self) -> Optional[BaseChatModel]:
+        """
+        Carrega um LLM rápido e mais barato para entradas pequenas, se configurado.
+        
+        Usa AZURE_OPENAI_FAST_DEPLOYMENT_NAME (Azure) ou OPENAI_FAST_MODEL_NAME
+        (OpenAI padrão), com a mesma prioridade do LLM principal. Assim como
+        os embeddings, é opcional: sem configuração, retorna None.
+        
+        Returns:
+            Optional[BaseChatModel]: LLM rápido ou None se não configurado
+        """
+        max_tokens = int(os.getenv("FAST_LLM_MAX_TOKENS", "2048"))
+        
+        azure_deployment = os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME")
+        if azure_deployment and self._check_azure_credentials():
+            try:
+                return AzureChatOpenAI(
+                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT") or os.getenv("AZURE_OPENAI_API_BASE"),
+                    deployment_name=azure_deployment,
+                    api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    timeout=get_llm_timeout(),
+                    max_retries=3,
+                    http_async_client=get_http_async_client()
+                )
+            except Exception as e:
+                self.logger.warning("⚠️ Falha ao inicializar LLM rápido do Azure OpenAI: %s", e)
+        
+        openai_model = os.getenv("OPENAI_FAST_MODEL_NAME")
+        if openai_model and os.getenv("OPENAI_API_KEY"):
+            try:
+                return ChatOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    model=openai_model,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    timeout=get_llm_timeout(),
+                    max_retries=3,
+                    http_async_client=get_http_async_client()
+                )
+            except Exception as e:
+                self.logger.warning("⚠️ Falha ao inicializar LLM rápido da OpenAI padrão: %s", e)
+        
+        self.logger.debug("Nenhum LLM rápido configurado.")
+        return None
+
+    def load_embeddings(self) -> Optional[Embeddings]:
+        """
+        Carrega um modelo de embeddings, se houver um configurado.
+        
+        Segue a mesma prioridade do LLM: Azure OpenAI primeiro e OpenAI
+        padrão como fallback. Ao contrário do LLM, embeddings são opcionais,
+        portanto a ausência de configuração não é considerada erro.
+        
+        Returns:
+            Optional[Embeddings]: Modelo de embeddings ou None se não configurado
+        """
+        azure_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
+        if azure_deployment and self._check_azure_credentials():
+            try:
+                return AzureOpenAIEmbeddings(
+                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT") or os.getenv("AZURE_OPENAI_API_BASE"),
+                    azure_deployment=azure_deployment,
+                    api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+                    http_async_client=get_http_async_client()
+                )
+            except Exception as e:
+                self.logger.warning("⚠️ Falha ao inicializar embeddings do Azure OpenAI: %s", e)
+        
+        openai_model = os.getenv("OPENAI_EMBEDDING_MODEL_NAME")
+        if openai_model and os.getenv("OPENAI_API_KEY"):
+            try:
+                return OpenAIEmbeddings(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    model=openai_model,
+                    http_async_client=get_http_async_client()
+                )
+            except Exception as e:
+                self.logger.warning("⚠️ Falha ao inicializar embeddings da OpenAI padrão: %s", e)
+        
+        self.logger.debug("Nenhum modelo de embeddings configurado.")
+        return None
+
 
 # Novos prompts integrados para StoryCreator
 # O LLM agora deve gerar histórias mais detalhadas, incluindo explicações para prioridade e estimativa.
@@ -244,10 +411,15 @@ class LLMFactory:
 llm_factory = LLMFactory()
 
 
+@lru_cache(maxsize=1)
 def load_llm() -> BaseChatModel:
     """
     Função de conveniência para carregar o LLM.
     
+    A instância é criada uma única vez e compartilhada por todo o processo,
+    reaproveitando o pool de conexões HTTP do cliente entre os agentes.
+    Falhas de inicialização não são armazenadas em cache.
+    
     Returns:
         BaseChatModel: Instância configurada do LLM
         
@@ -255,3 +427,24 @@ def load_llm() -> BaseChatModel:
         LLMInitializationError: Quando nenhum provedor pode ser inicializado
     """
     return llm_factory.load_llm()
+
+
+@lru_cache(maxsize=1)
+def load_fast_llm() -> Optional[BaseChatModel]:
+    """
+    Função de conveniência para carregar o LLM rápido compartilhado.
+    
+    Returns:
+        Optional[BaseChatModel]: LLM rápido ou None se não configurado
+    """
+    return llm_factory.load_fast_llm()
+
+
+def load_embeddings() -> Optional[Embeddings]:
+    """
+    Função de conveniência para carregar o modelo de embeddings.
+    
+    Returns:
+        Optional[Embeddings]: Modelo de embeddings ou None se não configurado
+    """
+    return llm_factory.load_embeddings()
@@ -0,0 +1,103 @@
+"""
+Limitador de concorrência das chamadas ao LLM.
+
+Este módulo mantém um semáforo compartilhado por todo o processo para
+limitar quantas requisições simultâneas são enviadas ao provedor,
+evitando rajadas que estouram o rate limit (HTTP 429) e disparam
+novas tentativas em cascata.
+"""
+
+import os
+import asyncio
+from typing import AsyncIterable, AsyncIterator, NamedTuple, Optional, TypeVar
+
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+T = TypeVar("T")
+
+# Marca o fim do stream na fila entre leitor e consumidor
+_END_OF_STREAM = object()
+
+
+class _StreamFailure(NamedTuple):
+    """Erro do stream do LLM repassado ao consumidor pela fila."""
+    error: Exception
+
+
+# Semáforo compartilhado; criado no startup da aplicação (ver app.main)
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def open_llm_semaphore() -> asyncio.Semaphore:
+    """
+    Cria o semáforo global das chamadas ao LLM.
+    
+    O limite é lido de LLM_MAX_CONCURRENCY. Chamado no startup da
+    aplicação, para que o semáforo pertença ao event loop do servidor;
+    um semáforo anterior é substituído.
+    
+    Returns:
+        asyncio.Semaphore: Semáforo compartilhado
+    """
+    global _llm_semaphore
+    max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+    _llm_semaphore = asyncio.Semaphore(max_concurrency)
+    return _llm_semaphore
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """
+    Obtém o semáforo global das chamadas ao LLM.
+    
+    Como os agentes são compartilhados, o semáforo precisa ser único no
+    processo para que o limite valha para a aplicação inteira. Fora do
+    ciclo de vida da API, ele é criado no primeiro uso.
+    
+    Returns:
+        asyncio.Semaphore: Semáforo compartilhado
+    """
+    if _llm_semaphore is None:
+        return open_llm_semaphore()
+    return _llm_semaphore
+
+
+async def iterate_with_llm_slot(chunks: AsyncIterable[T]) -> AsyncIterator[T]:
+    """
+    Percorre um stream do LLM ocupando uma vaga do semáforo só durante a leitura.
+    
+    Os fragmentos são lidos por uma tarefa própria, dentro do semáforo, e
+    repassados por uma fila. A vaga é liberada assim que o provedor termina
+    de responder, mesmo que o consumidor (por exemplo, um cliente SSE lento)
+    ainda não tenha processado todos os fragmentos.
+    
+    Args:
+        chunks: Stream assíncrono devolvido pelo LLM (ex.: llm.astream)
+        
+    Yields:
+        T: Cada fragmento do stream, na ordem recebida
+        
+    Raises:
+        Exception: O mesmo erro levantado pelo stream do LLM
+    """
+    queue: "asyncio.Queue[object]" = asyncio.Queue()
+    
+    async def read_stream() -> None:
+        try:
+            async with get_llm_semaphore():
+                async for chunk in chunks:
+                    queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(_StreamFailure(e))
+        finally:
+            queue.put_nowait(_END_OF_STREAM)
+    
+    reader = asyncio.create_task(read_stream())
+    try:
+        while (item := await queue.get()) is not _END_OF_STREAM:
+            if isinstance(item, _StreamFailure):
+                raise item.error
+            yield item
+    finally:
+        # Consumidor encerrado antes do fim: interrompe a leitura e libera a vaga
+        reader.cancel()
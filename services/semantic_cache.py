@@ -0,0 +1,140 @@
+"""
+Cache semântico de respostas do LLM.
+
+Este módulo implementa um cache indexado por embeddings: entradas com
+texto diferente, mas significado equivalente (espaços, nomes de variáveis
+ou redação levemente alterados), reaproveitam uma resposta já gerada em
+vez de disparar uma nova chamada ao LLM.
+"""
+
+import os
+import math
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from services.llm_factory import load_embeddings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 512
+
+
+def _normalize(vector: List[float]) -> Tuple[float, ...]:
+    """
+    Normaliza um vetor para norma unitária.
+
+    Args:
+        vector: Vetor de embedding
+
+    Returns:
+        Tuple[float, ...]: Vetor normalizado
+    """
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return tuple(value / norm for value in vector)
+
+
+class SemanticCache:
+    """
+    Cache de respostas consultado por similaridade de cosseno.
+
+    Mantém os vetores normalizados em memória com política LRU; a busca
+    devolve a resposta mais próxima somente se a similaridade atingir
+    o limiar configurado.
+    """
+
+    def __init__(self, embeddings: Embeddings, threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Inicializa o cache semântico.
+
+        Args:
+            embeddings: Modelo de embeddings usado para indexar as entradas
+            threshold: Similaridade mínima de cosseno para considerar acerto
+            max_entries: Número máximo de entradas mantidas em memória
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[str, Tuple[float, ...], Any]]" = OrderedDict()
+        self._next_key = 0
+
+    async def lookup(self, text: str, scope: str = "") -> Optional[Any]:
+        """
+        Procura uma resposta semanticamente equivalente ao texto.
+
+        Args:
+            text: Texto de entrada a ser comparado
+            scope: Escopo da entrada; só entradas do mesmo escopo são comparadas
+
+        Returns:
+            Optional[Any]: Valor armazenado ou None se não houver entrada similar
+        """
+        if not self._entries:
+            return None
+
+        vector = _normalize(await self.embeddings.aembed_query(text))
+
+        best_key, best_score = None, -1.0
+        for key, (entry_scope, entry_vector, _) in self._entries.items():
+            if entry_scope != scope:
+                continue
+            score = sum(a * b for a, b in zip(vector, entry_vector))
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_key is None or best_score < self.threshold:
+            return None
+
+        logger.debug("Acerto no cache semântico (similaridade %.3f)", best_score)
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][2]
+
+    async def store(self, text: str, value: Any, scope: str = "") -> None:
+        """
+        Armazena uma resposta indexada pelo embedding do texto.
+
+        Args:
+            text: Texto de entrada que originou a resposta
+            value: Resposta a ser armazenada
+            scope: Escopo da entrada
+        """
+        vector = _normalize(await self.embeddings.aembed_query(text))
+
+        self._entries[self._next_key] = (scope, vector, value)
+        self._next_key += 1
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_semantic_cache(name: str) -> Optional[SemanticCache]:
+    """
+    Obtém o cache semântico compartilhado de um agente.
+
+    Os caches vivem durante todo o processo, independentemente de quantas
+    instâncias dos agentes forem criadas.
+
+    Args:
+        name: Nome do cache (por exemplo, o agente que o utiliza)
+
+    Returns:
+        Optional[SemanticCache]: Cache semântico ou None se não houver embeddings configurados
+    """
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    embeddings = load_embeddings()
+    if embeddings is None:
+        return None
+
+    threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD))
+    max_entries = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    logger.info("Cache semântico '%s' habilitado (limiar=%s)", name, threshold)
+    return SemanticCache(embeddings, threshold=threshold, max_entries=max_entries)
@@ -5,13 +5,39 @@ Este módulo contém testes para validar o funcionamento
 básico dos endpoints da API.
 """
 
+import json
+
 import pytest
+from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 from app.main import app
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from agents.story_agent import StoryAgent
+from agents.test_generator_agent import _TEST_RESULT_CACHE, TestGeneratorAgent
+from schemas.story_schemas import GeneratedStory
+from services import llm_factory, llm_limiter
+from services.llm_factory import LLMInitializationError
 
 client = TestClient(app)
 
 
+def _sse_events(response):
+    """
+    Interpreta o corpo de uma resposta Server-Sent Events.
+    
+    Verifica o enquadramento de cada evento ("data: ..." seguido de linha
+    em branco) e devolve os payloads JSON na ordem recebida.
+    """
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+    
+    events = []
+    for frame in response.text.split("\n\n")[:-1]:
+        assert frame.startswith("data: ")
+        events.append(json.loads(frame[len("data: "):]))
+    return events
+
+
 def test_health_check():
     """
     Testa o endpoint de health check.
@@ -128,6 +154,17 @@ def test_fix_suggestions():
     assert "performance_tips" in data
 
 
+def test_fix_suggestions_schema_in_openapi():
+    """
+    Testa que o endpoint de sugestões mantém o schema de resposta no OpenAPI.
+    """
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    
+    success = response.json()["paths"]["/api/v1/fix/suggestions"]["get"]["responses"]["200"]
+    assert success["content"]["application/json"]["schema"]["type"] == "object"
+
+
 def test_invalid_story_request():
     """
     Testa requisição inválida para geração de histórias.
@@ -153,3 +190,214 @@ def test_invalid_test_request():
     
     response = client.post("/api/v1/code/tests/generate", json=invalid_request)
     assert response.status_code == 422  # Validation error
+
+
+def test_fix_bugs_stream():
+    """
+    Testa a correção de bugs em streaming.
+    """
+    async def fix_bugs_stream(request):
+        yield "def divide(a, b):\n"
+        yield "    return a / b if b else 0"
+    
+    bug_fixer = Mock(fix_bugs_stream=fix_bugs_stream)
+    bug_request = {
+        "code_with_bug": "def divide(a, b):\n    return a / b",
+        "error_description": "Division by zero error",
+        "language": "python"
+    }
+    
+    with patch("api.routers.code_fixer.get_bug_fixer_agent", return_value=bug_fixer):
+        response = client.post("/api/v1/fix/bugs/stream", json=bug_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert events[:-1] == [
+        {"content": "def divide(a, b):\n"},
+        {"content": "    return a / b if b else 0"}
+    ]
+    assert events[-1] == {"done": True}
+
+
+def test_fix_bugs_stream_llm_unavailable():
+    """
+    Testa o evento de erro da correção em streaming sem LLM disponível.
+    """
+    bug_request = {
+        "code_with_bug": "def divide(a, b):\n    return a / b",
+        "error_description": "Division by zero error",
+        "language": "python"
+    }
+    
+    with patch("api.routers.code_fixer.get_bug_fixer_agent",
+               side_effect=LLMInitializationError("LLM indisponível")):
+        response = client.post("/api/v1/fix/bugs/stream", json=bug_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert len(events) == 1
+    assert events[0]["error"] == "BUG_FIX_ERROR"
+    assert "LLM indisponível" in events[0]["message"]
+
+
+def test_generate_stories_stream():
+    """
+    Testa a geração de histórias em streaming.
+    """
+    story = GeneratedStory(
+        id="story-1",
+        title="Como usuário, eu quero fazer login",
+        description="Autenticação na aplicação web",
+        story_type="user_story",
+        priority="alta",
+        justificativa_prioridade="Acesso ao sistema",
+        estimation=3,
+        justificativa_estimativa="Fluxo simples"
+    )
+    
+    async def stream_stories(request):
+        yield "partial", {"title": "Como usuário"}
+        yield "stories", [story]
+    
+    story_agent = Mock(stream_stories=stream_stories)
+    story_request = {
+        "context": "Sistema de autenticação para aplicação web",
+        "story_type": "user_story",
+        "include_acceptance_criteria": True,
+        "language": "pt-BR"
+    }
+    
+    with patch("api.routers.story_creator.get_story_agent", return_value=story_agent):
+        response = client.post("/api/v1/stories/generate/stream", json=story_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert events[0] == {"partial": {"title": "Como usuário"}}
+    assert events[-1]["done"] is True
+    assert [item["id"] for item in events[-1]["stories"]] == ["story-1"]
+
+
+def test_generate_stories_stream_llm_unavailable():
+    """
+    Testa a geração de histórias em streaming sem LLM disponível.
+    
+    Assim como no endpoint sem streaming, as histórias vêm da
+    implementação mock e o fluxo termina normalmente.
+    """
+    story_agent = StoryAgent()
+    story_agent.semantic_cache = None
+    story_request = {
+        "context": "Sistema de autenticação para aplicação web",
+        "story_type": "user_story",
+        "include_acceptance_criteria": True,
+        "language": "pt-BR"
+    }
+    
+    with patch("api.routers.story_creator.get_story_agent", return_value=story_agent), \
+            patch("agents.story_agent.load_llm", side_effect=LLMInitializationError("LLM indisponível")):
+        response = client.post("/api/v1/stories/generate/stream", json=story_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert len(events) == 1
+    assert events[0]["done"] is True
+    assert len(events[0]["stories"]) > 0
+
+
+def test_generate_stories_stream_error():
+    """
+    Testa o evento de erro da geração de histórias em streaming.
+    """
+    async def stream_stories(request):
+        yield "partial", {"title": "Como usuário"}
+        raise RuntimeError("falha inesperada")
+    
+    story_agent = Mock(stream_stories=stream_stories)
+    story_request = {
+        "context": "Sistema de autenticação para aplicação web",
+        "story_type": "user_story",
+        "include_acceptance_criteria": True,
+        "language": "pt-BR"
+    }
+    
+    with patch("api.routers.story_creator.get_story_agent", return_value=story_agent):
+        response = client.post("/api/v1/stories/generate/stream", json=story_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert events[0] == {"partial": {"title": "Como usuário"}}
+    assert events[-1]["error"] == "STORY_GENERATION_ERROR"
+    assert "falha inesperada" in events[-1]["message"]
+
+
+def test_generate_tests_stream():
+    """
+    Testa a geração de testes unitários em streaming.
+    """
+    llm_response = json.dumps({"tests": [
+        {
+            "test_name": f"test_soma_{case}",
+            "test_code": f"def test_soma_{case}():\n    assert soma(1, 2) == 3",
+            "description": f"Verifica a soma ({case})",
+            "coverage_estimation": 80,
+            "dependencies": ["pytest"]
+        }
+        for case in ("positivos", "negativos")
+    ]})
+    with patch("agents.test_generator_agent.load_llm", return_value=FakeListChatModel(responses=[llm_response])):
+        test_agent = TestGeneratorAgent()
+    test_request = {
+        "input_type": "direct",
+        "code_content": "def soma(a, b):\n    return a + b",
+        "language": "python",
+        "test_framework": "pytest"
+    }
+    
+    _TEST_RESULT_CACHE.clear()
+    with patch("api.routers.code_tester.get_test_generator_agent", return_value=test_agent):
+        response = client.post("/api/v1/code/tests/generate/stream", json=test_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert "analysis" in events[0]
+    assert [event["test"]["test_name"] for event in events[1:-1]] == ["test_soma_positivos", "test_soma_negativos"]
+    assert events[-1]["done"] is True
+    assert "valid" in events[-1]
+
+
+def test_generate_tests_stream_llm_unavailable():
+    """
+    Testa o evento de erro da geração de testes em streaming sem LLM disponível.
+    """
+    test_request = {
+        "input_type": "direct",
+        "code_content": "def soma(a, b):\n    return a + b",
+        "language": "python",
+        "test_framework": "pytest"
+    }
+    
+    with patch("api.routers.code_tester.get_test_generator_agent",
+               side_effect=LLMInitializationError("LLM indisponível")):
+        response = client.post("/api/v1/code/tests/generate/stream", json=test_request)
+    assert response.status_code == 200
+    
+    events = _sse_events(response)
+    assert len(events) == 1
+    assert events[0]["error"] == "TEST_GENERATION_ERROR"
+    assert "LLM indisponível" in events[0]["message"]
+
+
+def test_lifespan_manages_shared_llm_resources():
+    """
+    Testa a criação e o fechamento dos recursos compartilhados no ciclo de vida.
+    """
+    with TestClient(app) as lifespan_client:
+        http_client = llm_factory.get_http_async_client()
+        semaphore = llm_limiter.get_llm_semaphore()
+        assert not http_client.is_closed
+        assert lifespan_client.get("/api/v1/health").status_code == 200
+        # Durante a execução, os mesmos objetos são compartilhados
+        assert llm_factory.get_http_async_client() is http_client
+        assert llm_limiter.get_llm_semaphore() is semaphore
+    
+    assert http_client.is_closed
@@ -0,0 +1,68 @@
+"""
+Testes unitários do cache de respostas do LLM.
+
+Este módulo cobre a expiração por tempo e o descarte LRU do
+TTLInMemoryCache.
+"""
+
+from unittest.mock import patch
+
+from langchain_core.outputs import Generation
+
+from services.llm_cache import TTLInMemoryCache
+
+
+LLM_STRING = "fake-model|temperature=0"
+
+
+def _response(text):
+    """Cria uma resposta no formato armazenado pelo cache do LangChain."""
+    return [Generation(text=text)]
+
+
+class TestTTLInMemoryCache:
+    """Testes para o cache em memória com TTL e descarte LRU."""
+
+    def test_lookup_returns_stored_response(self):
+        """Uma resposta armazenada é devolvida para o mesmo prompt e modelo."""
+        cache = TTLInMemoryCache(maxsize=10, ttl=60)
+        cache.update("prompt", LLM_STRING, _response("resposta"))
+
+        assert cache.lookup("prompt", LLM_STRING) == _response("resposta")
+        assert cache.lookup("prompt", "outro-modelo") is None
+
+    def test_expired_response_is_discarded(self):
+        """Após o TTL, a resposta deixa de ser devolvida e é removida."""
+        cache = TTLInMemoryCache(maxsize=10, ttl=60)
+        with patch("services.llm_cache.time.monotonic", return_value=1000.0):
+            cache.update("prompt", LLM_STRING, _response("resposta"))
+
+        with patch("services.llm_cache.time.monotonic", return_value=1059.0):
+            assert cache.lookup("prompt", LLM_STRING) == _response("resposta")
+
+        with patch("services.llm_cache.time.monotonic", return_value=1061.0):
+            assert cache.lookup("prompt", LLM_STRING) is None
+
+        assert len(cache._entries) == 0
+
+    def test_least_recently_used_response_is_evicted(self):
+        """Acima de maxsize, a entrada menos usada recentemente é descartada."""
+        cache = TTLInMemoryCache(maxsize=2, ttl=60)
+        cache.update("a", LLM_STRING, _response("A"))
+        cache.update("b", LLM_STRING, _response("B"))
+
+        cache.lookup("a", LLM_STRING)  # "a" passa a ser a mais recente
+        cache.update("c", LLM_STRING, _response("C"))
+
+        assert cache.lookup("a", LLM_STRING) == _response("A")
+        assert cache.lookup("b", LLM_STRING) is None
+        assert cache.lookup("c", LLM_STRING) == _response("C")
+
+    def test_clear_removes_all_responses(self):
+        """clear remove todas as respostas armazenadas."""
+        cache = TTLInMemoryCache(maxsize=10, ttl=60)
+        cache.update("prompt", LLM_STRING, _response("resposta"))
+
+        cache.clear()
+
+        assert cache.lookup("prompt", LLM_STRING) is None
@@ -0,0 +1,104 @@
+"""
+Testes unitários do cache semântico.
+
+Este módulo cobre o limiar de similaridade, o isolamento por escopo e
+o descarte LRU do SemanticCache, usando embeddings determinísticos.
+"""
+
+import math
+
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from services.semantic_cache import SemanticCache
+
+
+def _unit_vector(degrees):
+    """Vetor unitário no plano com o ângulo informado (em graus)."""
+    radians = math.radians(degrees)
+    return [math.cos(radians), math.sin(radians)]
+
+
+class FakeEmbeddings(Embeddings):
+    """Embeddings com vetores fixos por texto, para similaridades conhecidas."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+
+# cos(10°) ≈ 0,985 e cos(30°) ≈ 0,866 em relação a "original"
+EMBEDDINGS = FakeEmbeddings({
+    "original": _unit_vector(0),
+    "parecido": _unit_vector(10),
+    "diferente": _unit_vector(30),
+    "outro": _unit_vector(90),
+})
+
+
+class TestSemanticCache:
+    """Testes para a busca por similaridade do cache semântico."""
+
+    @pytest.mark.asyncio
+    async def test_similar_text_above_threshold_is_a_hit(self):
+        """Um texto com similaridade acima do limiar reaproveita a resposta."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.95)
+        await cache.store("original", {"resposta": 1})
+
+        assert await cache.lookup("original") == {"resposta": 1}
+        assert await cache.lookup("parecido") == {"resposta": 1}
+
+    @pytest.mark.asyncio
+    async def test_text_below_threshold_is_a_miss(self):
+        """Um texto com similaridade abaixo do limiar não reaproveita a resposta."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.95)
+        await cache.store("original", {"resposta": 1})
+
+        assert await cache.lookup("diferente") is None
+
+    @pytest.mark.asyncio
+    async def test_threshold_is_configurable(self):
+        """Com limiar menor, textos menos parecidos passam a ser acertos."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.85)
+        await cache.store("original", {"resposta": 1})
+
+        assert await cache.lookup("diferente") == {"resposta": 1}
+        assert await cache.lookup("outro") is None
+
+    @pytest.mark.asyncio
+    async def test_closest_entry_is_returned(self):
+        """Entre várias entradas acima do limiar, a mais similar é devolvida."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.8)
+        await cache.store("original", "perto")
+        await cache.store("diferente", "longe")
+
+        assert await cache.lookup("parecido") == "perto"
+
+    @pytest.mark.asyncio
+    async def test_entries_from_other_scope_are_ignored(self):
+        """Só entradas do mesmo escopo são comparadas."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.95)
+        await cache.store("original", {"resposta": 1}, scope="python")
+
+        assert await cache.lookup("original", scope="java") is None
+        assert await cache.lookup("original", scope="python") == {"resposta": 1}
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        """Acima de max_entries, a entrada menos usada recentemente é descartada."""
+        cache = SemanticCache(EMBEDDINGS, threshold=0.99, max_entries=2)
+        await cache.store("original", "A")
+        await cache.store("diferente", "B")
+
+        await cache.lookup("original")  # "original" passa a ser a mais recente
+        await cache.store("outro", "C")
+
+        assert await cache.lookup("original") == "A"
+        assert await cache.lookup("diferente") is None
+        assert await cache.lookup("outro") == "C"
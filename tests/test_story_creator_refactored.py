@@ -11,7 +11,8 @@ incluindo:
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 
 from schemas.story_schemas import (
@@ -76,6 +77,15 @@ class TestStorySchemas:
         assert task.description is not None and len(task.description) > 0
         assert len(task.examples) == 4
         assert "JWT tokens" in task.examples
+    
+    def test_detailed_task_examples_are_immutable(self):
+        """Testa que os exemplos de tarefas compartilhadas não podem ser alterados."""
+        examples = ["JWT tokens", "OAuth2"]
+        task = DetailedTask(title="Implementar autenticação", description="Login seguro", examples=examples)
+        examples.append("Rate limiting")
+        
+        assert task.examples == ("JWT tokens", "OAuth2")
+        assert DetailedTask(title="Sem exemplos", description="Tarefa simples").examples == ()
 
 
 class TestStoryAgent:
@@ -117,6 +127,80 @@ class TestStoryAgent:
         assert story.justificativa_estimativa is not None
         assert isinstance(story.estimation, int)
     
+    @pytest.mark.asyncio
+    async def test_stream_stories_falls_back_to_mock_on_invalid_llm_output(self, story_agent, sample_request):
+        """Testa o fallback para o mock quando a saída transmitida pelo LLM não valida."""
+        async def astream(messages):
+            yield SimpleNamespace(tool_call_chunks=[{"args": '{"title": "Login"'}])
+            yield SimpleNamespace(tool_call_chunks=[{"args": '}'}])
+        
+        llm = Mock()
+        llm.bind_tools.return_value.astream = astream
+        story_agent.llm = llm
+        story_agent.semantic_cache = None
+        
+        events = [event async for event in story_agent.stream_stories(sample_request)]
+        
+        assert [kind for kind, _ in events] == ["partial", "partial", "stories"]
+        stories = events[-1][1]
+        assert len(stories) > 0 and all(isinstance(story, GeneratedStory) for story in stories)
+    
+    @pytest.mark.asyncio
+    async def test_stream_stories_falls_back_to_mock_on_non_json_output(self, story_agent, sample_request):
+        """Testa que texto fora do formato JSON não interrompe o stream e leva ao fallback."""
+        async def astream(messages):
+            yield SimpleNamespace(tool_call_chunks=[{"args": "Aqui está a história: "}])
+            yield SimpleNamespace(tool_call_chunks=[{"args": '```json\n{"title": "Login"}\n```'}])
+        
+        llm = Mock()
+        llm.bind_tools.return_value.astream = astream
+        story_agent.llm = llm
+        story_agent.semantic_cache = None
+        
+        events = [event async for event in story_agent.stream_stories(sample_request)]
+        
+        assert [kind for kind, _ in events] == ["stories"]
+        assert len(events[0][1]) > 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_stories_uses_semantic_cache(self, story_agent, sample_request):
+        """Testa que uma entrada do cache semântico é entregue sem chamar o LLM."""
+        mock_stories = await story_agent._generate_stories_mock(sample_request)
+        story_agent.llm = Mock()
+        story_agent.semantic_cache = Mock(
+            lookup=AsyncMock(return_value=[story.model_dump(exclude={"id"}) for story in mock_stories])
+        )
+        
+        events = [event async for event in story_agent.stream_stories(sample_request)]
+        
+        story_agent.llm.bind_tools.assert_not_called()
+        assert [kind for kind, _ in events] == ["stories"]
+        assert [story.title for story in events[0][1]] == [story.title for story in mock_stories]
+    
+    def test_llm_load_failure_is_retried(self, monkeypatch):
+        """Testa que uma falha ao carregar o LLM não prende o agente ao mock."""
+        monkeypatch.setenv("LLM_RETRY_INTERVAL", "0")
+        llm = Mock()
+        agent = StoryAgent()
+        
+        with patch("agents.story_agent.load_llm", side_effect=[RuntimeError("sem credenciais"), llm]):
+            assert agent.use_llm is False
+            assert agent.use_llm is True
+        
+        assert agent.llm is llm
+        assert agent.story_llm is llm.with_structured_output.return_value
+    
+    def test_llm_load_is_not_retried_before_interval(self, monkeypatch):
+        """Testa que, dentro do intervalo, o LLM não é recarregado a cada acesso."""
+        monkeypatch.setenv("LLM_RETRY_INTERVAL", "3600")
+        agent = StoryAgent()
+        
+        with patch("agents.story_agent.load_llm", side_effect=RuntimeError("sem credenciais")) as load:
+            assert agent.llm is None
+            assert agent.llm is None
+        
+        assert load.call_count == 1
+    
     def test_extract_feature_keywords(self, story_agent):
         """Testa extração de palavras-chave do contexto."""
         context = "Desenvolver funcionalidade de login para administrador com autenticação segura"
@@ -158,6 +242,30 @@ class TestStoryAgent:
             assert task.title is not None and len(task.title) > 0
             assert task.description is not None and len(task.description) > 0
 
+    def test_validate_story(self, story_agent):
+        """Testa a validação local de qualidade da história."""
+        story = GeneratedStory(
+            id="test-456",
+            title="Curto",
+            description="Descrição curta",
+            story_type=StoryType.USER_STORY,
+            priority=Priority.BAIXA,
+            justificativa_prioridade="Teste",
+            estimation=1,
+            justificativa_estimativa="Teste"
+        )
+
+        result = story_agent.validate_story(story)
+
+        assert result["valid"] is False
+        assert result["issues"] == [
+            "Título muito curto",
+            "Descrição muito curta",
+            "Critérios de aceitação ausentes"
+        ]
+        assert len(result["suggestions"]) == 3
+        assert result["score"] == 40
+
 
 class TestStoryCreatorPage:
     """Testes para a página StoryCreator no Streamlit."""
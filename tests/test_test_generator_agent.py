@@ -0,0 +1,384 @@
+"""
+Testes unitários do agente gerador de testes.
+
+Este módulo cobre a análise estrutural do código e a geração de
+testes pelo agente, usando um LLM falso no lugar do provedor real.
+"""
+
+import json
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from pydantic import ValidationError
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from schemas.code_schemas import CodeLanguage, CodeRequest, GeneratedTest, InputType, TestFramework
+from agents.test_generator_agent import (
+    _TEST_RESULT_CACHE,
+    PartialTestGenerationError,
+    TestGeneratorAgent,
+    _store_test_results,
+    _test_result_cache_key,
+)
+
+
+PYTHON_CODE = """
+class Counter:
+    def __init__(self, start):
+        self.value = start
+
+    def increment(self):
+        self.value += 1
+        return self.value
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_test_result_cache():
+    """Isola cada teste do cache de resultados compartilhado pelo processo."""
+    _TEST_RESULT_CACHE.clear()
+    yield
+    _TEST_RESULT_CACHE.clear()
+
+
+@pytest.fixture
+def agent():
+    """Fixture para criar o agente com um LLM falso."""
+    with patch("agents.test_generator_agent.load_llm", return_value=FakeListChatModel(responses=["{}"])):
+        return TestGeneratorAgent()
+
+
+@pytest.fixture
+def python_request():
+    """Fixture para criar uma requisição de testes com código Python direto."""
+    return CodeRequest(
+        input_type=InputType.DIRECT,
+        code_content=PYTHON_CODE,
+        language=CodeLanguage.PYTHON,
+        test_framework=TestFramework.PYTEST
+    )
+
+
+def _llm_test(name):
+    """Cria um teste como os entregues pelo LLM."""
+    return GeneratedTest(
+        test_name=name,
+        test_code=f"def {name}():\n    assert True",
+        framework=TestFramework.PYTEST,
+        coverage_estimation=80,
+        dependencies=["pytest"],
+        description="Teste gerado pelo LLM"
+    )
+
+
+class TestJavaScriptStructure:
+    """Testes para a análise estrutural de código JavaScript."""
+
+    def test_control_flow_inside_methods_is_not_reported_as_method(self, agent):
+        """Blocos if/for/while/switch/catch dentro dos métodos não são métodos da classe."""
+        code = """
+class Cart extends Base {
+    // helper() { }
+    label = "render() {";
+
+    constructor(items) {
+        this.items = items || [];
+    }
+
+    add(item) {
+        if (item) {
+            this.items.push(item);
+        }
+        for (const i of this.items) {
+            while (i.pending) { i.pending = false; }
+        }
+        switch (item.kind) {
+            default: { break; }
+        }
+        try {
+            save(this.items);
+        } catch (e) {
+            console.log(`falha: ${e} }`);
+        }
+    }
+
+    _total() {
+        if (this.items.length) { return this.items.length; }
+        return 0;
+    }
+}
+"""
+        analysis = agent._analyze_code_structure(code, CodeLanguage.JAVASCRIPT)
+
+        methods = analysis["class_details"]["Cart"]["methods"]
+        assert [method["name"] for method in methods] == ["constructor", "add", "_total"]
+        assert [method["visibility"] for method in methods] == ["public", "public", "private"]
+
+
+class TestLLMFailure:
+    """Testes para falhas do LLM durante a geração de testes."""
+
+    @staticmethod
+    async def _fail_after_one_test(code_content, request, analysis):
+        """Simula um LLM que entrega um teste e falha em seguida."""
+        yield _llm_test("test_partial_from_llm")
+        raise ConnectionError("conexão encerrada")
+
+    @pytest.mark.asyncio
+    async def test_generate_tests_discards_partial_llm_output(self, agent, python_request):
+        """Uma falha no meio da resposta descarta os testes parciais e usa o fallback completo."""
+        with patch.object(agent, "_stream_tests_with_llm", self._fail_after_one_test):
+            tests, _ = await agent.generate_tests(python_request)
+
+        names = [test.test_name for test in tests]
+        assert "test_partial_from_llm" not in names
+        assert len(names) == 6  # 3 cenários para __init__ e para increment
+
+    @pytest.mark.asyncio
+    async def test_generate_tests_stream_signals_partial_failure(self, agent, python_request):
+        """No streaming, os testes já entregues são mantidos e a falha é sinalizada."""
+        received = []
+        with patch.object(agent, "_stream_tests_with_llm", self._fail_after_one_test):
+            with pytest.raises(PartialTestGenerationError):
+                async for kind, payload in agent.generate_tests_stream(python_request):
+                    received.append((kind, getattr(payload, "test_name", None)))
+
+        assert received[0][0] == "analysis"
+        assert received[1:] == [("test", "test_partial_from_llm")]
+
+
+class TestStructureAnalysis:
+    """Testes para o uso da análise estrutural, necessária apenas ao fallback."""
+
+    @staticmethod
+    async def _llm_tests(code_content, request, analysis):
+        """Simula um LLM que responde com sucesso."""
+        yield _llm_test("test_from_llm")
+
+    @pytest.mark.asyncio
+    async def test_structure_is_not_analyzed_when_llm_succeeds(self, agent, python_request):
+        """Com resposta do LLM (e depois do cache), a análise AST não é executada."""
+        with patch.object(agent, "_stream_tests_with_llm", self._llm_tests), \
+                patch.object(agent, "_analyze_code_structure", side_effect=AssertionError("análise desnecessária")):
+            first, _ = await agent.generate_tests(python_request)
+            cached, _ = await agent.generate_tests(python_request)
+
+        assert [test.test_name for test in first] == ["test_from_llm"]
+        assert cached == first
+
+
+class TestResultCache:
+    """Testes para o cache de testes gerados pelo LLM."""
+
+    @pytest.mark.asyncio
+    async def test_cached_tests_are_returned_without_calling_llm(self, agent, python_request):
+        """Uma entrada já vista é respondida pelo cache, sem nova chamada ao LLM."""
+        key = _test_result_cache_key(PYTHON_CODE, CodeLanguage.PYTHON, TestFramework.PYTEST)
+        _store_test_results(key, [_llm_test("test_cached")])
+
+        with patch.object(agent, "_stream_tests_with_llm", side_effect=AssertionError("LLM chamado")):
+            tests, _ = await agent.generate_tests(python_request)
+
+        assert [test.test_name for test in tests] == ["test_cached"]
+
+    @pytest.mark.asyncio
+    async def test_changes_to_returned_tests_do_not_reach_the_cache(self, agent, python_request):
+        """Alterar os testes recebidos não afeta as respostas seguintes vindas do cache."""
+        async def llm_tests(code_content, request, analysis):
+            yield _llm_test("test_from_llm")
+
+        with patch.object(agent, "_stream_tests_with_llm", llm_tests):
+            first, _ = await agent.generate_tests(python_request)
+        first[0].test_name = "alterado"
+        first[0].dependencies.append("alterado")
+
+        second, _ = await agent.generate_tests(python_request)
+        second[0].test_code = "alterado"
+        third, _ = await agent.generate_tests(python_request)
+
+        assert third[0].test_name == "test_from_llm"
+        assert third[0].dependencies == ["pytest"]
+        assert third[0].test_code == _llm_test("test_from_llm").test_code
+
+    def test_cache_evicts_least_recently_used_entry(self, monkeypatch):
+        """Acima do limite configurado, a entrada menos usada recentemente é descartada."""
+        monkeypatch.setenv("TEST_RESULT_CACHE_MAXSIZE", "2")
+        keys = [
+            _test_result_cache_key(f"x = {i}", CodeLanguage.PYTHON, TestFramework.PYTEST)
+            for i in range(3)
+        ]
+
+        _store_test_results(keys[0], [_llm_test("test_0")])
+        _store_test_results(keys[1], [_llm_test("test_1")])
+        _TEST_RESULT_CACHE.move_to_end(keys[0])  # acesso torna keys[0] a mais recente
+        _store_test_results(keys[2], [_llm_test("test_2")])
+
+        assert list(_TEST_RESULT_CACHE) == [keys[0], keys[2]]
+
+    def test_direct_request_without_code_is_rejected(self):
+        """Entrada direta sem code_content falha na validação, antes de calcular a chave."""
+        with pytest.raises(ValidationError):
+            CodeRequest(input_type=InputType.DIRECT, language=CodeLanguage.PYTHON)
+
+    @pytest.mark.asyncio
+    async def test_direct_loader_rejects_missing_code(self, agent):
+        """O carregador de entrada direta não repassa code_content vazio adiante."""
+        request = CodeRequest.model_construct(
+            input_type=InputType.DIRECT,
+            code_content=None,
+            language=CodeLanguage.PYTHON,
+            test_framework=TestFramework.PYTEST
+        )
+
+        with pytest.raises(ValueError):
+            await agent._get_code_content(request)
+
+
+class TestLLMConcurrency:
+    """Testes para o uso do semáforo de concorrência do LLM."""
+
+    @pytest.mark.asyncio
+    async def test_llm_slot_is_released_before_consumer_finishes(self, agent, python_request):
+        """A vaga é devolvida ao fim da resposta, mesmo com testes ainda não consumidos."""
+        response = json.dumps({"tests": [
+            {"test_name": name, "test_code": "assert True", "description": "", "coverage_estimation": 80}
+            for name in ("test_a", "test_b")
+        ]})
+        agent.llm = FakeListChatModel(responses=[response])
+        slot = asyncio.Semaphore(1)
+        analysis = await agent._analyze_code(PYTHON_CODE, CodeLanguage.PYTHON)
+
+        with patch("services.llm_limiter.get_llm_semaphore", return_value=slot), \
+                patch("agents.test_generator_agent.get_llm_semaphore", return_value=slot):
+            stream = agent._stream_tests_with_llm(PYTHON_CODE, python_request, analysis)
+            first = await anext(stream)
+            # Consumidor parado no primeiro teste: a vaga precisa voltar a ficar livre
+            await asyncio.wait_for(slot.acquire(), timeout=1)
+            slot.release()
+            rest = [test async for test in stream]
+
+        assert [test.test_name for test in [first, *rest]] == ["test_a", "test_b"]
+
+
+class TestBatchGeneration:
+    """Testes para a geração de testes em lote."""
+
+    @staticmethod
+    def _requests(count):
+        """Cria requisições com códigos distintos."""
+        return [
+            CodeRequest(
+                input_type=InputType.DIRECT,
+                code_content=f"def funcao_{index}():\n    return {index}",
+                language=CodeLanguage.PYTHON,
+                test_framework=TestFramework.PYTEST
+            )
+            for index in range(1, count + 1)
+        ]
+
+    @staticmethod
+    def _batch_response(tests_by_id):
+        """Monta a resposta do LLM para o lote, com um teste por ID."""
+        return json.dumps({"results": [
+            {"id": code_id, "tests": [
+                {"test_name": name, "test_code": "assert True", "description": "", "coverage_estimation": 80}
+            ]}
+            for code_id, name in tests_by_id.items()
+        ]})
+
+    @pytest.mark.asyncio
+    async def test_results_are_mapped_back_by_id(self, agent):
+        """Cada resultado volta à requisição do seu ID, independentemente da ordem da resposta."""
+        agent.llm = FakeListChatModel(responses=[self._batch_response({"2": "test_segundo", 1: "test_primeiro"})])
+
+        with patch.object(agent, "generate_tests", side_effect=AssertionError("geração individual")):
+            results = await agent.generate_tests_batch(self._requests(2))
+
+        assert [[test.test_name for test in tests] for tests, _ in results] == [["test_primeiro"], ["test_segundo"]]
+
+    @pytest.mark.asyncio
+    async def test_missing_id_falls_back_to_individual_generation(self, agent):
+        """Um código sem resposta no lote é gerado individualmente; os demais usam o lote."""
+        requests = self._requests(2)
+        agent.llm = FakeListChatModel(responses=[self._batch_response({"1": "test_primeiro"})])
+        individual_result = ([_llm_test("test_individual")], None)
+
+        with patch.object(agent, "generate_tests", AsyncMock(return_value=individual_result)) as generate_tests:
+            results = await agent.generate_tests_batch(requests)
+
+        generate_tests.assert_awaited_once_with(requests[1])
+        assert [test.test_name for test in results[0][0]] == ["test_primeiro"]
+        assert results[1] == individual_result
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_response_falls_back_for_every_item(self, agent):
+        """Uma resposta do lote que não é JSON válido gera cada código individualmente."""
+        requests = self._requests(2)
+        agent.llm = FakeListChatModel(responses=["não é JSON"])
+        individual_result = ([_llm_test("test_individual")], None)
+
+        with patch.object(agent, "generate_tests", AsyncMock(return_value=individual_result)) as generate_tests:
+            results = await agent.generate_tests_batch(requests)
+
+        assert [call.args[0] for call in generate_tests.await_args_list] == requests
+        assert results == [individual_result, individual_result]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("malformed_item", [
+        "não é um objeto",
+        {"id": 2, "tests": "não é uma lista"},
+        {"id": 2, "tests": {"test_name": "test_segundo"}},
+        {"id": 2, "tests": ["não é um objeto"]},
+        {"id": 2, "tests": [{"test_name": 123}]},
+    ])
+    async def test_malformed_item_falls_back_only_for_its_request(self, agent, malformed_item):
+        """Um item malformado não derruba o lote: só a sua requisição é gerada individualmente."""
+        requests = self._requests(2)
+        valid_item = {"id": 1, "tests": [{"test_name": "test_primeiro", "test_code": "assert True"}]}
+        agent.llm = FakeListChatModel(responses=[json.dumps({"results": [valid_item, malformed_item]})])
+        individual_result = ([_llm_test("test_individual")], None)
+
+        with patch.object(agent, "generate_tests", AsyncMock(return_value=individual_result)) as generate_tests:
+            results = await agent.generate_tests_batch(requests)
+
+        generate_tests.assert_awaited_once_with(requests[1])
+        assert [test.test_name for test in results[0][0]] == ["test_primeiro"]
+        assert results[1] == individual_result
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_and_fills_result_cache(self, agent):
+        """Códigos em cache não vão ao LLM, e os resultados do lote passam a ser reaproveitados."""
+        requests = self._requests(3)
+        cached_key = _test_result_cache_key(requests[0].code_content, CodeLanguage.PYTHON, TestFramework.PYTEST)
+        _store_test_results(cached_key, [_llm_test("test_em_cache")])
+        agent.llm = FakeListChatModel(responses=[self._batch_response({"1": "test_segundo", "2": "test_terceiro"})])
+
+        with patch.object(agent, "generate_tests", side_effect=AssertionError("geração individual")):
+            results = await agent.generate_tests_batch(requests)
+            # Segunda execução: tudo vem do cache, sem nova chamada ao LLM
+            agent.llm = FakeListChatModel(responses=["não é JSON"])
+            again = await agent.generate_tests_batch(requests)
+
+        expected = [["test_em_cache"], ["test_segundo"], ["test_terceiro"]]
+        assert [[test.test_name for test in tests] for tests, _ in results] == expected
+        assert [[test.test_name for test in tests] for tests, _ in again] == expected
+
+    @pytest.mark.asyncio
+    async def test_requests_are_grouped_by_batch_size(self, agent, monkeypatch):
+        """As requisições são divididas em grupos de TEST_BATCH_SIZE, mantendo a ordem."""
+        monkeypatch.setenv("TEST_BATCH_SIZE", "2")
+        requests = self._requests(3)
+        agent.llm = FakeListChatModel(responses=[self._batch_response({"1": "test_primeiro", "2": "test_segundo"})])
+        individual_result = ([_llm_test("test_terceiro")], None)
+
+        with patch.object(agent, "generate_tests", AsyncMock(return_value=individual_result)) as generate_tests:
+            results = await agent.generate_tests_batch(requests)
+
+        # O último grupo tem um único código e segue pela geração individual
+        generate_tests.assert_awaited_once_with(requests[2])
+        assert [[test.test_name for test in tests] for tests, _ in results] == [
+            ["test_primeiro"], ["test_segundo"], ["test_terceiro"]
+        ]
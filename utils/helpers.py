@@ -5,6 +5,7 @@ Este módulo contém funções utilitárias utilizadas
 em toda a aplicação para tarefas comuns.
 """
 
+import os
 import uuid
 import hashlib
 from datetime import datetime, timezone
@@ -209,8 +210,6 @@ def validate_environment_variables(required_vars: List[str]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Resultado da validação
     """
-    import os
-    
     missing_vars = []
     present_vars = []
     
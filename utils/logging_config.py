@@ -85,8 +85,8 @@ def setup_logging(level: str = "INFO", log_dir: str = "logs") -> None:
     # Log inicial
     logger = logging.getLogger(__name__)
     logger.info("Sistema de logging configurado com sucesso")
-    logger.info(f"Nível de log: {level}")
-    logger.info(f"Diretório de logs: {log_dir}")
+    logger.info("Nível de log: %s", level)
+    logger.info("Diretório de logs: %s", log_dir)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -115,6 +115,8 @@ def log_api_request(method: str, endpoint: str, status_code: int,
         user_id: ID do usuário (opcional)
     """
     logger = get_logger("api_requests")
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     log_data = {
         "method": method,
@@ -127,7 +129,7 @@ def log_api_request(method: str, endpoint: str, status_code: int,
     if user_id:
         log_data["user_id"] = user_id
     
-    logger.info(f"API Request: {log_data}")
+    logger.info("API Request: %s", log_data)
 
 
 def log_agent_execution(agent_name: str, operation: str, 
@@ -144,6 +146,9 @@ def log_agent_execution(agent_name: str, operation: str,
         metadata: Metadados adicionais
     """
     logger = get_logger("agent_execution")
+    level = logging.INFO if success else logging.ERROR
+    if not logger.isEnabledFor(level):
+        return
     
     log_data = {
         "agent_name": agent_name,
@@ -156,5 +161,4 @@ def log_agent_execution(agent_name: str, operation: str,
     if metadata:
         log_data["metadata"] = metadata
     
-    level = logging.INFO if success else logging.ERROR
-    logger.log(level, f"Agent Execution: {log_data}")
+    logger.log(level, "Agent Execution: %s", log_data)